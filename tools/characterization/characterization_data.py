@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Columnar Characterization Data
+=============================================
+
+Frequency sweep points kept as one structured NumPy array (a column per
+field) instead of nested voltage -> temperature -> frequency dicts. The
+points of each (voltage, temperature) corner are contiguous, and a corner
+index maps each corner to its rows, so:
+
+- the points of a corner are a slice lookup
+- Fmax of every corner is one np.maximum.reduceat over the array
+- Fmax-vs-voltage curves, worst-case corners within the spec window and
+  temperature coefficients are array operations on the per-corner table
+- speed_grade() bins any number of Fmax values at once (multi-chip lots)
+
+The nested dict is still what the JSON report and the results database
+store; CharacterizationData.from_results() rebuilds the columns from it.
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import numpy as np
+
+POINT_DTYPE = np.dtype([
+    ("voltage", "f8"),
+    ("temperature", "f8"),
+    ("frequency", "f8"),
+    ("stable", "?"),
+    ("current_ma", "f8"),
+    ("settle_s", "f8")
+])
+
+# Minimum Fmax (MHz) of each speed grade, fastest first
+SPEED_GRADES = (
+    (32, "A328-32P"),
+    (25, "A328-25P"),
+    (20, "A328-20P"),
+    (16, "A328-16P"),
+    (8, "A328-8I")
+)
+
+def speed_grade(fmax):
+    """Speed grade of one Fmax value, or an array of grades for an array"""
+    thresholds = np.array([threshold for threshold, _ in SPEED_GRADES], dtype=float)
+    names = np.array([name for _, name in SPEED_GRADES] + ["FAIL"])
+    fmax = np.asarray(fmax, dtype=float)
+    grades = names[(fmax[..., None] < thresholds).sum(axis=-1)]
+    return str(grades) if grades.ndim == 0 else grades
+
+class CharacterizationData:
+    """Columnar frequency-sweep points with an index by corner"""
+    
+    def __init__(self, capacity=256):
+        self._points = np.zeros(capacity, dtype=POINT_DTYPE)
+        self.size = 0
+        self.corners = {}  # (voltage, temperature) -> (first row, end row)
+        self._table = None  # Cached per-corner Fmax table
+    
+    def __len__(self):
+        return self.size
+    
+    @property
+    def points(self):
+        """All points as a structured array (a view, not a copy)"""
+        return self._points[:self.size]
+    
+    def add_corner(self, voltage, temperature, points):
+        """Append the {frequency: point} results of one corner"""
+        key = (float(voltage), float(temperature))
+        if key in self.corners:
+            self._remove_corner(key)
+        if not points:
+            return
+        
+        count = len(points)
+        if self.size + count > len(self._points):
+            grown = np.zeros(max(2 * len(self._points), self.size + count), dtype=POINT_DTYPE)
+            grown[:self.size] = self.points
+            self._points = grown
+        
+        rows = self._points[self.size:self.size + count]
+        rows["voltage"] = key[0]
+        rows["temperature"] = key[1]
+        rows["frequency"] = [float(freq) for freq in points]
+        rows["stable"] = [bool(point["stable"]) for point in points.values()]
+        rows["current_ma"] = [point["current_ma"] for point in points.values()]
+        rows["settle_s"] = [point.get("settle_s", np.nan) for point in points.values()]
+        
+        self.corners[key] = (self.size, self.size + count)
+        self.size += count
+        self._table = None
+    
+    def _remove_corner(self, key):
+        start, end = self.corners.pop(key)
+        self._points[start:self.size - (end - start)] = self._points[end:self.size].copy()
+        self.size -= end - start
+        self.corners = {
+            corner: (s - (end - start), e - (end - start)) if s >= end else (s, e)
+            for corner, (s, e) in self.corners.items()
+        }
+        self._table = None
+    
+    @classmethod
+    def from_results(cls, results):
+        """Columns from the nested frequency_characterization of a results dict"""
+        data = cls()
+        for voltage, temps in results.get('frequency_characterization', {}).items():
+            for temperature, points in temps.items():
+                data.add_corner(voltage, temperature, points)
+        return data
+    
+    def corner(self, voltage, temperature):
+        """Points of one corner (empty when it was not measured)"""
+        start, end = self.corners.get((float(voltage), float(temperature)), (0, 0))
+        return self.points[start:end]
+    
+    def fmax_table(self):
+        """Per-corner arrays: voltage, temperature and Fmax (0 if nothing passed)"""
+        if self._table is None:
+            spans = sorted(self.corners.values())
+            starts = np.array([start for start, _ in spans], dtype=np.intp)
+            points = self.points
+            passing = np.where(points["stable"], points["frequency"], 0.0)
+            self._table = {
+                "voltage": points["voltage"][starts],
+                "temperature": points["temperature"][starts],
+                "fmax": np.maximum.reduceat(passing, starts) if len(starts) else np.zeros(0)
+            }
+        return self._table
+    
+    def fmax(self, voltage, temperature):
+        """Fmax of one corner, or None when it was not measured"""
+        corner = self.corner(voltage, temperature)
+        if not len(corner):
+            return None
+        return float(np.max(np.where(corner["stable"], corner["frequency"], 0.0)))
+    
+    def fmax_vs_voltage(self, temperature):
+        """(voltages, Fmax) at one temperature, sorted by voltage"""
+        return self._curve("temperature", temperature, "voltage")
+    
+    def fmax_vs_temperature(self, voltage):
+        """(temperatures, Fmax) at one voltage, sorted by temperature"""
+        return self._curve("voltage", voltage, "temperature")
+    
+    def _curve(self, fixed, value, axis):
+        table = self.fmax_table()
+        mask = np.isclose(table[fixed], value)
+        order = np.argsort(table[axis][mask])
+        return table[axis][mask][order], table["fmax"][mask][order]
+    
+    def worst_case(self, min_voltage=None, max_voltage=None, min_temp=None, max_temp=None):
+        """(Fmax, voltage, temperature) of the slowest corner in the window, or None"""
+        table = self.fmax_table()
+        mask = np.ones(len(table["fmax"]), dtype=bool)
+        if min_voltage is not None:
+            mask &= table["voltage"] >= min_voltage
+        if max_voltage is not None:
+            mask &= table["voltage"] <= max_voltage
+        if min_temp is not None:
+            mask &= table["temperature"] >= min_temp
+        if max_temp is not None:
+            mask &= table["temperature"] <= max_temp
+        if not mask.any():
+            return None
+        
+        index = np.flatnonzero(mask)[np.argmin(table["fmax"][mask])]
+        return (float(table["fmax"][index]), float(table["voltage"][index]),
+                float(table["temperature"][index]))
+    
+    def temperature_coefficients(self):
+        """Least-squares dFmax/dT (MHz/°C) per voltage: (voltages, slopes)"""
+        table = self.fmax_table()
+        voltages, groups = np.unique(table["voltage"], return_inverse=True)
+        counts = np.bincount(groups, minlength=len(voltages))
+        
+        mean_t = np.bincount(groups, table["temperature"], len(voltages)) / np.maximum(counts, 1)
+        mean_f = np.bincount(groups, table["fmax"], len(voltages)) / np.maximum(counts, 1)
+        dt = table["temperature"] - mean_t[groups]
+        df = table["fmax"] - mean_f[groups]
+        covariance = np.bincount(groups, dt * df, len(voltages))
+        variance = np.bincount(groups, dt * dt, len(voltages))
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            slopes = np.where(variance > 0, covariance / variance, np.nan)
+        return voltages, slopes
+    
+    def temperature_coefficient(self, voltage):
+        """dFmax/dT (MHz/°C) at one voltage, or None"""
+        voltages, slopes = self.temperature_coefficients()
+        match = np.flatnonzero(np.isclose(voltages, voltage))
+        if not len(match) or np.isnan(slopes[match[0]]):
+            return None
+        return float(slopes[match[0]])
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Fleet Characterization Summary
+=============================================
+
+Aggregates the characterization results of many chips (thousands of
+per-chip JSON reports, or a results database) in one streaming pass:
+
+- per lot and for the whole fleet: Fmax, worst-case Fmax, current and
+  power at 16 MHz distributions (count, mean, std, min/max, percentiles)
+- speed grade counts and yield per lot
+- current and power at 16 MHz per speed grade
+- outliers: the chips with the lowest Fmax and the highest current,
+  flagged when beyond mean -/+ sigma * std of the fleet
+
+Report files are parsed in parallel (one worker process per core) and
+only a compact summary of each chip reaches the aggregation. Statistics
+are merged in chunks (Welford/Chan) into fixed-bin histograms, so memory
+stays bounded by the number of lots, not the number of chips.
+
+Usage:
+    python3 characterization_fleet.py reports/
+    python3 characterization_fleet.py "reports/**/axioma328_characterization_*.json" --lot L123
+    python3 characterization_fleet.py --db production_logs/production_results.db
+    python3 characterization_fleet.py reports/ --jobs 8 --outliers 20 --output fleet.json
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import argparse
+import fnmatch
+import glob
+import heapq
+import json
+import math
+import os
+import re
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from axioma_results_db import ResultsDatabase
+from characterization_data import SPEED_GRADES, CharacterizationData, speed_grade
+
+REPORT_PATTERN = "axioma328_characterization_*.json"
+REPORT_NAME = re.compile(r"axioma328_characterization_(.+)_\d{8}_\d{6}\.json$")
+
+# Histogram bins per statistic: (low, high, step); values outside go to the end bins
+METRICS = {
+    "fmax_mhz": (0.0, 40.0, 0.5),
+    "worst_fmax_mhz": (0.0, 40.0, 0.5),
+    "current_16mhz_ma": (0.0, 10.0, 0.05),
+    "power_16mhz_mw": (0.0, 20.0, 0.1)
+}
+
+def grade_order(grade):
+    """Sort key: fastest speed grade first, then FAIL and UNKNOWN"""
+    names = [name for _, name in SPEED_GRADES] + ["FAIL"]
+    return names.index(grade) if grade in names else len(names)
+
+def summarize_report(path):
+    """Compact summary of one characterization JSON report (worker process)"""
+    try:
+        with open(path, 'r') as f:
+            results = json.load(f)
+    except (OSError, ValueError) as e:
+        return {"path": path, "error": str(e)}
+    
+    chip_id = results.get('chip_id')
+    if not chip_id:
+        match = REPORT_NAME.search(os.path.basename(path))
+        chip_id = match.group(1) if match else os.path.basename(path)
+    
+    # Reports without a speed grade section are graded from their sweep
+    grade = results.get('speed_grade', {})
+    fmax = grade.get('max_frequency')
+    if fmax is None:
+        fmax = CharacterizationData.from_results(results).fmax(1.8, 25)
+    
+    power = results.get('power_characterization', {})
+    active = power.get('16', power.get(16, {})).get('active', {})
+    functional = results.get('functional_validation', {})
+    
+    return {
+        "path": path,
+        "chip_id": chip_id,
+        "lot": results.get('lot_id'),
+        "grade": grade.get('grade') or (speed_grade(fmax) if fmax is not None else None),
+        "fmax_mhz": fmax,
+        "worst_fmax_mhz": grade.get('worst_case', {}).get('max_frequency'),
+        "tempco_mhz_per_c": grade.get('temperature_coefficient_mhz_per_c'),
+        "current_16mhz_ma": active.get('current_ma'),
+        "power_16mhz_mw": active.get('power_mw'),
+        "functional_failures": sum(
+            1 for data in functional.values()
+            if isinstance(data, dict) and data.get('status') == 'FAIL'
+        )
+    }
+
+def find_reports(sources):
+    """Report paths of files, directories (searched recursively) and globs, lazily"""
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                for name in sorted(fnmatch.filter(files, REPORT_PATTERN)):
+                    yield os.path.join(root, name)
+        elif os.path.exists(source):
+            yield source
+        else:
+            yield from glob.iglob(source, recursive=True)
+
+class Distribution:
+    """Streaming statistics of one value: moments plus a fixed-bin histogram"""
+    
+    chunk = 1024
+    
+    def __init__(self, low, high, step):
+        self.edges = np.round(np.arange(low, high + step / 2, step), 6)
+        self.histogram = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.pending = []
+    
+    def add(self, value):
+        if value is None:
+            return
+        self.pending.append(value)
+        if len(self.pending) >= self.chunk:
+            self.flush()
+    
+    def flush(self):
+        """Merge the pending values (Chan's parallel variance update)"""
+        if not self.pending:
+            return
+        values = np.asarray(self.pending, dtype=float)
+        self.pending = []
+        
+        count = len(values)
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        np.add.at(self.histogram, np.searchsorted(self.edges, values, side='right'), 1)
+    
+    @property
+    def std(self):
+        self.flush()
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+    
+    def percentile(self, q):
+        """Approximate percentile (within one bin), interpolated in the bin"""
+        self.flush()
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        cumulative = np.cumsum(self.histogram)
+        index = int(np.searchsorted(cumulative, rank, side='left'))
+        below = cumulative[index - 1] if index else 0
+        
+        low = self.edges[index - 1] if index else self.minimum
+        high = self.edges[index] if index < len(self.edges) else self.maximum
+        low, high = max(low, self.minimum), min(high, self.maximum)
+        in_bin = self.histogram[index]
+        return float(low + (high - low) * (rank - below) / in_bin) if in_bin else float(low)
+    
+    def to_dict(self):
+        self.flush()
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 4),
+            "std": round(self.std, 4),
+            "min": self.minimum,
+            "max": self.maximum,
+            "p5": round(self.percentile(5), 4),
+            "p50": round(self.percentile(50), 4),
+            "p95": round(self.percentile(95), 4)
+        }
+
+class LotStatistics:
+    """Distributions and grade counts of one lot (or the whole fleet)"""
+    
+    def __init__(self):
+        self.chips = 0
+        self.grades = {}
+        self.functional_failures = 0
+        self.metrics = {name: Distribution(*bins) for name, bins in METRICS.items()}
+    
+    def add(self, summary):
+        self.chips += 1
+        grade = summary.get('grade') or "UNKNOWN"
+        self.grades[grade] = self.grades.get(grade, 0) + 1
+        if summary.get('functional_failures'):
+            self.functional_failures += 1
+        for name, distribution in self.metrics.items():
+            distribution.add(summary.get(name))
+    
+    @property
+    def passed(self):
+        return sum(count for grade, count in self.grades.items()
+                   if grade not in ("FAIL", "UNKNOWN"))
+    
+    def to_dict(self):
+        return {
+            "chips": self.chips,
+            "yield_percent": round(100 * self.passed / self.chips, 2) if self.chips else 0.0,
+            "grades": {grade: self.grades[grade] for grade in sorted(self.grades, key=grade_order)},
+            "functional_failures": self.functional_failures,
+            "metrics": {name: d.to_dict() for name, d in self.metrics.items()}
+        }
+
+class FleetSummary:
+    """One-pass aggregation of chip summaries
+    
+    Keeps per-lot statistics, 16 MHz current/power per speed grade and the
+    `outliers` lowest-Fmax and highest-current chips (bounded heaps).
+    """
+    
+    def __init__(self, outliers=10, sigma=3.0):
+        self.outliers = outliers
+        self.sigma = sigma
+        self.fleet = LotStatistics()
+        self.lots = {}
+        self.by_grade = {}
+        self.slowest = []   # Max-heap (negated Fmax) of the lowest Fmax chips
+        self.hungriest = []  # Min-heap of the highest current chips
+        self.errors = 0
+        self.error_paths = []
+    
+    def add(self, summary):
+        if "error" in summary:
+            self.errors += 1
+            if len(self.error_paths) < self.outliers:
+                self.error_paths.append(f"{summary['path']}: {summary['error']}")
+            return
+        
+        lot = summary.get('lot') or "UNKNOWN"
+        self.fleet.add(summary)
+        self.lots.setdefault(lot, LotStatistics()).add(summary)
+        
+        grade = summary.get('grade') or "UNKNOWN"
+        per_grade = self.by_grade.setdefault(grade, {
+            name: Distribution(*METRICS[name]) for name in ("current_16mhz_ma", "power_16mhz_mw")
+        })
+        for name, distribution in per_grade.items():
+            distribution.add(summary.get(name))
+        
+        entry = (summary['chip_id'], lot, grade)
+        if summary.get('fmax_mhz') is not None:
+            self._keep(self.slowest, -summary['fmax_mhz'], entry)
+        if summary.get('current_16mhz_ma') is not None:
+            self._keep(self.hungriest, summary['current_16mhz_ma'], entry)
+    
+    def _keep(self, heap, key, entry):
+        item = (key, self.fleet.chips, entry)  # Chip count breaks ties
+        if len(heap) < self.outliers:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    
+    def outlier_lists(self):
+        """Lowest-Fmax and highest-current chips, flagged beyond sigma * std"""
+        fmax = self.fleet.metrics["fmax_mhz"]
+        current = self.fleet.metrics["current_16mhz_ma"]
+        fmax_limit = fmax.mean - self.sigma * fmax.std if fmax.count else None
+        current_limit = current.mean + self.sigma * current.std if current.count else None
+        
+        def chips(heap, sign, limit, beyond):
+            return [
+                {"chip_id": chip_id, "lot": lot, "grade": grade, "value": sign * key,
+                 "outlier": limit is not None and beyond(sign * key, limit)}
+                for key, _, (chip_id, lot, grade) in sorted(heap, reverse=True)
+            ]
+        
+        return {
+            "fmax_limit_mhz": fmax_limit,
+            "lowest_fmax": chips(self.slowest, -1, fmax_limit, lambda v, l: v < l),
+            "current_limit_ma": current_limit,
+            "highest_current": chips(self.hungriest, 1, current_limit, lambda v, l: v > l)
+        }
+    
+    def to_dict(self):
+        return {
+            "chips": self.fleet.chips,
+            "errors": self.errors,
+            "fleet": self.fleet.to_dict(),
+            "lots": {lot: stats.to_dict() for lot, stats in sorted(self.lots.items())},
+            "by_grade": {
+                grade: {name: d.to_dict() for name, d in metrics.items()}
+                for grade, metrics in sorted(self.by_grade.items(), key=lambda item: grade_order(item[0]))
+            },
+            "outliers": self.outlier_lists()
+        }
+    
+    def format(self):
+        """Text summary"""
+        summary = self.to_dict()
+        lines = [f"Chips: {summary['chips']}  (reportes con error: {summary['errors']})", ""]
+        
+        lines.append(f"{'Lote':<16} {'Chips':>7} {'Yield':>8} {'Fmax media':>11} "
+                     f"{'σ':>6} {'P5':>6} {'P50':>6} {'I@16MHz':>8}")
+        for lot, stats in list(summary['lots'].items()) + [("TOTAL", summary['fleet'])]:
+            fmax = stats['metrics']['fmax_mhz']
+            current = stats['metrics']['current_16mhz_ma']
+            if fmax['count']:
+                fmax_text = f"{fmax['mean']:>11.2f} {fmax['std']:>6.2f} {fmax['p5']:>6.1f} {fmax['p50']:>6.1f}"
+            else:
+                fmax_text = f"{'-':>11} {'-':>6} {'-':>6} {'-':>6}"
+            current_text = f"{current['mean']:>8.3f}" if current['count'] else f"{'-':>8}"
+            lines.append(f"{lot:<16} {stats['chips']:>7} {stats['yield_percent']:>7.2f}% "
+                         f"{fmax_text} {current_text}")
+        
+        lines += ["", "Grados de velocidad:"]
+        fleet = summary['fleet']
+        for grade, count in fleet['grades'].items():
+            current = summary['by_grade'][grade]['current_16mhz_ma']
+            current_text = (f"  I@16MHz {current['mean']:.3f} ± {current['std']:.3f} mA"
+                            if current['count'] else "")
+            share = 100 * count / fleet['chips'] if fleet['chips'] else 0.0
+            lines.append(f"  {grade:<10} {count:>7} {share:>7.2f}%{current_text}")
+        
+        outliers = summary['outliers']
+        for title, key, unit, limit in (
+            ("Fmax más baja", "lowest_fmax", "MHz", outliers['fmax_limit_mhz']),
+            ("Mayor corriente @16MHz", "highest_current", "mA", outliers['current_limit_ma'])
+        ):
+            limit_text = f" (límite {self.sigma:g}σ: {limit:.3f} {unit})" if limit is not None else ""
+            lines += ["", f"{title}{limit_text}:"]
+            for chip in outliers[key]:
+                flag = "  ✗ atípico" if chip['outlier'] else ""
+                lines.append(f"  {chip['chip_id']:<16} {chip['lot']:<12} {chip['grade']:<10} "
+                             f"{chip['value']:.3f} {unit}{flag}")
+        
+        if self.error_paths:
+            lines += ["", "Reportes no leídos:"] + [f"  {text}" for text in self.error_paths]
+        return lines
+
+def summarize_files(paths, fleet, jobs=None, lot=None):
+    """Parse reports across worker processes and feed the summaries to fleet"""
+    def add(summary):
+        if lot is None or "error" in summary or summary['lot'] == lot:
+            fleet.add(summary)
+    
+    if jobs == 1:
+        for path in paths:
+            add(summarize_report(path))
+        return
+    
+    with Pool(processes=jobs) as pool:
+        for summary in pool.imap_unordered(summarize_report, paths, chunksize=32):
+            add(summary)
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description='AxiomaCore-328 Fleet Characterization Summary'
+    )
+    parser.add_argument(
+        'reports',
+        nargs='*',
+        help='Characterization JSON reports, directories or glob patterns'
+    )
+    parser.add_argument(
+        '--db',
+        help='Read the characterized units of a results database instead'
+    )
+    parser.add_argument(
+        '--lot',
+        help='Only this lot'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='Worker processes parsing reports (default: one per core)'
+    )
+    parser.add_argument(
+        '--outliers',
+        type=int,
+        default=10,
+        help='Chips listed per outlier list (default: 10)'
+    )
+    parser.add_argument(
+        '--sigma',
+        type=float,
+        default=3.0,
+        help='Flag chips beyond this many standard deviations (default: 3)'
+    )
+    parser.add_argument(
+        '--output',
+        help='Also write the summary as JSON to this file'
+    )
+    
+    args = parser.parse_args()
+    if not args.reports and not args.db:
+        parser.error("reports or --db required")
+    
+    fleet = FleetSummary(args.outliers, args.sigma)
+    
+    if args.db:
+        with ResultsDatabase(args.db) as db:
+            for summary in db.characterization_summaries(args.lot):
+                fleet.add(summary)
+    
+    if args.reports:
+        summarize_files(find_reports(args.reports), fleet, args.jobs, args.lot)
+    
+    for line in fleet.format():
+        print(line)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(fleet.to_dict(), f, indent=2)
+        print(f"\n✓ Resumen JSON: {args.output}")
+    
+    sys.exit(0 if fleet.fleet.chips else 1)
+
+if __name__ == "__main__":
+    main()
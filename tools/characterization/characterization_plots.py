@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Characterization Plots
+=====================================
+
+The four report panels (Fmax vs voltage, power vs frequency, functional
+validation, 25 MHz stability vs temperature) rendered off the measurement
+path:
+
+- SVG (default) is written directly, with no plotting library
+- PNG uses matplotlib, imported only when a PNG is rendered (Agg backend,
+  100 dpi by default); without matplotlib PNG falls back to SVG
+- rendering runs in a background worker (a process for PNG, so the
+  matplotlib import and render stay out of the characterization process),
+  and the next DUT does not wait for it
+
+    plotter = PlotRenderer("svg")
+    future = plotter.submit(plot_panels(results, data), "chip_plots.svg")
+    ...
+    plotter.close()  # waits for pending plots
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import importlib.util
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+PLOT_FORMATS = ("svg", "png", "none")
+
+def plot_panels(results, data):
+    """Plain (picklable) series of the four report panels
+    
+    results is the characterizer results dict, data its
+    CharacterizationData. Each panel: title, xlabel, ylabel, kind ("line"
+    or "bar"), x, y and, for bars, labels and colors. Panels without data
+    have empty x/y.
+    """
+    panels = []
+    
+    # Plot 1: Frequency vs Voltage
+    voltages, max_freqs = data.fmax_vs_voltage(25) if len(data) else ([], [])
+    panels.append({
+        "title": "Frequency vs Voltage @ 25°C", "xlabel": "Voltage (V)",
+        "ylabel": "Max Frequency (MHz)", "kind": "line", "color": "blue",
+        "x": [float(v) for v in voltages], "y": [float(f) for f in max_freqs]
+    })
+    
+    # Plot 2: Power vs Frequency
+    power_data = results.get('power_characterization', {})
+    freqs = [freq for freq in sorted(power_data, key=float) if 'active' in power_data[freq]]
+    panels.append({
+        "title": "Power Consumption vs Frequency", "xlabel": "Frequency (MHz)",
+        "ylabel": "Power (mW)", "kind": "line", "color": "red",
+        "x": [float(freq) for freq in freqs],
+        "y": [power_data[freq]['active']['power_mw'] for freq in freqs]
+    })
+    
+    # Plot 3: Functional validation
+    func_data = results.get('functional_validation', {})
+    peripherals = [p for p, d in func_data.items() if isinstance(d, dict) and 'status' in d]
+    statuses = [1 if func_data[p]['status'] == 'PASS' else 0 for p in peripherals]
+    panels.append({
+        "title": "Functional Validation Results", "xlabel": "",
+        "ylabel": "Pass (1) / Fail (0)", "kind": "bar",
+        "x": list(range(len(peripherals))), "y": statuses, "labels": peripherals,
+        "colors": ['green' if s else 'red' for s in statuses]
+    })
+    
+    # Plot 4: Temperature coefficient (25MHz is stable where Fmax reaches it)
+    temps, fmax = data.fmax_vs_temperature(1.8) if len(data) else ([], [])
+    panels.append({
+        "title": "25MHz Stability vs Temperature", "xlabel": "Temperature (°C)",
+        "ylabel": "25MHz Stable (MHz)", "kind": "line", "color": "green",
+        "x": [float(t) for t in temps], "y": [25.0 if f >= 25 else 0.0 for f in fmax]
+    })
+    
+    return panels
+
+def matplotlib_available():
+    """True when matplotlib can be imported (checked without importing it)"""
+    return importlib.util.find_spec("matplotlib") is not None
+
+def render(panels, filename, dpi=100):
+    """Write the panels to filename (format from its extension)"""
+    if filename.endswith(".png"):
+        render_png(panels, filename, dpi)
+    else:
+        render_svg(panels, filename)
+    return filename
+
+def render_png(panels, filename, dpi=100):
+    """2x2 matplotlib figure; matplotlib is imported here, not at load"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+    for ax, panel in zip(axes.flat, panels):
+        if not panel["x"]:
+            continue
+        if panel["kind"] == "bar":
+            ax.bar(panel["x"], panel["y"], color=panel["colors"])
+            ax.set_xticks(panel["x"])
+            ax.set_xticklabels(panel["labels"], rotation=45)
+        else:
+            ax.plot(panel["x"], panel["y"], 'o-', color=panel["color"])
+            ax.grid(True)
+        ax.set_xlabel(panel["xlabel"])
+        ax.set_ylabel(panel["ylabel"])
+        ax.set_title(panel["title"])
+    
+    fig.tight_layout()
+    fig.savefig(filename, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+
+def nice_ticks(low, high, count=5):
+    """Round tick values covering [low, high]"""
+    if high <= low:
+        low, high = low - 1, high + 1
+    raw = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    first = math.floor(low / step) * step
+    last = math.ceil(high / step) * step
+    return [round(v, 10) for v in np.arange(first, last + step / 2, step)]
+
+def render_svg(panels, filename, width=1200, height=1000):
+    """2x2 SVG figure written as text, no plotting library needed"""
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="12">',
+        f'<rect width="{width}" height="{height}" fill="white"/>'
+    ]
+    for index, panel in enumerate(panels[:4]):
+        x0 = (index % 2) * width / 2
+        y0 = (index // 2) * height / 2
+        parts.extend(_svg_panel(panel, x0, y0, width / 2, height / 2))
+    parts.append('</svg>')
+    
+    with open(filename, 'w') as f:
+        f.write("\n".join(parts) + "\n")
+
+def _svg_panel(panel, x0, y0, width, height):
+    left, right, top, bottom = x0 + 70, x0 + width - 20, y0 + 40, y0 + height - 70
+    parts = [
+        f'<text x="{(left + right) / 2:.1f}" y="{y0 + 24:.1f}" text-anchor="middle" '
+        f'font-size="14">{escape(panel["title"])}</text>',
+        f'<rect x="{left:.1f}" y="{top:.1f}" width="{right - left:.1f}" '
+        f'height="{bottom - top:.1f}" fill="none" stroke="black"/>'
+    ]
+    if not panel["x"]:
+        return parts
+    
+    bar = panel["kind"] == "bar"
+    if bar:
+        x_low, x_high = -0.6, len(panel["x"]) - 0.4
+        y_ticks = nice_ticks(0, max(max(panel["y"]), 1))
+    else:
+        x_ticks = nice_ticks(min(panel["x"]), max(panel["x"]))
+        x_low, x_high = x_ticks[0], x_ticks[-1]
+        y_ticks = nice_ticks(min(panel["y"]), max(panel["y"]))
+    y_low, y_high = y_ticks[0], y_ticks[-1]
+    
+    def sx(value):
+        return left + (value - x_low) / (x_high - x_low) * (right - left)
+    
+    def sy(value):
+        return bottom - (value - y_low) / (y_high - y_low) * (bottom - top)
+    
+    for tick in y_ticks:
+        y = sy(tick)
+        if not bar:
+            parts.append(f'<line x1="{left:.1f}" y1="{y:.1f}" x2="{right:.1f}" y2="{y:.1f}" '
+                         f'stroke="#dddddd"/>')
+        parts.append(f'<text x="{left - 6:.1f}" y="{y + 4:.1f}" text-anchor="end">{tick:g}</text>')
+    
+    if bar:
+        bar_width = 0.8 * (sx(1) - sx(0))
+        for x, y, color, label in zip(panel["x"], panel["y"], panel["colors"], panel["labels"]):
+            parts.append(f'<rect x="{sx(x) - bar_width / 2:.1f}" y="{sy(y):.1f}" '
+                         f'width="{bar_width:.1f}" height="{sy(0) - sy(y):.1f}" fill="{color}"/>')
+            parts.append(f'<text x="{sx(x):.1f}" y="{bottom + 14:.1f}" text-anchor="end" '
+                         f'transform="rotate(-45 {sx(x):.1f} {bottom + 14:.1f})">'
+                         f'{escape(label)}</text>')
+    else:
+        for tick in x_ticks:
+            x = sx(tick)
+            parts.append(f'<line x1="{x:.1f}" y1="{top:.1f}" x2="{x:.1f}" y2="{bottom:.1f}" '
+                         f'stroke="#dddddd"/>')
+            parts.append(f'<text x="{x:.1f}" y="{bottom + 16:.1f}" text-anchor="middle">{tick:g}</text>')
+        points = " ".join(f"{sx(x):.1f},{sy(y):.1f}" for x, y in zip(panel["x"], panel["y"]))
+        parts.append(f'<polyline points="{points}" fill="none" stroke="{panel["color"]}" '
+                     f'stroke-width="2"/>')
+        parts.extend(f'<circle cx="{sx(x):.1f}" cy="{sy(y):.1f}" r="4" fill="{panel["color"]}"/>'
+                     for x, y in zip(panel["x"], panel["y"]))
+    
+    parts.append(f'<text x="{(left + right) / 2:.1f}" y="{y0 + height - 22:.1f}" '
+                 f'text-anchor="middle">{escape(panel["xlabel"])}</text>')
+    parts.append(f'<text x="{x0 + 18:.1f}" y="{(top + bottom) / 2:.1f}" text-anchor="middle" '
+                 f'transform="rotate(-90 {x0 + 18:.1f} {(top + bottom) / 2:.1f})">'
+                 f'{escape(panel["ylabel"])}</text>')
+    return parts
+
+class PlotRenderer:
+    """Renders report plots in a background worker
+    
+    format: "svg", "png" or "none" (no plots). PNG without matplotlib
+    installed falls back to SVG. PNGs are rendered in worker processes
+    (matplotlib holds the GIL), SVGs in a thread.
+    """
+    
+    def __init__(self, format="svg", dpi=100, workers=1):
+        if format == "png" and not matplotlib_available():
+            print("✗ matplotlib no disponible - gráficos en SVG")
+            format = "svg"
+        self.format = format
+        self.dpi = dpi
+        self.workers = workers
+        self.executor = None
+        self.pending = []
+    
+    @property
+    def extension(self):
+        return None if self.format == "none" else f".{self.format}"
+    
+    def submit(self, panels, filename):
+        """Queue a plot; returns a future of the written file name"""
+        if self.executor is None:
+            pool = ProcessPoolExecutor if self.format == "png" else ThreadPoolExecutor
+            self.executor = pool(max_workers=self.workers)
+        future = self.executor.submit(render, panels, filename, self.dpi)
+        self.pending.append((filename, future))
+        return future
+    
+    def close(self):
+        """Wait for the pending plots; False when one of them failed"""
+        ok = True
+        for filename, future in self.pending:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"✗ Gráficos {filename}: {e}")
+                ok = False
+        self.pending = []
+        
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        return ok
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Settle Detection
+===============================
+
+Replaces fixed stabilization sleeps: after a condition change the DUT is
+polled (normally MEAS:CURRENT?) until the last few readings agree within
+a tolerance window, or until a maximum time has passed. The time it took
+is kept with the measurement, so slow-settling points stay visible.
+
+    detector = SettleDetector(tolerance=0.01, floor=0.05, max_time=5.0)
+    result = detector.wait(lambda: float(send_command("MEAS:CURRENT?")))
+    result["settle_s"], result["settled"]
+
+A window is settled when max - min <= max(tolerance * |mean|, floor):
+tolerance is relative, floor the absolute resolution of the measurement
+(so noise on near-zero sleep currents does not keep it from settling).
+min_time is a minimum soak: no window counts as settled before it.
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import time
+from collections import deque
+
+class SettleDetector:
+    """Polls a reading until it stops moving
+    
+    tolerance: allowed spread of the window, relative to its mean
+    floor:     smallest allowed spread, in reading units
+    window:    consecutive readings that must agree
+    interval:  seconds between readings
+    max_time:  give up (settled False) after this many seconds
+    min_time:  never settled before this many seconds
+    """
+    
+    def __init__(self, tolerance=0.01, floor=0.05, window=3, interval=0.05, max_time=5.0,
+                 min_time=0.0):
+        self.tolerance = tolerance
+        self.floor = floor
+        self.window = window
+        self.interval = interval
+        self.max_time = max_time
+        self.min_time = min_time
+    
+    def is_settled(self, readings):
+        """True when a full window of readings lies within the tolerance"""
+        if len(readings) < self.window:
+            return False
+        mean = sum(readings) / len(readings)
+        return max(readings) - min(readings) <= max(self.tolerance * abs(mean), self.floor)
+    
+    def wait(self, read, max_time=None):
+        """Poll read() until settled or max_time; returns the settle record
+        
+        {"settled": bool, "settle_s": seconds, "value": window mean,
+         "readings": number of readings taken}
+        """
+        max_time = self.max_time if max_time is None else max_time
+        readings = deque(maxlen=self.window)
+        start = time.monotonic()
+        count = 0
+        
+        while True:
+            readings.append(read())
+            count += 1
+            elapsed = time.monotonic() - start
+            
+            settled = elapsed >= self.min_time and self.is_settled(readings)
+            if settled or elapsed >= max_time:
+                return {
+                    "settled": settled,
+                    "settle_s": round(elapsed, 3),
+                    "value": sum(readings) / len(readings),
+                    "readings": count
+                }
+            
+            time.sleep(min(self.interval, max(0.0, max_time - elapsed)))
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Shmoo Engine
+===========================
+
+Finds the maximum stable frequency (the pass/fail boundary) at every
+voltage/temperature corner by search instead of by testing a fixed list
+of frequencies:
+
+- The first corner is bisected over the whole frequency range.
+- Later corners start from a boundary predicted from the corners already
+  measured (neighbouring temperature and voltage trends). Fmax moves
+  smoothly between corners, so the bracket is usually found with two
+  probes and closed with one or two more.
+
+The result is a boundary per corner at any resolution, from which the
+full pass/fail shmoo grid (temperature x voltage x frequency) and the
+classic text shmoo plot are derived. The search assumes a monotonic
+device: stable below Fmax, unstable above it.
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import math
+
+import numpy as np
+
+def search_boundary(test, low, high, resolution, seed=None):
+    """Highest passing value in [low, high], to within resolution
+    
+    test(value) -> bool must pass below the boundary and fail above it.
+    From seed the bracket is widened in doubling steps, then bisected.
+    Returns (boundary, tested): boundary is None when low already fails,
+    tested maps every probed value to its result.
+    """
+    tested = {}
+    
+    def probe(value):
+        value = round(value, 3)
+        if value not in tested:
+            tested[value] = test(value)
+        return tested[value]
+    
+    if seed is None:
+        if not probe(low):
+            return None, tested
+        if probe(high):
+            return high, tested
+        passing, failing = low, high
+    else:
+        step = resolution
+        start = min(max(seed, low), high)
+        if probe(start):
+            passing = start
+            while True:
+                if passing >= high:
+                    return high, tested
+                candidate = min(passing + step, high)
+                if not probe(candidate):
+                    failing = candidate
+                    break
+                passing = candidate
+                step *= 2
+        else:
+            failing = start
+            while True:
+                if failing <= low:
+                    return None, tested
+                candidate = max(failing - step, low)
+                if probe(candidate):
+                    passing = candidate
+                    break
+                failing = candidate
+                step *= 2
+    
+    while failing - passing > resolution:
+        middle = round((passing + failing) / 2, 3)
+        if probe(middle):
+            passing = middle
+        else:
+            failing = middle
+    
+    return round(passing, 3), tested
+
+def expected_probes(low, high, resolution, corners):
+    """Typical number of points to shmoo corners (seeded after the first)"""
+    if not corners:
+        return 0
+    first = 2 + math.ceil(math.log2(max(1.0, (high - low) / resolution)))
+    return first + 3 * (corners - 1)
+
+class ShmooGrid:
+    """Fmax boundary of every (temperature, voltage) corner"""
+    
+    def __init__(self, low, high, resolution=0.5):
+        self.low = low
+        self.high = high
+        self.resolution = resolution
+        self.fmax = {}    # (temperature, voltage) -> boundary, None if low fails
+        self.probes = {}  # (temperature, voltage) -> points tested
+    
+    def seed(self, temperature, voltage):
+        """Predicted boundary from the measured corners, or None
+        
+        With the same voltage measured at another temperature and a
+        neighbouring voltage at both temperatures, the voltage trend of
+        this temperature is added to it; otherwise the nearest corner at
+        the same voltage, then at the same temperature, is used (the
+        latter extrapolated from its two nearest voltages when possible).
+        """
+        measured = {corner: fmax for corner, fmax in self.fmax.items() if fmax is not None}
+        
+        other_temperatures = sorted(
+            (t for t, v in measured if v == voltage and t != temperature),
+            key=lambda t: abs(t - temperature)
+        )
+        same_temperature = sorted(
+            (v for t, v in measured if t == temperature and v != voltage),
+            key=lambda v: abs(v - voltage)
+        )
+        
+        if other_temperatures:
+            nearest_t = other_temperatures[0]
+            for nearest_v in same_temperature:
+                if (nearest_t, nearest_v) in measured:
+                    return (measured[(nearest_t, voltage)] + measured[(temperature, nearest_v)]
+                            - measured[(nearest_t, nearest_v)])
+            return measured[(nearest_t, voltage)]
+        
+        if len(same_temperature) >= 2:
+            v1, v2 = same_temperature[:2]
+            f1, f2 = measured[(temperature, v1)], measured[(temperature, v2)]
+            return f1 + (f2 - f1) * (voltage - v1) / (v2 - v1)
+        if same_temperature:
+            return measured[(temperature, same_temperature[0])]
+        return None
+    
+    def search(self, temperature, voltage, test):
+        """Find the boundary at one corner; returns (fmax, tested points)"""
+        fmax, tested = search_boundary(
+            test, self.low, self.high, self.resolution,
+            seed=self.seed(temperature, voltage)
+        )
+        self.fmax[(temperature, voltage)] = fmax
+        self.probes[(temperature, voltage)] = len(tested)
+        return fmax, tested
+    
+    def grid(self, temperatures, voltages, frequencies=None):
+        """Pass/fail array indexed [temperature, voltage, frequency]
+        
+        frequencies defaults to the search range at the search resolution.
+        Corners not measured are all False.
+        """
+        if frequencies is None:
+            frequencies = self.frequency_axis()
+        boundaries = np.array([
+            [self.fmax.get((t, v)) or -np.inf for v in voltages]
+            for t in temperatures
+        ], dtype=float)
+        return boundaries[:, :, None] >= np.asarray(frequencies, dtype=float)[None, None, :]
+    
+    def frequency_axis(self):
+        """Frequencies from low to high in resolution steps"""
+        steps = int(round((self.high - self.low) / self.resolution))
+        return np.round(self.low + np.arange(steps + 1) * self.resolution, 3)
+    
+    def to_dict(self):
+        return {
+            "range_mhz": [self.low, self.high],
+            "resolution_mhz": self.resolution,
+            "corners": [
+                {
+                    "temperature": temperature,
+                    "voltage": voltage,
+                    "fmax_mhz": fmax,
+                    "probes": self.probes.get((temperature, voltage), 0)
+                }
+                for (temperature, voltage), fmax in self.fmax.items()
+            ]
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        shmoo = cls(data["range_mhz"][0], data["range_mhz"][1], data["resolution_mhz"])
+        for corner in data["corners"]:
+            key = (corner["temperature"], corner["voltage"])
+            shmoo.fmax[key] = corner["fmax_mhz"]
+            shmoo.probes[key] = corner.get("probes", 0)
+        return shmoo
+    
+    def format(self, columns=48):
+        """Text shmoo plot per temperature: voltage rows, '*' pass '.' fail"""
+        temperatures = sorted({t for t, _ in self.fmax})
+        voltages = sorted({v for _, v in self.fmax}, reverse=True)
+        step = max(self.resolution, (self.high - self.low) / columns)
+        frequencies = np.arange(self.low, self.high + step / 2, step)
+        passing = self.grid(temperatures, voltages, frequencies)
+        
+        lines = []
+        for t_index, temperature in enumerate(temperatures):
+            lines.append(f"{temperature}°C")
+            for v_index, voltage in enumerate(voltages):
+                row = "".join("*" if p else "." for p in passing[t_index, v_index])
+                fmax = self.fmax.get((temperature, voltage))
+                lines.append(f"  {voltage:4.2f}V |{row}| "
+                             f"{'-' if fmax is None else f'{fmax:.1f}'} MHz")
+            lines.append(f"         {self.low:<{len(frequencies) // 2}g}"
+                         f"{self.high:>{len(frequencies) - len(frequencies) // 2 + 1}g} MHz")
+        return lines
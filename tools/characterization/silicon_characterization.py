@@ -7,21 +7,40 @@ This tool performs comprehensive characterization of AxiomaCore-328 silicon
 including frequency testing, power measurement, and functionality validation.
 
 Features:
-- Automated frequency characterization
+- Automated frequency characterization, temperature-outer sweep order
+  with the expected sweep time reported up front
+- Shmoo: Fmax searched at every voltage/temperature corner (shmoo.py)
+- Checkpoint journal of every measured point; --resume continues an
+  interrupted run without repeating measurements (sweep_journal.py)
 - Power consumption measurement  
-- Temperature coefficient analysis
+- Settle detection instead of fixed stabilization delays (settle time
+  recorded for every point); temperature changes soak on the die
+  temperature readback for at least a minimum soak time
+- Temperature coefficient analysis (columnar NumPy results,
+  characterization_data.py)
 - Yield binning classification
 - Compliance testing
-- Report generation
+- Report generation; plots rendered in the background as SVG (no
+  plotting library) or PNG via matplotlib (characterization_plots.py)
+- Several DUTs in one temperature chamber: each condition is soaked once
+  and all DUTs are measured in parallel
 
 Requirements:
 - Python 3.7+
 - pyserial for UART communication
-- matplotlib for plotting
+- matplotlib (optional) for PNG plots
 - numpy for analysis
 
 Usage:
     python3 silicon_characterization.py --port /dev/ttyUSB0 --chip A328-001
+    python3 silicon_characterization.py --port socket://localhost:5328   # simulated DUT
+    python3 silicon_characterization.py --port /dev/ttyUSB0 --trace char.axtrace
+    python3 silicon_characterization.py --port replay://char.axtrace      # no hardware
+    python3 silicon_characterization.py --port /dev/ttyUSB0 /dev/ttyUSB1 /dev/ttyUSB2
+    python3 silicon_characterization.py --port /dev/ttyUSB0 --plan       # sweep time only
+    python3 silicon_characterization.py --port /dev/ttyUSB0 --exhaustive # every frequency point
+    python3 silicon_characterization.py --port /dev/ttyUSB0 --resume     # after an interruption
+    python3 silicon_characterization.py --port /dev/ttyUSB0 --plots png  # matplotlib PNG plots
 
 © 2025 AxiomaCore Project
 Licensed under Apache 2.0
@@ -29,31 +48,88 @@ Licensed under Apache 2.0
 
 import argparse
 import serial
-import time
 import json
 import csv
-import matplotlib.pyplot as plt
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from axioma_replay import serial_for_url
+from axioma_transport import Instrumentation, SerialTransport
+from axioma_results_db import ResultsDatabase
+from characterization_data import CharacterizationData, speed_grade
+from characterization_plots import PLOT_FORMATS, PlotRenderer, plot_panels
+from settling import SettleDetector
+from shmoo import ShmooGrid, expected_probes
+from sweep_journal import SweepJournal
+from sweep_planner import SweepPlanner
+
 class AxiomaCoreCharacterizer:
     """Main characterization class for AxiomaCore-328"""
     
-    def __init__(self, port, baudrate=115200, timeout=10):
+    def __init__(self, port, baudrate=115200, timeout=10, pipeline_depth=16,
+                 ready_deadline=5.0, binary=False):
         """Initialize characterizer with serial connection"""
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.pipeline_depth = pipeline_depth
+        self.ready_deadline = ready_deadline
+        self.binary = binary  # Negotiate the binary framed protocol
         self.serial_conn = None
+        self.transport = None
         self.results = {}
         self.chip_id = "UNKNOWN"
+        self.lot_id = None
+        self.results_db = None  # Path of the shared SQLite results database
+        self.trace_file = None  # Binary session trace (replay with replay://)
+        self.instrumentation = None
+        self.data = CharacterizationData()  # Frequency sweep points, by corner
+        self.plotter = PlotRenderer()  # Background plot rendering, may be shared
+        self.shmoo = None  # Fmax boundaries of the running frequency sweep
+        self.corner = None  # (voltage, temperature) being measured
+        
+        # Checkpointing: journal of this run, and what a resumed run reuses
+        self.resume = False
+        self.journal = None
+        self.completed_points = {}   # (voltage, temperature, frequency) -> point
+        self.completed_corners = set()
+        self.log_prefix = ""  # Identifies the DUT when several run in parallel
         
         # Characterization parameters
         self.frequency_points = [8, 12, 16, 20, 25, 28, 30, 32]  # MHz
         self.voltage_points = [1.6, 1.7, 1.8, 1.9, 2.0]          # Volts
         self.temperature_points = [-40, -25, 0, 25, 50, 85]       # Celsius
+        self.power_frequencies = [8, 16, 20, 25]                  # MHz
+        
+        # "shmoo" searches Fmax between the lowest and highest frequency
+        # point at shmoo_resolution (MHz); "exhaustive" tests every point
+        self.sweep_mode = "shmoo"
+        self.shmoo_resolution = 0.5
+        
+        # Settle detection: MEAS:CURRENT? is polled until settle_window
+        # readings agree within settle_tolerance (relative) or settle_floor
+        # (mA); the *_time values are the maximum waits in seconds
+        self.stabilization_time = 5     # After temperature changes
+        self.voltage_settle_time = 1    # After a voltage change alone
+        self.frequency_settle_time = 1  # After each frequency change
+        self.power_settle_time = 2      # After power frequency/mode changes
+        self.settle_tolerance = 0.01
+        self.settle_floor = 0.05
+        self.settle_window = 3
+        self.settle_interval = 0.05
+        
+        # Temperature changes soak on the die temperature (MEAS:TEMPERATURE?;
+        # supply current on firmware without it) with a window sized to
+        # thermal drift: soak_window readings soak_interval s apart within
+        # soak_floor (°C), and never before min_soak_time seconds
+        self.soak_window = 5
+        self.soak_interval = 0.5
+        self.soak_floor = 0.2
+        self.min_soak_time = 2.0
+        self.soak_signal = None  # Probed on the first soak
         
         # Specification limits
         self.spec_limits = {
@@ -65,26 +141,33 @@ class AxiomaCoreCharacterizer:
             'min_temp': -40,        # C
             'max_temp': 85          # C
         }
-        
+    
     def connect(self):
         """Establish serial connection to AxiomaCore-328"""
         try:
-            self.serial_conn = serial.Serial(
+            self.serial_conn = serial_for_url(
                 self.port, 
                 self.baudrate, 
                 timeout=self.timeout
             )
-            time.sleep(2)  # Wait for reset
+            self.transport = SerialTransport(
+                self.serial_conn, self.pipeline_depth, binary=self.binary
+            )
+            if self.trace_file:
+                self.instrumentation = Instrumentation(self.trace_file)
+                self.transport.add_observer(self.instrumentation)
+            
+            # Poll identification until the device is out of reset
+            response, latency = self.transport.wait_until_ready(deadline=self.ready_deadline)
+            self.results['boot_latency_ms'] = round(latency * 1000, 3)
             
-            # Send identification command
-            response = self.send_command("*IDN?")
-            if "AxiomaCore-328" in response:
-                print(f"✓ Conectado a AxiomaCore-328 en {self.port}")
+            if response:
+                print(f"✓ Conectado a AxiomaCore-328 en {self.port} ({latency * 1000:.1f} ms)")
                 return True
             else:
-                print(f"✗ Dispositivo no reconocido: {response}")
+                print(f"✗ Dispositivo no reconocido tras {latency:.2f}s")
                 return False
-                
+        
         except serial.SerialException as e:
             print(f"✗ Error de conexión: {e}")
             return False
@@ -94,79 +177,280 @@ class AxiomaCoreCharacterizer:
         if self.serial_conn and self.serial_conn.is_open:
             self.serial_conn.close()
             print("✓ Conexión cerrada")
+        if self.instrumentation:
+            self.instrumentation.close()
+            self.instrumentation = None
     
     def send_command(self, command):
         """Send command and get response"""
         if not self.serial_conn or not self.serial_conn.is_open:
             raise Exception("Conexión serial no disponible")
         
-        self.serial_conn.write((command + '\n').encode())
-        response = self.serial_conn.readline().decode().strip()
-        return response
+        return self.transport.send_command(command)
+    
+    def send_batch(self, commands):
+        """Send several commands, pipelined, and get responses in order"""
+        if not self.serial_conn or not self.serial_conn.is_open:
+            raise Exception("Conexión serial no disponible")
+        
+        return self.transport.send_batch(commands)
+    
+    def set_conditions(self, voltage, temperature=None):
+        """Apply supply voltage and chamber temperature (without waiting)
+        
+        temperature None leaves the chamber set point unchanged.
+        """
+        commands = [f"SET:VOLTAGE {voltage}"]
+        if temperature is not None:
+            commands.append(f"SET:TEMPERATURE {temperature}")
+        self.send_batch(commands)
+    
+    def wait_settled(self, max_time):
+        """Poll MEAS:CURRENT? until it settles or max_time seconds pass"""
+        detector = SettleDetector(
+            tolerance=self.settle_tolerance,
+            floor=self.settle_floor,
+            window=self.settle_window,
+            interval=self.settle_interval,
+            max_time=max_time
+        )
+        settle = detector.wait(lambda: float(self.send_command("MEAS:CURRENT?")))
+        return dict(settle, signal="current")
+    
+    def probe_soak_signal(self):
+        """Soak signal: temperature with die temperature readback, else current"""
+        if self.soak_signal is None:
+            try:
+                float(self.send_command("MEAS:TEMPERATURE?"))
+                self.soak_signal = "temperature"
+            except (TypeError, ValueError):
+                self.soak_signal = "current"
+        return self.soak_signal
+    
+    def wait_soaked(self, max_time):
+        """Soak after a temperature change until the die stops drifting"""
+        signal = self.probe_soak_signal()
+        if signal == "temperature":
+            command, tolerance, floor = "MEAS:TEMPERATURE?", 0.0, self.soak_floor
+        else:
+            command, tolerance, floor = "MEAS:CURRENT?", self.settle_tolerance, self.settle_floor
+        
+        detector = SettleDetector(
+            tolerance=tolerance,
+            floor=floor,
+            window=self.soak_window,
+            interval=self.soak_interval,
+            max_time=max_time,
+            min_time=min(self.min_soak_time, max_time)
+        )
+        settle = detector.wait(lambda: float(self.send_command(command)))
+        return dict(settle, signal=signal)
+    
+    def settle_conditions(self, voltage, temperature, max_time, soak=False):
+        """Wait until the DUT settles at new conditions and record the time
+        
+        soak: the chamber temperature changed (see wait_soaked)
+        """
+        settle = self.wait_soaked(max_time) if soak else self.wait_settled(max_time)
+        self.results.setdefault('condition_settling', []).append(
+            dict(settle, voltage=voltage, temperature=temperature)
+        )
+        self.journal_record("condition", voltage=voltage, temperature=temperature,
+                            settle=settle)
+        if not settle['settled']:
+            print(f"{self.log_prefix}  ⚠ Sin estabilizar tras {settle['settle_s']:.1f}s")
+        return settle
+    
+    def open_journal(self, output_dir):
+        """Start the checkpoint journal of this chip (reloading it on resume)"""
+        path = os.path.join(output_dir, f"axioma328_journal_{self.chip_id}.jsonl")
+        self.journal = SweepJournal(path, resume=self.resume)
+        
+        if self.journal.records:
+            self.restore_journal(self.journal.records)
+            print(f"{self.log_prefix}✓ Reanudando desde {path}: "
+                  f"{len(self.completed_points)} puntos, "
+                  f"{len(self.completed_corners)} esquinas completas")
+        else:
+            self.journal_record("session", chip_id=self.chip_id, port=self.port,
+                                started=datetime.now(timezone.utc).isoformat())
+    
+    def restore_journal(self, records):
+        """Reload the points, settles and finished steps of a journal"""
+        for record in records:
+            kind = record["type"]
+            if kind == "point":
+                key = (record["voltage"], record["temperature"], record["frequency"])
+                self.completed_points[key] = record["point"]
+            elif kind == "corner":
+                self.completed_corners.add((record["voltage"], record["temperature"]))
+            elif kind == "condition":
+                self.results.setdefault('condition_settling', []).append(
+                    dict(record["settle"], voltage=record["voltage"],
+                         temperature=record["temperature"])
+                )
+            elif kind == "result":
+                value = record["value"]
+                if record["key"] == 'power_characterization':
+                    # JSON object keys are strings; frequencies are numbers
+                    value = {int(freq): modes for freq, modes in value.items()}
+                self.results[record["key"]] = value
+    
+    def journal_record(self, kind, **fields):
+        """Append one record to the journal (if checkpointing is active)"""
+        if self.journal:
+            self.journal.append(dict(type=kind, **fields))
+    
+    def close_journal(self):
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+    
+    def plan_sweep(self):
+        """Order of the frequency sweep and its expected duration"""
+        planner = SweepPlanner(
+            temperature_soak=self.stabilization_time,
+            voltage_settle=self.voltage_settle_time,
+            frequency_settle=self.frequency_settle_time
+        )
+        
+        points_per_condition = None
+        if self.sweep_mode == "shmoo":
+            corners = len(self.temperature_points) * len(self.voltage_points)
+            points_per_condition = expected_probes(
+                min(self.frequency_points), max(self.frequency_points),
+                self.shmoo_resolution, corners
+            ) / corners
+        
+        return planner.plan(self.temperature_points, self.voltage_points,
+                            self.frequency_points, points_per_condition=points_per_condition)
+    
+    def measure_frequency_point(self, freq):
+        """Run at freq once settled; returns stability and supply current
+        
+        Points already in the journal of a resumed run are not measured again.
+        """
+        voltage, temp = self.corner
+        if (voltage, temp, freq) in self.completed_points:
+            return self.completed_points[(voltage, temp, freq)]
+        
+        self.send_command(f"SET:FREQUENCY {freq}")
+        settle = self.wait_settled(self.frequency_settle_time)
+        
+        # Check if frequency is stable
+        stable, current = self.send_batch(["FREQ:STABLE?", "MEAS:CURRENT?"])
+        current = float(current)
+        
+        status = "✓" if stable == "TRUE" else "✗"
+        print(f"{self.log_prefix}  {freq}MHz: {status} ({current:.2f}mA, "
+              f"settle {settle['settle_s']:.2f}s)")
+        
+        point = {
+            'stable': stable == "TRUE",
+            'current_ma': current,
+            'settle_s': settle['settle_s'],
+            'settled': settle['settled']
+        }
+        self.journal_record("point", voltage=voltage, temperature=temp, frequency=freq,
+                            point=point)
+        return point
+    
+    def sweep_frequencies(self):
+        """Test every frequency point at the current voltage and temperature"""
+        return {freq: self.measure_frequency_point(freq) for freq in self.frequency_points}
+    
+    def shmoo_corner(self, voltage, temp):
+        """Search Fmax at the current conditions; returns the points tested"""
+        points = {}
+        
+        def stable_at(freq):
+            points[freq] = self.measure_frequency_point(freq)
+            return points[freq]['stable']
+        
+        fmax, _ = self.shmoo.search(temp, voltage, stable_at)
+        self.results['shmoo'] = self.shmoo.to_dict()
+        print(f"{self.log_prefix}  Fmax: {fmax if fmax is not None else '-'} MHz "
+              f"({len(points)} puntos)")
+        
+        return dict(sorted(points.items()))
+    
+    def begin_frequency_sweep(self):
+        """Reset the frequency results (and shmoo boundaries) for a new sweep"""
+        self.results['frequency_characterization'] = {voltage: {} for voltage in self.voltage_points}
+        self.results.pop('shmoo', None)
+        self.data = CharacterizationData()
+        self.shmoo = None
+        if self.sweep_mode == "shmoo":
+            self.shmoo = ShmooGrid(min(self.frequency_points), max(self.frequency_points),
+                                   self.shmoo_resolution)
+    
+    def measure_corner(self, voltage, temp):
+        """Frequency points of one corner: Fmax search or every point"""
+        self.corner = (voltage, temp)
+        if self.shmoo:
+            points = self.shmoo_corner(voltage, temp)
+        else:
+            points = self.sweep_frequencies()
+        
+        self.results['frequency_characterization'][voltage][temp] = points
+        self.data.add_corner(voltage, temp, points)
+        if (voltage, temp) not in self.completed_corners:
+            self.completed_corners.add((voltage, temp))
+            self.journal_record("corner", voltage=voltage, temperature=temp)
+        return points
+    
+    def record_result(self, key, value):
+        """Store a finished characterization step and checkpoint it"""
+        self.results[key] = value
+        self.journal_record("result", key=key, value=value)
     
     def characterize_frequency_response(self):
         """Characterize frequency response across voltage and temperature"""
         print("\n=== CARACTERIZACIÓN DE FRECUENCIA ===")
         
-        freq_results = {}
+        # Temperature outermost: one chamber soak per temperature
+        plan = self.plan_sweep()
+        print(plan.format_estimate())
         
-        for voltage in self.voltage_points:
-            freq_results[voltage] = {}
-            
-            for temp in self.temperature_points:
-                print(f"Testing @ {voltage}V, {temp}°C...")
-                
-                # Set test conditions
-                self.send_command(f"SET:VOLTAGE {voltage}")
-                self.send_command(f"SET:TEMPERATURE {temp}")
-                time.sleep(5)  # Allow stabilization
-                
-                # Test frequency points
-                freq_results[voltage][temp] = {}
-                
-                for freq in self.frequency_points:
-                    self.send_command(f"SET:FREQUENCY {freq}")
-                    time.sleep(1)
-                    
-                    # Check if frequency is stable
-                    stable = self.send_command("FREQ:STABLE?")
-                    current = float(self.send_command("MEAS:CURRENT?"))
-                    
-                    freq_results[voltage][temp][freq] = {
-                        'stable': stable == "TRUE",
-                        'current_ma': current
-                    }
-                    
-                    status = "✓" if stable == "TRUE" else "✗"
-                    print(f"  {freq}MHz: {status} ({current:.2f}mA)")
-        
-        self.results['frequency_characterization'] = freq_results
-        return freq_results
-    
-    def characterize_power_consumption(self):
-        """Measure power consumption at different operating points"""
-        print("\n=== CARACTERIZACIÓN DE POTENCIA ===")
+        self.begin_frequency_sweep()
+        chamber = None
         
-        # Standard conditions: 25°C, 1.8V
-        self.send_command("SET:TEMPERATURE 25")
-        self.send_command("SET:VOLTAGE 1.8")
-        time.sleep(5)
+        for temp, voltage in plan.conditions:
+            if (voltage, temp) in self.completed_corners:
+                self.measure_corner(voltage, temp)  # Replayed from the journal
+                continue
+            
+            print(f"Testing @ {voltage}V, {temp}°C...")
+            
+            # Set test conditions
+            if temp != chamber:
+                self.set_conditions(voltage, temp)
+                self.settle_conditions(voltage, temp, self.stabilization_time, True)
+                chamber = temp
+            else:
+                self.set_conditions(voltage)
+                self.settle_conditions(voltage, temp, self.voltage_settle_time)
+            
+            # Test frequency points
+            self.measure_corner(voltage, temp)
         
+        return self.results['frequency_characterization']
+    
+    def measure_power_modes(self):
+        """Current and power in every power mode at each power frequency"""
         power_results = {}
         
-        test_frequencies = [8, 16, 20, 25]
-        
-        for freq in test_frequencies:
+        for freq in self.power_frequencies:
             self.send_command(f"SET:FREQUENCY {freq}")
-            time.sleep(2)
             
             # Measure in different power modes
             modes = ['active', 'idle', 'sleep']
             power_results[freq] = {}
             
             for mode in modes:
+                # One settle wait covers the frequency and mode change
                 self.send_command(f"SET:POWERMODE {mode}")
-                time.sleep(1)
+                settle = self.wait_settled(self.power_settle_time)
                 
                 current = float(self.send_command("MEAS:CURRENT?"))
                 voltage = float(self.send_command("MEAS:VOLTAGE?"))
@@ -175,17 +459,31 @@ class AxiomaCoreCharacterizer:
                 power_results[freq][mode] = {
                     'current_ma': current,
                     'voltage_v': voltage,
-                    'power_mw': power
+                    'power_mw': power,
+                    'settle_s': settle['settle_s']
                 }
                 
-                print(f"  {freq}MHz {mode}: {current:.2f}mA, {power:.2f}mW")
+                print(f"{self.log_prefix}  {freq}MHz {mode}: {current:.2f}mA, {power:.2f}mW")
+        
+        return power_results
+    
+    def characterize_power_consumption(self):
+        """Measure power consumption at different operating points"""
+        print("\n=== CARACTERIZACIÓN DE POTENCIA ===")
+        
+        # Standard conditions: 25°C, 1.8V
+        self.set_conditions(1.8, 25)
+        self.settle_conditions(1.8, 25, self.stabilization_time, True)
         
-        self.results['power_characterization'] = power_results
+        power_results = self.measure_power_modes()
+        
+        self.record_result('power_characterization', power_results)
         return power_results
     
-    def functional_validation(self):
-        """Validate all functional blocks"""
-        print("\n=== VALIDACIÓN FUNCIONAL ===")
+    def functional_validation(self, header=True):
+        """Validate all functional blocks (header=False: caller prints it)"""
+        if header:
+            print("\n=== VALIDACIÓN FUNCIONAL ===")
         
         functional_results = {}
         
@@ -195,10 +493,10 @@ class AxiomaCoreCharacterizer:
             'Timer0', 'Timer1', 'PWM', 'EEPROM'
         ]
         
-        for peripheral in peripherals:
-            print(f"Testing {peripheral}...")
-            
-            test_result = self.send_command(f"TEST:{peripheral}")
+        print(f"Testing {', '.join(peripherals)}...")
+        test_responses = self.send_batch([f"TEST:{p}" for p in peripherals])
+        
+        for peripheral, test_result in zip(peripherals, test_responses):
             passed = test_result == "PASS"
             
             functional_results[peripheral] = {
@@ -207,12 +505,13 @@ class AxiomaCoreCharacterizer:
             }
             
             status = "✓" if passed else "✗"
-            print(f"  {peripheral}: {status}")
+            print(f"{self.log_prefix}  {peripheral}: {status}")
         
         # Test instruction set
         print("Testing instruction set...")
-        instruction_tests = int(self.send_command("TEST:INSTRUCTIONS"))
-        instruction_passed = int(self.send_command("TEST:INSTRUCTIONS:PASSED"))
+        instruction_tests, instruction_passed = map(int, self.send_batch([
+            "TEST:INSTRUCTIONS", "TEST:INSTRUCTIONS:PASSED"
+        ]))
         
         functional_results['instruction_set'] = {
             'total_tests': instruction_tests,
@@ -220,43 +519,25 @@ class AxiomaCoreCharacterizer:
             'pass_rate': (instruction_passed / instruction_tests) * 100
         }
         
-        print(f"  Instructions: {instruction_passed}/{instruction_tests} passed "
+        print(f"{self.log_prefix}  Instructions: {instruction_passed}/{instruction_tests} passed "
               f"({functional_results['instruction_set']['pass_rate']:.1f}%)")
         
-        self.results['functional_validation'] = functional_results
+        self.record_result('functional_validation', functional_results)
         return functional_results
     
-    def determine_speed_grade(self):
+    def determine_speed_grade(self, header=True):
         """Determine speed grade based on characterization results"""
-        print("\n=== DETERMINACIÓN DE GRADO ===")
-        
-        freq_data = self.results.get('frequency_characterization', {})
+        if header:
+            print("\n=== DETERMINACIÓN DE GRADO ===")
         
         # Test at nominal conditions (1.8V, 25°C)
-        if 1.8 in freq_data and 25 in freq_data[1.8]:
-            nominal_data = freq_data[1.8][25]
-            
-            max_stable_freq = 0
-            for freq, data in nominal_data.items():
-                if data['stable']:
-                    max_stable_freq = max(max_stable_freq, freq)
-        else:
+        max_stable_freq = self.data.fmax(1.8, 25)
+        if max_stable_freq is None:
             print("✗ No hay datos de condiciones nominales")
             return "UNKNOWN"
         
         # Determine grade based on maximum stable frequency
-        if max_stable_freq >= 32:
-            grade = "A328-32P"
-        elif max_stable_freq >= 25:
-            grade = "A328-25P"
-        elif max_stable_freq >= 20:
-            grade = "A328-20P"
-        elif max_stable_freq >= 16:
-            grade = "A328-16P"
-        elif max_stable_freq >= 8:
-            grade = "A328-8I"
-        else:
-            grade = "FAIL"
+        grade = speed_grade(max_stable_freq)
         
         self.results['speed_grade'] = {
             'grade': grade,
@@ -264,7 +545,21 @@ class AxiomaCoreCharacterizer:
             'test_conditions': '1.8V, 25°C'
         }
         
-        print(f"Grado determinado: {grade} (Max: {max_stable_freq}MHz)")
+        # Slowest corner inside the specified operating window
+        worst = self.data.worst_case(
+            self.spec_limits['min_voltage'], self.spec_limits['max_voltage'],
+            self.spec_limits['min_temp'], self.spec_limits['max_temp']
+        )
+        if worst:
+            self.results['speed_grade']['worst_case'] = {
+                'max_frequency': worst[0],
+                'voltage': worst[1],
+                'temperature': worst[2]
+            }
+        self.results['speed_grade']['temperature_coefficient_mhz_per_c'] = \
+            self.data.temperature_coefficient(1.8)
+        
+        print(f"{self.log_prefix}Grado determinado: {grade} (Max: {max_stable_freq}MHz)")
         return grade
     
     def generate_report(self, output_dir="reports"):
@@ -277,7 +572,9 @@ class AxiomaCoreCharacterizer:
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         base_filename = f"axioma328_characterization_{self.chip_id}_{timestamp}"
         
-        # Generate JSON report
+        # Generate JSON report (identified, so fleet aggregation needs no file names)
+        self.results['chip_id'] = self.chip_id
+        self.results['lot_id'] = self.lot_id
         json_file = os.path.join(output_dir, f"{base_filename}.json")
         with open(json_file, 'w') as f:
             json.dump(self.results, f, indent=2)
@@ -288,22 +585,25 @@ class AxiomaCoreCharacterizer:
         self.generate_csv_summary(csv_file)
         print(f"✓ Resumen CSV: {csv_file}")
         
-        # Generate plots
-        plot_file = os.path.join(output_dir, f"{base_filename}_plots.png")
-        self.generate_plots(plot_file)
-        print(f"✓ Gráficos: {plot_file}")
+        reports = {
+            'json': json_file,
+            'csv': csv_file
+        }
+        
+        # Generate plots (rendered in the background, plotter.close() waits)
+        if self.plotter.extension:
+            plot_file = os.path.join(output_dir, f"{base_filename}_plots{self.plotter.extension}")
+            self.generate_plots(plot_file)
+            print(f"✓ Gráficos: {plot_file}")
+            reports['plots'] = plot_file
         
         # Generate text report
         txt_file = os.path.join(output_dir, f"{base_filename}_report.txt")
         self.generate_text_report(txt_file)
         print(f"✓ Reporte texto: {txt_file}")
         
-        return {
-            'json': json_file,
-            'csv': csv_file,
-            'plots': plot_file,
-            'text': txt_file
-        }
+        reports['text'] = txt_file
+        return reports
     
     def generate_csv_summary(self, filename):
         """Generate CSV summary of key results"""
@@ -325,6 +625,27 @@ class AxiomaCoreCharacterizer:
                 'PASS' if 'FAIL' not in grade.get('grade', '') else 'FAIL'
             ])
             
+            # Fmax over the specified operating window
+            worst = grade.get('worst_case')
+            if worst:
+                writer.writerow([
+                    f"Fmax worst case ({worst['voltage']}V, {worst['temperature']:g}°C)",
+                    f"{worst['max_frequency']:.1f}",
+                    'MHz',
+                    f">={self.spec_limits['min_frequency']}",
+                    'PASS' if worst['max_frequency'] >= self.spec_limits['min_frequency'] else 'FAIL'
+                ])
+            
+            tempco = grade.get('temperature_coefficient_mhz_per_c')
+            if tempco is not None:
+                writer.writerow([
+                    'Fmax temperature coefficient @ 1.8V',
+                    f"{tempco:.4f}",
+                    'MHz/°C',
+                    '',
+                    'INFO'
+                ])
+            
             # Power consumption at 16MHz
             power_data = self.results.get('power_characterization', {})
             if 16 in power_data and 'active' in power_data[16]:
@@ -354,85 +675,8 @@ class AxiomaCoreCharacterizer:
                 ])
     
     def generate_plots(self, filename):
-        """Generate characterization plots"""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 10))
-        
-        # Plot 1: Frequency vs Voltage
-        freq_data = self.results.get('frequency_characterization', {})
-        if freq_data:
-            voltages = []
-            max_freqs = []
-            
-            for voltage in sorted(freq_data.keys()):
-                if 25 in freq_data[voltage]:  # At 25°C
-                    voltages.append(voltage)
-                    max_freq = max([f for f, data in freq_data[voltage][25].items() 
-                                  if data['stable']], default=0)
-                    max_freqs.append(max_freq)
-            
-            ax1.plot(voltages, max_freqs, 'bo-')
-            ax1.set_xlabel('Voltage (V)')
-            ax1.set_ylabel('Max Frequency (MHz)')
-            ax1.set_title('Frequency vs Voltage @ 25°C')
-            ax1.grid(True)
-        
-        # Plot 2: Power vs Frequency
-        power_data = self.results.get('power_characterization', {})
-        if power_data:
-            freqs = []
-            powers = []
-            
-            for freq in sorted(power_data.keys()):
-                if 'active' in power_data[freq]:
-                    freqs.append(freq)
-                    powers.append(power_data[freq]['active']['power_mw'])
-            
-            ax2.plot(freqs, powers, 'ro-')
-            ax2.set_xlabel('Frequency (MHz)')
-            ax2.set_ylabel('Power (mW)')
-            ax2.set_title('Power Consumption vs Frequency')
-            ax2.grid(True)
-        
-        # Plot 3: Functional validation
-        func_data = self.results.get('functional_validation', {})
-        if func_data:
-            peripherals = []
-            statuses = []
-            
-            for peripheral, data in func_data.items():
-                if isinstance(data, dict) and 'status' in data:
-                    peripherals.append(peripheral)
-                    statuses.append(1 if data['status'] == 'PASS' else 0)
-            
-            colors = ['green' if s else 'red' for s in statuses]
-            ax3.bar(range(len(peripherals)), statuses, color=colors)
-            ax3.set_xticks(range(len(peripherals)))
-            ax3.set_xticklabels(peripherals, rotation=45)
-            ax3.set_ylabel('Pass (1) / Fail (0)')
-            ax3.set_title('Functional Validation Results')
-        
-        # Plot 4: Temperature coefficient
-        if freq_data:
-            temps = []
-            freq_25mhz = []
-            
-            voltage = 1.8  # Nominal voltage
-            if voltage in freq_data:
-                for temp in sorted(freq_data[voltage].keys()):
-                    temps.append(temp)
-                    # Check if 25MHz is stable at this temperature
-                    stable_25 = freq_data[voltage][temp].get(25, {}).get('stable', False)
-                    freq_25mhz.append(25 if stable_25 else 0)
-                
-                ax4.plot(temps, freq_25mhz, 'go-')
-                ax4.set_xlabel('Temperature (°C)')
-                ax4.set_ylabel('25MHz Stable (MHz)')
-                ax4.set_title('25MHz Stability vs Temperature')
-                ax4.grid(True)
-        
-        plt.tight_layout()
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
-        plt.close()
+        """Queue the characterization plots; returns a future of the file"""
+        return self.plotter.submit(plot_panels(self.results, self.data), filename)
     
     def generate_text_report(self, filename):
         """Generate human-readable text report"""
@@ -447,7 +691,15 @@ class AxiomaCoreCharacterizer:
             # Speed grade
             grade_data = self.results.get('speed_grade', {})
             f.write(f"SPEED GRADE: {grade_data.get('grade', 'UNKNOWN')}\n")
-            f.write(f"Maximum Frequency: {grade_data.get('max_frequency', 'N/A')} MHz\n\n")
+            f.write(f"Maximum Frequency: {grade_data.get('max_frequency', 'N/A')} MHz\n")
+            worst = grade_data.get('worst_case')
+            if worst:
+                f.write(f"Worst-case Fmax: {worst['max_frequency']} MHz "
+                        f"@ {worst['voltage']}V, {worst['temperature']:g}°C\n")
+            tempco = grade_data.get('temperature_coefficient_mhz_per_c')
+            if tempco is not None:
+                f.write(f"Fmax Temperature Coefficient: {tempco:.4f} MHz/°C\n")
+            f.write("\n")
             
             # Functional validation
             f.write("FUNCTIONAL VALIDATION:\n")
@@ -462,6 +714,12 @@ class AxiomaCoreCharacterizer:
                 f.write(f"  Tests Passed: {inst_data['passed_tests']}/{inst_data['total_tests']}\n")
                 f.write(f"  Pass Rate: {inst_data['pass_rate']:.1f}%\n")
             
+            # Shmoo
+            if 'shmoo' in self.results:
+                f.write("\nSHMOO (Fmax, * = stable):\n")
+                for line in ShmooGrid.from_dict(self.results['shmoo']).format():
+                    f.write(f"{line}\n")
+            
             # Power consumption
             f.write("\nPOWER CONSUMPTION:\n")
             power_data = self.results.get('power_characterization', {})
@@ -473,8 +731,23 @@ class AxiomaCoreCharacterizer:
             f.write("\n" + "=" * 50 + "\n")
             f.write("End of Report\n")
     
-    def run_full_characterization(self):
-        """Run complete characterization sequence"""
+    def save_to_database(self):
+        """Insert the characterization results into the results database"""
+        with ResultsDatabase(self.results_db) as db:
+            db.insert_characterization(
+                self.chip_id,
+                self.results,
+                datetime.now(timezone.utc).isoformat(),
+                lot=self.lot_id
+            )
+        print(f"✓ Base de datos: {self.results_db}")
+    
+    def run_full_characterization(self, output_dir="reports", resume=False):
+        """Run complete characterization sequence
+        
+        Every measurement is journaled in output_dir; with resume the
+        journal of the chip is reloaded and only missing points measured.
+        """
         print("🚀 INICIANDO CARACTERIZACIÓN COMPLETA DE AxiomaCore-328")
         print("=" * 60)
         
@@ -485,15 +758,23 @@ class AxiomaCoreCharacterizer:
             # Get chip identification
             self.chip_id = self.send_command("GET:CHIPID")
             print(f"Chip ID: {self.chip_id}")
+            self.resume = resume
+            self.open_journal(output_dir)
             
-            # Run characterization steps
+            # Run characterization steps (finished steps come from the journal)
             self.characterize_frequency_response()
-            self.characterize_power_consumption() 
-            self.functional_validation()
+            if 'power_characterization' not in self.results:
+                self.characterize_power_consumption() 
+            if 'functional_validation' not in self.results:
+                self.functional_validation()
             self.determine_speed_grade()
             
             # Generate reports
-            reports = self.generate_report()
+            reports = self.generate_report(output_dir)
+            
+            if self.results_db:
+                self.save_to_database()
+            self.plotter.close()
             
             print("\n🎉 ¡CARACTERIZACIÓN COMPLETADA!")
             print("Archivos generados:")
@@ -501,14 +782,173 @@ class AxiomaCoreCharacterizer:
                 print(f"  {report_type}: {filename}")
             
             return True
-            
+        
         except Exception as e:
             print(f"✗ Error durante caracterización: {e}")
+            if self.journal:
+                print(f"  Puntos guardados en {self.journal.path} (continuar con --resume)")
             return False
-            
+        
         finally:
+            self.plotter.close()
+            self.close_journal()
             self.disconnect()
 
+class MultiDUTCharacterizer:
+    """Characterizes several DUTs that share one temperature chamber
+    
+    Every voltage/temperature condition is applied to all DUTs and soaked
+    once; the DUTs are then measured in parallel (one thread per DUT).
+    Each DUT keeps its own AxiomaCoreCharacterizer, results and reports.
+    A DUT that fails mid-run is dropped so the others keep the chamber.
+    """
+    
+    def __init__(self, ports, baudrate=115200, timeout=10, pipeline_depth=16,
+                 ready_deadline=5.0, binary=False):
+        """Create one characterizer per DUT port"""
+        self.characterizers = [
+            AxiomaCoreCharacterizer(port, baudrate, timeout, pipeline_depth,
+                                    ready_deadline, binary)
+            for port in ports
+        ]
+        self.active = []  # Connected DUTs still being characterized
+        self.lot_id = None
+        self.results_db = None
+        
+        # One plot renderer: a DUT's plots render while the next one reports
+        self.plotter = PlotRenderer()
+        for characterizer in self.characterizers:
+            characterizer.plotter = self.plotter
+        
+        # Sweep parameters are shared: the chamber sets the conditions
+        self.reference = self.characterizers[0]
+    
+    def each(self, method, *args, duts=None):
+        """Call method on every active DUT (or on duts) in parallel
+        
+        Returns (characterizer, result) pairs; a DUT whose call raises is
+        reported and removed from the active DUTs.
+        """
+        duts = self.active if duts is None else duts
+        if not duts:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=len(duts)) as executor:
+            futures = [
+                (characterizer, executor.submit(getattr(characterizer, method), *args))
+                for characterizer in duts
+            ]
+        
+        results = []
+        for characterizer, future in futures:
+            try:
+                results.append((characterizer, future.result()))
+            except Exception as e:
+                print(f"✗ {characterizer.port} ({characterizer.chip_id}): {e} - DUT excluido")
+                characterizer.results['error'] = str(e)
+                self.active.remove(characterizer)
+        return results
+    
+    def characterize_frequency_response(self):
+        """Frequency sweep of every DUT, one soak per condition for all"""
+        print(f"\n=== CARACTERIZACIÓN DE FRECUENCIA ({len(self.active)} DUTs) ===")
+        
+        plan = self.reference.plan_sweep()
+        print(plan.format_estimate())
+        
+        for characterizer in self.active:
+            characterizer.begin_frequency_sweep()
+        
+        chamber = None
+        for temp, voltage in plan.conditions:
+            if all((voltage, temp) in c.completed_corners for c in self.active):
+                self.each("measure_corner", voltage, temp)  # Replayed from the journals
+                continue
+            
+            print(f"Testing @ {voltage}V, {temp}°C...")
+            
+            # One soak for all DUTs: the chamber waits for the slowest
+            if temp != chamber:
+                self.each("set_conditions", voltage, temp)
+                self.each("settle_conditions", voltage, temp,
+                          self.reference.stabilization_time, True)
+                chamber = temp
+            else:
+                self.each("set_conditions", voltage)
+                self.each("settle_conditions", voltage, temp, self.reference.voltage_settle_time)
+            
+            self.each("measure_corner", voltage, temp)
+    
+    def characterize_power_consumption(self):
+        """Power modes of every DUT at 25°C, 1.8V after a single soak"""
+        pending = [c for c in self.active if 'power_characterization' not in c.results]
+        if not pending:
+            return
+        print(f"\n=== CARACTERIZACIÓN DE POTENCIA ({len(pending)} DUTs) ===")
+        
+        self.each("set_conditions", 1.8, 25, duts=pending)
+        self.each("settle_conditions", 1.8, 25, self.reference.stabilization_time, True,
+                  duts=pending)
+        
+        for characterizer, power_results in self.each("measure_power_modes", duts=pending):
+            characterizer.record_result('power_characterization', power_results)
+    
+    def run_full_characterization(self, output_dir="reports", resume=False):
+        """Characterize all DUTs; True when every DUT completed"""
+        print(f"🚀 INICIANDO CARACTERIZACIÓN DE {len(self.characterizers)} DUTs "
+              f"(cámara compartida)")
+        print("=" * 60)
+        
+        with ThreadPoolExecutor(max_workers=len(self.characterizers)) as executor:
+            connected = list(executor.map(lambda c: c.connect(), self.characterizers))
+        self.active = [c for c, ok in zip(self.characterizers, connected) if ok]
+        if not self.active:
+            return False
+        
+        try:
+            for characterizer, chip_id in self.each("send_command", "GET:CHIPID"):
+                characterizer.chip_id = chip_id
+                characterizer.log_prefix = f"[{chip_id}] "
+                characterizer.resume = resume
+                print(f"Chip ID: {chip_id} ({characterizer.port})")
+                characterizer.open_journal(output_dir)
+            
+            # The chamber-bound sweeps share each soak between the DUTs
+            self.characterize_frequency_response()
+            self.characterize_power_consumption()
+            
+            print("\n=== VALIDACIÓN FUNCIONAL ===")
+            self.each("functional_validation", False,
+                      duts=[c for c in self.active if 'functional_validation' not in c.results])
+            print("\n=== DETERMINACIÓN DE GRADO ===")
+            self.each("determine_speed_grade", False)
+            
+            reports = []
+            for characterizer in self.active:
+                characterizer.lot_id = self.lot_id
+                reports.append((characterizer, characterizer.generate_report(output_dir)))
+                if self.results_db:
+                    characterizer.results_db = self.results_db
+                    characterizer.save_to_database()
+            self.plotter.close()
+            
+            print("\n🎉 ¡CARACTERIZACIÓN COMPLETADA!")
+            for characterizer, chip_reports in reports:
+                grade = characterizer.results.get('speed_grade', {}).get('grade', 'UNKNOWN')
+                print(f"  {characterizer.chip_id}: {grade} - {chip_reports['json']}")
+            
+            return len(self.active) == len(self.characterizers)
+        
+        except Exception as e:
+            print(f"✗ Error durante caracterización: {e}")
+            return False
+        
+        finally:
+            self.plotter.close()
+            for characterizer in self.characterizers:
+                characterizer.close_journal()
+                characterizer.disconnect()
+
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(
@@ -517,7 +957,9 @@ def main():
     parser.add_argument(
         '--port', 
         required=True, 
-        help='Serial port (e.g., /dev/ttyUSB0, COM3)'
+        nargs='+', 
+        help='Serial port (e.g., /dev/ttyUSB0, COM3); several ports '
+             'characterize DUTs sharing one chamber in parallel'
     )
     parser.add_argument(
         '--chip', 
@@ -535,15 +977,111 @@ def main():
         default=115200, 
         help='Serial baud rate'
     )
+    parser.add_argument(
+        '--db', 
+        help='SQLite results database shared with production test'
+    )
+    parser.add_argument(
+        '--lot', 
+        help='Lot identifier stored with the results'
+    )
+    parser.add_argument(
+        '--pipeline-depth', 
+        type=int, 
+        default=16, 
+        help='Commands per pipelined write (1 disables pipelining)'
+    )
+    parser.add_argument(
+        '--binary', 
+        action='store_true', 
+        help='Use the binary framed protocol if the firmware supports it'
+    )
+    parser.add_argument(
+        '--trace', 
+        help='Record the serial session to this binary trace file'
+    )
+    parser.add_argument(
+        '--exhaustive', 
+        action='store_true', 
+        help='Test every frequency point instead of searching Fmax (shmoo)'
+    )
+    parser.add_argument(
+        '--resolution', 
+        type=float, 
+        default=0.5, 
+        help='Shmoo Fmax resolution in MHz'
+    )
+    parser.add_argument(
+        '--resume', 
+        action='store_true', 
+        help='Continue an interrupted run from the journal in the output directory'
+    )
+    parser.add_argument(
+        '--plan', 
+        action='store_true', 
+        help='Print the sweep order and expected sweep time, then exit'
+    )
+    parser.add_argument(
+        '--plots', 
+        choices=PLOT_FORMATS, 
+        default='svg', 
+        help='Plot format: svg (no plotting library), png (matplotlib) or none'
+    )
+    parser.add_argument(
+        '--plot-dpi', 
+        type=int, 
+        default=100, 
+        help='PNG plot resolution'
+    )
     
     args = parser.parse_args()
     
-    # Create characterizer
-    characterizer = AxiomaCoreCharacterizer(args.port, args.baudrate)
-    characterizer.chip_id = args.chip
+    if len(args.port) > 1:
+        # Several DUTs in one chamber; one trace file per DUT
+        characterizer = MultiDUTCharacterizer(
+            args.port, args.baudrate, pipeline_depth=args.pipeline_depth,
+            binary=args.binary
+        )
+        characterizer.lot_id = args.lot
+        characterizer.results_db = args.db
+        if args.trace:
+            root, ext = os.path.splitext(args.trace)
+            for index, dut in enumerate(characterizer.characterizers):
+                dut.trace_file = f"{root}_DUT{index}{ext}"
+    else:
+        # Create characterizer
+        characterizer = AxiomaCoreCharacterizer(
+            args.port[0], args.baudrate, pipeline_depth=args.pipeline_depth,
+            binary=args.binary
+        )
+        characterizer.chip_id = args.chip
+        characterizer.lot_id = args.lot
+        characterizer.results_db = args.db
+        characterizer.trace_file = args.trace
+    
+    plotter = PlotRenderer(args.plots, args.plot_dpi,
+                           workers=min(len(args.port), os.cpu_count() or 1))
+    characterizer.plotter = plotter
+    for dut in getattr(characterizer, 'characterizers', [characterizer]):
+        dut.plotter = plotter
+        dut.sweep_mode = "exhaustive" if args.exhaustive else "shmoo"
+        dut.shmoo_resolution = args.resolution
+    
+    if args.plan:
+        reference = getattr(characterizer, 'reference', characterizer)
+        plan = reference.plan_sweep()
+        print(plan.format_estimate())
+        if reference.sweep_mode == "shmoo":
+            points = (f"Fmax {min(plan.frequencies)}-{max(plan.frequencies)} MHz "
+                      f"(resolución {reference.shmoo_resolution} MHz)")
+        else:
+            points = f"{', '.join(str(f) for f in plan.frequencies)} MHz"
+        for temp, voltage in plan.conditions:
+            print(f"  {temp}°C {voltage}V: {points}")
+        sys.exit(0)
     
     # Run characterization
-    success = characterizer.run_full_characterization()
+    success = characterizer.run_full_characterization(args.output, resume=args.resume)
     
     if success:
         print("\n✅ Caracterización exitosa")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Characterization Journal
+=======================================
+
+Append-only JSON-lines journal of a characterization run. Every measured
+(V, T, f) point, condition settle and finished step is written and synced
+as soon as it is known, so a run interrupted hours into a temperature
+sweep can be resumed without measuring anything twice:
+
+    {"type": "session", "chip_id": "A328-0042", "started": "..."}
+    {"type": "condition", "voltage": 1.8, "temperature": 85, "settle": {...}}
+    {"type": "point", "voltage": 1.8, "temperature": 85, "frequency": 24.5, "point": {...}}
+    {"type": "corner", "voltage": 1.8, "temperature": 85}
+    {"type": "result", "key": "power_characterization", "value": {...}}
+
+A line cut short by a crash is dropped (and truncated away) on resume.
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import json
+import os
+
+def load_journal(path):
+    """Records of a journal plus the byte length of its complete lines"""
+    records = []
+    valid_bytes = 0
+    
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            valid_bytes += len(line)
+    
+    return records, valid_bytes
+
+class SweepJournal:
+    """Append-only journal file; resume=True keeps and reloads an existing one"""
+    
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.records = []
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        if resume and os.path.exists(path):
+            self.records, valid_bytes = load_journal(path)
+            os.truncate(path, valid_bytes)
+            self.file = open(path, 'a')
+        else:
+            self.file = open(path, 'w')
+    
+    def append(self, record):
+        """Write one record and sync it to disk"""
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+    
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
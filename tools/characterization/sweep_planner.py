@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Characterization Sweep Planner
+=============================================
+
+Orders the voltage x temperature x frequency grid so that the expensive
+transitions happen as rarely as possible:
+
+- temperature outermost and monotonic (each chamber soak is paid once,
+  starting from the end of the range nearest the current temperature)
+- voltage next (a supply step only needs a short settle)
+- frequency innermost
+
+and estimates the duration of a sweep from the transition costs, so the
+chamber time can be known before the run starts. With settle detection
+the costs are maximum waits and the estimate is an upper bound:
+
+    planner = SweepPlanner(temperature_soak=5.0, voltage_settle=1.0)
+    plan = planner.plan([-40, 25, 85], [1.6, 1.8, 2.0], [8, 16, 25])
+    print(plan.format_estimate())
+    for temperature, voltage in plan.conditions:
+        ...
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+class SweepPlan:
+    """Ordered (temperature, voltage) conditions plus the time estimate"""
+    
+    def __init__(self, conditions, frequencies, estimate, baseline=None):
+        self.conditions = conditions
+        self.frequencies = frequencies
+        self.estimate = estimate
+        self.baseline = baseline  # Estimate of the voltage-outer order
+    
+    def points(self):
+        """Every (temperature, voltage, frequency) point in sweep order"""
+        return [
+            (temperature, voltage, frequency)
+            for temperature, voltage in self.conditions
+            for frequency in self.frequencies
+        ]
+    
+    def format_estimate(self):
+        """One-line summary of the expected sweep time"""
+        estimate = self.estimate
+        text = (f"Plan: {estimate['points']} puntos, "
+                f"{estimate['temperature_changes']} cambios de temperatura, "
+                f"{estimate['voltage_changes']} de tensión - "
+                f"tiempo máximo estimado {format_duration(estimate['seconds'])}")
+        if self.baseline and self.baseline['seconds'] > estimate['seconds']:
+            text += f" (barrido completo tensión-temperatura: {format_duration(self.baseline['seconds'])})"
+        return text
+
+class SweepPlanner:
+    """Plans and estimates characterization sweeps
+    
+    temperature_soak: seconds waited after a chamber set point change
+    voltage_settle:   seconds waited after a supply change alone
+    frequency_settle: seconds waited after each frequency change
+    point_time:       seconds to measure one point (commands, readback)
+    ramp_rate:        chamber ramp in degrees C per second (None: ramps
+                      are not included in the estimate)
+    """
+    
+    def __init__(self, temperature_soak=5.0, voltage_settle=1.0, frequency_settle=1.0,
+                 point_time=0.0, ramp_rate=None):
+        self.temperature_soak = temperature_soak
+        self.voltage_settle = voltage_settle
+        self.frequency_settle = frequency_settle
+        self.point_time = point_time
+        self.ramp_rate = ramp_rate
+    
+    @staticmethod
+    def order_conditions(temperatures, voltages, start_temperature=25.0):
+        """(temperature, voltage) pairs with temperature outermost and monotonic"""
+        temperatures = sorted(temperatures)
+        if abs(temperatures[-1] - start_temperature) < abs(temperatures[0] - start_temperature):
+            temperatures.reverse()
+        
+        return [
+            (temperature, voltage)
+            for temperature in temperatures
+            for voltage in sorted(voltages)
+        ]
+    
+    def estimate(self, conditions, frequencies, start_temperature=25.0,
+                 points_per_condition=None):
+        """Expected duration of sweeping frequencies at each condition in order
+        
+        points_per_condition overrides len(frequencies) for searches that
+        test a varying subset of frequencies (shmoo).
+        """
+        if points_per_condition is None:
+            points_per_condition = len(frequencies)
+        
+        temperature_changes = 0
+        voltage_changes = 0
+        chamber_travel = 0.0
+        seconds = 0.0
+        temperature, voltage = start_temperature, None
+        
+        for index, (next_temperature, next_voltage) in enumerate(conditions):
+            if index == 0 or next_temperature != temperature:
+                temperature_changes += 1
+                chamber_travel += abs(next_temperature - temperature)
+                seconds += self.temperature_soak
+            elif next_voltage != voltage:
+                voltage_changes += 1
+                seconds += self.voltage_settle
+            temperature, voltage = next_temperature, next_voltage
+            
+            seconds += points_per_condition * (self.frequency_settle + self.point_time)
+        
+        if self.ramp_rate:
+            seconds += chamber_travel / self.ramp_rate
+        
+        return {
+            "points": int(round(len(conditions) * points_per_condition)),
+            "temperature_changes": temperature_changes,
+            "voltage_changes": voltage_changes,
+            "chamber_travel_c": chamber_travel,
+            "seconds": seconds
+        }
+    
+    def plan(self, temperatures, voltages, frequencies, start_temperature=25.0,
+             points_per_condition=None):
+        """Plan a sweep and estimate it
+        
+        The baseline estimate is the exhaustive voltage-outer sweep, for
+        comparison.
+        """
+        conditions = self.order_conditions(temperatures, voltages, start_temperature)
+        frequencies = sorted(frequencies)
+        voltage_outer = [(t, v) for v in voltages for t in temperatures]
+        
+        return SweepPlan(
+            conditions,
+            frequencies,
+            self.estimate(conditions, frequencies, start_temperature, points_per_condition),
+            baseline=self.estimate(voltage_outer, frequencies, start_temperature)
+        )
+
+def format_duration(seconds):
+    """Seconds as h:mm:ss"""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
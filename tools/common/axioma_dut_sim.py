@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Simulated DUT
+============================
+
+Protocol-accurate stand-in for an AxiomaCore-328 running the test
+firmware, so the production and characterization tools can be run,
+benchmarked and regression-tested without hardware.
+
+The simulator answers the full command set used by the tools (*IDN?,
+RESET, GPIO:*, ADC:*, TEST:*, MEAS:*, SET:*, FREQ:STABLE?, GET:CHIPID)
+with a simple electrical model: supply current scales with frequency and
+voltage, and the maximum stable frequency drops with temperature and
+rises with voltage. MEAS:TEMPERATURE? reads back the die temperature,
+which follows SET:TEMPERATURE with a first-order thermal lag (thermal_tau,
+instant by default). Response latency, jitter, boot time and fault
+injection are configurable.
+
+ADC:BULK <channel> <count> returns count samples of one channel in a
+single response; channel RAMP is the internal linearity test ramp, which
+sweeps the full input range once over the acquisition.
+
+The binary framed mode of the transport (PROTO:BINARY) and the
+multi-value commands ADC:READ:ALL?, GPIO:IN:ALL? and MEAS:ALL? are
+supported too; --line-only models firmware without them.
+
+It is served on a pseudo-terminal, so the tools connect to it exactly as
+they would to a USB-serial adapter, or on a TCP port that the tools open
+through a pyserial socket:// URL (also works where ptys do not exist):
+
+    python3 axioma_dut_sim.py --latency 0.002 --jitter 0.001
+    Simulated AxiomaCore-328 on /dev/pts/7
+    python3 production_test.py --config sim_config.json   # serial_port /dev/pts/7
+
+    python3 axioma_dut_sim.py --tcp 5328
+    Simulated AxiomaCore-328 on socket://localhost:5328
+
+Or from Python:
+
+    with SimulatedDUTServer(SimulatedDUT(latency=0.001)) as server:
+        tester.config["serial_port"] = server.port
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import argparse
+import math
+import os
+import random
+import select
+import socket
+import threading
+import struct
+import time
+
+from axioma_transport import (
+    FRAME_F32, FRAME_HEADER, FRAME_SYNC, FRAME_TEXT, FRAME_U8, FRAME_U16,
+    FRAME_CRC, decode_frame, encode_frame
+)
+
+try:
+    import termios
+    import tty
+except ImportError:
+    # Windows: the pty server is unavailable, SimulatedDUT.handle still works
+    termios = None
+    tty = None
+
+GPIO_PORTS = ('B', 'C', 'D')
+PWM_CHANNELS = (3, 5, 6, 9, 10, 11)
+MAX_BULK_SAMPLES = 32767  # One uint16 frame payload
+
+# Binary mode response types; everything else is sent as a text frame
+RESPONSE_FRAME_TYPES = {
+    "ADC:READ": FRAME_U16,
+    "ADC:READ:ALL?": FRAME_U16,
+    "ADC:BULK": FRAME_U16,
+    "ADC:VREF?": FRAME_F32,
+    "GPIO:B:IN?": FRAME_U8,
+    "GPIO:C:IN?": FRAME_U8,
+    "GPIO:D:IN?": FRAME_U8,
+    "GPIO:IN:ALL?": FRAME_U8,
+    "MEAS:CURRENT?": FRAME_F32,
+    "MEAS:VOLTAGE?": FRAME_F32,
+    "MEAS:FREQUENCY?": FRAME_F32,
+    "MEAS:TEMPERATURE?": FRAME_F32,
+    "MEAS:ALL?": FRAME_F32
+}
+VALUE_FORMATS = {FRAME_U8: "B", FRAME_U16: "H", FRAME_F32: "f"}
+
+class SimulatedDUT:
+    """Command-level model of an AxiomaCore-328 with test firmware"""
+    
+    def __init__(self, chip_id="A328-SIM-0001", latency=0.0, jitter=0.0,
+                 boot_time=0.05, fmax_nominal=25.0, failures=None,
+                 fault_rate=0.0, drop_rate=0.0, seed=None, binary_protocol=True,
+                 thermal_tau=0.0):
+        """Create a simulated device
+        
+        latency/jitter: seconds added to every response (uniform jitter)
+        boot_time:      seconds the device ignores commands after RESET
+        fmax_nominal:   maximum stable frequency (MHz) at 1.8 V, 25 °C
+        failures:       commands (e.g. "TEST:SRAM") that always answer FAIL
+        fault_rate:     probability that a TEST:* command answers FAIL
+        drop_rate:      probability that a command gets no response
+        binary_protocol: accept PROTO:BINARY and the multi-value commands
+        thermal_tau:    time constant (s) of the die following SET:TEMPERATURE
+        """
+        self.chip_id = chip_id
+        self.latency = latency
+        self.jitter = jitter
+        self.boot_time = boot_time
+        self.fmax_nominal = fmax_nominal
+        self.failures = set(failures or [])
+        self.fault_rate = fault_rate
+        self.drop_rate = drop_rate
+        self.binary_protocol = binary_protocol
+        self.thermal_tau = thermal_tau
+        self.random = random.Random(seed)
+        
+        self.crystal_offset = abs(self.random.gauss(0.0, 20e-6))
+        self.commands_handled = 0
+        self.reset_state()
+        self.ready_at = 0.0
+    
+    def reset_state(self):
+        """Power-on defaults"""
+        self.gpio_dir = {port: 0x00 for port in GPIO_PORTS}
+        self.gpio_out = {port: 0x00 for port in GPIO_PORTS}
+        self.voltage = 1.8
+        self.temperature = 25.0
+        self.temperature_from = 25.0
+        self.temperature_set_at = 0.0
+        self.frequency = 16.0
+        self.power_mode = "active"
+        self.binary_mode = False
+    
+    def response_delay(self):
+        """Latency for one response, including jitter"""
+        return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+    
+    def die_temperature(self):
+        """Die temperature, lagging the set point by thermal_tau"""
+        if self.thermal_tau <= 0:
+            return self.temperature
+        elapsed = time.monotonic() - self.temperature_set_at
+        lag = math.exp(-elapsed / self.thermal_tau)
+        return self.temperature + (self.temperature_from - self.temperature) * lag
+    
+    def fmax(self):
+        """Maximum stable frequency at the current voltage and temperature"""
+        voltage_factor = 1.0 + (self.voltage - 1.8) * 1.2
+        temperature_factor = 1.0 - (self.die_temperature() - 25.0) * 0.0015
+        return self.fmax_nominal * voltage_factor * temperature_factor
+    
+    def supply_current(self):
+        """Supply current (mA) for the current operating point"""
+        active = 0.18 * self.frequency * (self.voltage / 1.8) ** 2
+        leakage = 0.02 * (1.0 + max(0.0, self.die_temperature() - 25.0) / 30.0)
+        scale = {"active": 1.0, "idle": 0.35, "sleep": 0.01}.get(self.power_mode, 1.0)
+        noise = self.random.gauss(0.0, 0.01)
+        return max(0.0, active * scale + leakage + noise)
+    
+    def handle(self, command):
+        """Return the response line for one command, or None for no response"""
+        try:
+            return self.dispatch(command)
+        except ValueError:
+            return "ERROR:INVALID_VALUE"
+    
+    def dispatch(self, command):
+        """Model the firmware command parser"""
+        self.commands_handled += 1
+        
+        if time.monotonic() < self.ready_at:
+            return None  # Still booting
+        if self.drop_rate and self.random.random() < self.drop_rate:
+            return None
+        
+        command = command.strip()
+        name, _, argument = command.partition(' ')
+        argument = argument.strip()
+        
+        if command in self.failures:
+            return "FAIL"
+        
+        if name == "*IDN?":
+            return f"AxiomaCore-328,{self.chip_id},SIM,1.0"
+        if name == "RESET":
+            self.reset_state()
+            self.ready_at = time.monotonic() + self.boot_time
+            return None
+        if name == "GET:CHIPID":
+            return self.chip_id
+        if name in ("PROTO:BINARY", "PROTO:LINE") and self.binary_protocol:
+            self.binary_mode = name == "PROTO:BINARY"
+            return "OK"
+        if name.endswith(":ALL?") and not self.binary_protocol:
+            return "ERROR:UNKNOWN_COMMAND"
+        if name == "GPIO:IN:ALL?":
+            return ",".join(self.handle_gpio(f"GPIO:{port}:IN?", "") for port in GPIO_PORTS)
+        
+        if name.startswith("GPIO:"):
+            return self.handle_gpio(name, argument)
+        if name.startswith("ADC:"):
+            return self.handle_adc(name, argument)
+        if name.startswith("TEST:"):
+            return self.handle_test(name, argument)
+        if name.startswith("MEAS:"):
+            return self.handle_measure(name)
+        if name.startswith("SET:"):
+            return self.handle_set(name, argument)
+        
+        if name == "FREQ:STABLE?":
+            return "TRUE" if self.frequency <= self.fmax() else "FALSE"
+        
+        return "ERROR:UNKNOWN_COMMAND"
+    
+    def handle_gpio(self, name, argument):
+        parts = name.split(':')
+        if len(parts) != 3 or parts[1] not in GPIO_PORTS:
+            return "ERROR:INVALID_PORT"
+        port, register = parts[1], parts[2]
+        
+        if register == "DIR":
+            self.gpio_dir[port] = 0xFF if argument.upper() == "OUTPUT" else 0x00
+            return "OK"
+        if register == "OUT":
+            self.gpio_out[port] = int(argument, 0) & 0xFF
+            return "OK"
+        if register == "IN?":
+            # Outputs read back through the input buffer (loopback)
+            return f"0x{self.gpio_out[port] & self.gpio_dir[port]:02X}"
+        return "ERROR:INVALID_REGISTER"
+    
+    def adc_code(self, level):
+        """Convert an input level (0..1 of AVCC) with 0.6 LSB of noise"""
+        code = 1024 * level - 0.5 + self.random.gauss(0.0, 0.6)
+        return min(1023, max(0, int(round(code))))
+    
+    def handle_adc(self, name, argument):
+        if name == "ADC:BULK":
+            channel, count = argument.split()
+            count = int(count)
+            if not 0 < count <= MAX_BULK_SAMPLES:
+                return "ERROR:INVALID_VALUE"
+            if channel.upper() == "RAMP":
+                levels = (index / count for index in range(count))
+            elif 0 <= int(channel) <= 5:
+                levels = [(int(channel) + 1) / 7] * count
+            else:
+                return "ERROR:INVALID_CHANNEL"
+            return ",".join(str(self.adc_code(level)) for level in levels)
+        if name == "ADC:READ:ALL?":
+            return ",".join(self.handle_adc("ADC:READ", str(channel)) for channel in range(6))
+        if name == "ADC:READ":
+            channel = int(argument)
+            if not 0 <= channel <= 5:
+                return "ERROR:INVALID_CHANNEL"
+            # Channel n sits on a divider at (n + 1) / 7 of AVCC
+            code = 1023 * (channel + 1) / 7 + self.random.gauss(0.0, 0.6)
+            return str(min(1023, max(0, int(round(code)))))
+        if name == "ADC:VREF?":
+            return f"{1.1 + self.random.gauss(0.0, 0.002):.4f}"
+        return "ERROR:UNKNOWN_COMMAND"
+    
+    def handle_test(self, name, argument):
+        if name == "TEST:INSTRUCTIONS":
+            return "131"
+        if name == "TEST:INSTRUCTIONS:PASSED":
+            return "131"
+        # A bare TEST:PWM tests all channels; a channel number must exist
+        if name == "TEST:PWM" and argument and int(argument) not in PWM_CHANNELS:
+            return "ERROR:INVALID_CHANNEL"
+        if self.fault_rate and self.random.random() < self.fault_rate:
+            return "FAIL"
+        return "PASS"
+    
+    def handle_measure(self, name):
+        if name == "MEAS:ALL?":
+            return ",".join(
+                self.handle_measure(f"MEAS:{quantity}?")
+                for quantity in ("CURRENT", "VOLTAGE", "FREQUENCY")
+            )
+        if name == "MEAS:CURRENT?":
+            return f"{self.supply_current():.3f}"
+        if name == "MEAS:VOLTAGE?":
+            return f"{self.voltage + self.random.gauss(0.0, 0.002):.3f}"
+        if name == "MEAS:FREQUENCY?":
+            # Crystal-controlled: only the ppm-level offset of the part
+            return f"{self.frequency * (1.0 + self.crystal_offset):.4f}"
+        if name == "MEAS:TEMPERATURE?":
+            return f"{self.die_temperature() + self.random.gauss(0.0, 0.05):.2f}"
+        return "ERROR:UNKNOWN_COMMAND"
+    
+    def handle_set(self, name, argument):
+        try:
+            if name == "SET:VOLTAGE":
+                self.voltage = float(argument)
+            elif name == "SET:TEMPERATURE":
+                temperature = float(argument)
+                self.temperature_from = self.die_temperature()
+                self.temperature_set_at = time.monotonic()
+                self.temperature = temperature
+            elif name == "SET:FREQUENCY":
+                self.frequency = float(argument)
+            elif name == "SET:POWERMODE":
+                self.power_mode = argument.lower()
+            else:
+                return "ERROR:UNKNOWN_COMMAND"
+        except ValueError:
+            return "ERROR:INVALID_VALUE"
+        return "OK"
+    
+    def response_frame(self, command, response):
+        """Binary mode frame for a response line"""
+        name = command.strip().partition(' ')[0]
+        frame_type = RESPONSE_FRAME_TYPES.get(name, FRAME_TEXT)
+        
+        if frame_type != FRAME_TEXT and not response.startswith(("ERROR", "FAIL")):
+            values = [
+                float(item) if frame_type == FRAME_F32 else int(item, 0)
+                for item in response.split(',')
+            ]
+            payload = struct.pack(f"<{len(values)}{VALUE_FORMATS[frame_type]}", *values)
+        else:
+            frame_type, payload = FRAME_TEXT, response.encode()
+        return encode_frame(frame_type, payload)
+
+class SimulatedDUTServer:
+    """Serves a SimulatedDUT on a pseudo-terminal or TCP port
+    
+    port is the name the tools should open: a /dev/pts path, or a
+    socket://host:port URL in TCP mode (tcp_port=0 picks a free port).
+    """
+    
+    def __init__(self, dut=None, tcp_port=None):
+        if tcp_port is None and termios is None:
+            raise RuntimeError("Pseudo-terminals are not available on this platform")
+        
+        self.dut = dut or SimulatedDUT()
+        self.tcp_port = tcp_port
+        self.master_fd = None
+        self.slave_fd = None
+        self.listen_socket = None
+        self.port = None
+        self.thread = None
+        self.running = False
+    
+    def start(self):
+        """Create the pty (or listening socket) and start answering"""
+        if self.tcp_port is None:
+            self.master_fd, self.slave_fd = os.openpty()
+            tty.setraw(self.slave_fd)
+            self.port = os.ttyname(self.slave_fd)
+            target = self.serve_pty
+        else:
+            self.listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.listen_socket.bind(("localhost", self.tcp_port))
+            self.listen_socket.listen(1)
+            self.port = f"socket://localhost:{self.listen_socket.getsockname()[1]}"
+            target = self.serve_tcp
+        
+        self.running = True
+        self.thread = threading.Thread(target=target, daemon=True)
+        self.thread.start()
+        return self.port
+    
+    def stop(self):
+        """Stop serving and close the pty or socket"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+        for fd in (self.master_fd, self.slave_fd):
+            if fd is not None:
+                os.close(fd)
+        self.master_fd = self.slave_fd = None
+        if self.listen_socket:
+            self.listen_socket.close()
+            self.listen_socket = None
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+    
+    def serve_pty(self):
+        """Answer commands on the pty master"""
+        self.serve_stream(
+            self.master_fd,
+            lambda: os.read(self.master_fd, 4096),
+            lambda data: os.write(self.master_fd, data)
+        )
+    
+    def serve_tcp(self):
+        """Accept one client at a time and answer its commands"""
+        while self.running:
+            readable, _, _ = select.select([self.listen_socket], [], [], 0.05)
+            if not readable:
+                continue
+            client, _ = self.listen_socket.accept()
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with client:
+                self.serve_stream(client, lambda: client.recv(4096), client.sendall)
+    
+    def serve_stream(self, stream, read, write):
+        """Read command lines (or frames) and write back the responses"""
+        buffer = b""
+        
+        while self.running:
+            readable, _, _ = select.select([stream], [], [], 0.05)
+            if not readable:
+                continue
+            
+            try:
+                data = read()
+            except OSError:
+                break
+            if not data:
+                break  # Client disconnected
+            buffer += data
+            
+            while True:
+                binary = self.dut.binary_mode
+                if binary:
+                    command, buffer = self.next_frame(buffer)
+                elif b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    command = line.decode(errors='replace')
+                else:
+                    command = None
+                if command is None:
+                    break
+                
+                response = self.dut.handle(command) if command is not False else "ERROR:CRC"
+                if response is None:
+                    continue
+                
+                delay = self.dut.response_delay()
+                if delay:
+                    time.sleep(delay)
+                if binary:
+                    write(self.dut.response_frame(command, response))
+                else:
+                    write((response + "\n").encode())
+    
+    @staticmethod
+    def next_frame(buffer):
+        """(command, rest of buffer) for the first complete frame
+        
+        command is None if no complete frame is buffered yet and False if
+        the frame failed its CRC check.
+        """
+        # Resynchronize on the frame start byte
+        start = buffer.find(bytes([FRAME_SYNC]))
+        if start < 0:
+            return None, b""
+        buffer = buffer[start:]
+        
+        if len(buffer) < FRAME_HEADER.size:
+            return None, buffer
+        end = FRAME_HEADER.size + FRAME_HEADER.unpack_from(buffer)[2] + FRAME_CRC.size
+        if len(buffer) < end:
+            return None, buffer
+        
+        frame = decode_frame(buffer[:FRAME_HEADER.size], buffer[FRAME_HEADER.size:end])
+        command = frame[1].decode(errors='replace') if frame else False
+        return command, buffer[end:]
+
+def main():
+    """Run a simulated AxiomaCore-328 until interrupted"""
+    parser = argparse.ArgumentParser(
+        description='AxiomaCore-328 Simulated DUT'
+    )
+    parser.add_argument('--chip', default='A328-SIM-0001', help='Chip ID to report')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Uniform latency jitter in seconds')
+    parser.add_argument('--boot-time', type=float, default=0.05,
+                        help='Seconds without response after RESET')
+    parser.add_argument('--fmax', type=float, default=25.0,
+                        help='Max stable frequency (MHz) at 1.8V, 25°C')
+    parser.add_argument('--fail', action='append', default=[],
+                        help='Command that always answers FAIL (repeatable)')
+    parser.add_argument('--fault-rate', type=float, default=0.0,
+                        help='Probability that a TEST:* command fails')
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help='Probability that a command gets no response')
+    parser.add_argument('--seed', type=int, help='Random seed')
+    parser.add_argument('--line-only', action='store_true',
+                        help='Model firmware without the binary framed mode')
+    parser.add_argument('--thermal-tau', type=float, default=0.0,
+                        help='Thermal time constant (s) after SET:TEMPERATURE')
+    parser.add_argument('--tcp', type=int, metavar='PORT',
+                        help='Serve on a TCP port (socket:// URL) instead of a pty')
+    
+    args = parser.parse_args()
+    
+    dut = SimulatedDUT(
+        chip_id=args.chip,
+        latency=args.latency,
+        jitter=args.jitter,
+        boot_time=args.boot_time,
+        fmax_nominal=args.fmax,
+        failures=args.fail,
+        fault_rate=args.fault_rate,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+        binary_protocol=not args.line_only,
+        thermal_tau=args.thermal_tau
+    )
+    
+    with SimulatedDUTServer(dut, tcp_port=args.tcp) as server:
+        print(f"Simulated AxiomaCore-328 on {server.port}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(f"\nStopped after {dut.commands_handled} commands")
+
+if __name__ == "__main__":
+    main()
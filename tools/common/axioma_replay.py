@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Session Replay
+=============================
+
+Replays a recorded DUT session through the normal tool code paths, so a
+production or characterization run can be reproduced without hardware.
+
+Sessions are recorded with the binary trace of the serial transport
+(axioma_transport.Instrumentation), e.g.:
+
+    python3 production_test.py --config production_config.json --trace unit.axtrace
+
+and replayed by using a replay:// URL as the serial port:
+
+    "serial_port": "replay://unit.axtrace"            # full speed
+    "serial_port": "replay://unit.axtrace?pace=1"     # original timing
+    python3 silicon_characterization.py --port replay://char.axtrace
+
+Every write is checked against the recorded command bytes, so a replay
+fails loudly (ReplayError) as soon as the code under test diverges from
+the recorded session. Reads return the recorded responses and timeouts.
+
+To inspect a trace:
+
+    python3 axioma_replay.py unit.axtrace
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import argparse
+import time
+from urllib.parse import parse_qs
+
+import serial
+
+from axioma_transport import (
+    TRACE_RESET, TRACE_RX, TRACE_TIMEOUT, TRACE_TX, read_trace
+)
+
+REPLAY_SCHEME = "replay://"
+
+EVENT_NAMES = {
+    TRACE_TX: "TX",
+    TRACE_RX: "RX",
+    TRACE_TIMEOUT: "T/O",
+    TRACE_RESET: "RESET"
+}
+
+class ReplayError(serial.SerialException):
+    """The code under test diverged from the recorded session"""
+
+class ReplaySerial:
+    """Serial port stand-in that plays back a recorded trace
+    
+    pace: 0 answers immediately, 1.0 reproduces the recorded response
+    times (2.0 twice as slow, and so on).
+    strict: raise ReplayError when a write does not match the recording.
+    """
+    
+    def __init__(self, trace_file, timeout=None, pace=0.0, strict=True):
+        self.trace_file = trace_file
+        self.records = list(read_trace(trace_file))
+        self.position = 0
+        self.timeout = timeout
+        self.pace = pace
+        self.strict = strict
+        self.is_open = True
+        self.last_write = None  # (recorded timestamp, perf_counter at replay)
+        self.read_buffer = b""  # Rest of a recorded frame (binary mode)
+        self.stalled = False  # Last response timed out; reads return nothing
+    
+    @property
+    def remaining(self):
+        """Records not yet replayed"""
+        return len(self.records) - self.position
+    
+    @property
+    def in_waiting(self):
+        return 0
+    
+    def write(self, data):
+        record = self._take((TRACE_TX,))
+        if record is None:
+            if self.strict:
+                raise ReplayError(f"Replay exhausted, unexpected write {data!r}")
+            return len(data)
+        
+        timestamp, _, payload = record
+        if payload != data and self.strict:
+            raise ReplayError(
+                f"Replay diverged at record {self.position - 1}: "
+                f"expected {payload!r}, got {data!r}"
+            )
+        
+        self.last_write = (timestamp, time.perf_counter())
+        self.stalled = False
+        return len(data)
+    
+    def readline(self):
+        return self._next_response()
+    
+    def read(self, size=1):
+        """Binary mode reads one recorded frame in several pieces"""
+        if not self.read_buffer and not self.stalled:
+            self.read_buffer = self._next_response()
+        data, self.read_buffer = self.read_buffer[:size], self.read_buffer[size:]
+        return data
+    
+    def reset_input_buffer(self):
+        self.read_buffer = b""
+        self.stalled = False
+        if self.position < len(self.records) and self.records[self.position][1] == TRACE_RESET:
+            self.position += 1
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.is_open = False
+    
+    def _next_response(self):
+        record = self._take((TRACE_RX, TRACE_TIMEOUT))
+        if record is None:
+            # Nothing left: behave like a device that stopped answering
+            self.stalled = True
+            return b""
+        
+        timestamp, event, payload = record
+        self.stalled = event == TRACE_TIMEOUT
+        if self.pace and self.last_write:
+            written_at, replayed_at = self.last_write
+            delay = replayed_at + (timestamp - written_at) * self.pace - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return payload
+    
+    def _take(self, events):
+        """Next record, skipping input flushes; None when exhausted"""
+        while self.position < len(self.records):
+            record = self.records[self.position]
+            if record[1] == TRACE_RESET:
+                self.position += 1
+                continue
+            
+            if record[1] not in events and self.strict:
+                expected = "/".join(EVENT_NAMES[e] for e in events)
+                raise ReplayError(
+                    f"Replay diverged at record {self.position}: "
+                    f"expected {expected}, recorded {EVENT_NAMES[record[1]]} {record[2]!r}"
+                )
+            
+            self.position += 1
+            return record
+        return None
+
+def serial_for_url(url, baudrate=115200, timeout=None):
+    """serial.serial_for_url that also understands replay:// URLs
+    
+    replay://<trace file>[?pace=<factor>&strict=0]
+    """
+    if not url.startswith(REPLAY_SCHEME):
+        return serial.serial_for_url(url, baudrate, timeout=timeout)
+    
+    path, _, query = url[len(REPLAY_SCHEME):].partition('?')
+    options = {key: values[-1] for key, values in parse_qs(query).items()}
+    
+    try:
+        return ReplaySerial(
+            path,
+            timeout=timeout,
+            pace=float(options.get("pace", 0.0)),
+            strict=options.get("strict", "1") not in ("0", "false", "no")
+        )
+    except (OSError, ValueError) as e:
+        raise serial.SerialException(f"Cannot open replay {path}: {e}")
+
+def main():
+    """Print a recorded session"""
+    parser = argparse.ArgumentParser(
+        description='AxiomaCore-328 Session Replay - trace viewer'
+    )
+    parser.add_argument('trace', help='Binary trace file (.axtrace)')
+    parser.add_argument('--limit', type=int, help='Print at most this many records')
+    
+    args = parser.parse_args()
+    
+    counts = {name: 0 for name in EVENT_NAMES.values()}
+    last_timestamp = 0.0
+    for index, (timestamp, event, payload) in enumerate(read_trace(args.trace)):
+        counts[EVENT_NAMES[event]] += 1
+        last_timestamp = timestamp
+        if args.limit is None or index < args.limit:
+            text = payload.decode(errors='replace').replace('\n', '\\n')
+            print(f"{timestamp:12.6f}  {EVENT_NAMES[event]:<5} {text}")
+    
+    print(f"\n{sum(counts.values())} records over {last_timestamp:.3f}s: " +
+          ", ".join(f"{name} {count}" for name, count in counts.items()))
+
+if __name__ == "__main__":
+    main()
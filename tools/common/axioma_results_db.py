@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Results Database
+===============================
+
+SQLite results database shared by the production test and silicon
+characterization tools. One row per tested unit, one row per executed
+test block and one row per measurement, with indexes on serial number,
+lot, timestamp and test name so yield, failure paretos and per-serial
+lookups do not need to scan or parse result files.
+
+Schema:
+    units(id, serial_number, lot, site, tool, timestamp, overall_result,
+          bin, speed_grade, duration_seconds)
+    tests(id, unit_id, test_name, status)
+    measurements(id, unit_id, test_name, name, value, units, low_limit,
+                 high_limit, status, voltage, temperature, frequency)
+
+Usage:
+    python3 axioma_results_db.py --db results.db yield --lot L123
+    python3 axioma_results_db.py --db results.db pareto --top 10
+    python3 axioma_results_db.py --db results.db unit AUTO_000042
+    python3 axioma_results_db.py --db results.db import production_logs/*.jsonl
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    serial_number TEXT NOT NULL,
+    lot TEXT,
+    site TEXT,
+    tool TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    overall_result TEXT,
+    bin INTEGER,
+    speed_grade TEXT,
+    duration_seconds REAL
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    unit_id INTEGER NOT NULL REFERENCES units(id),
+    test_name TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    unit_id INTEGER NOT NULL REFERENCES units(id),
+    test_name TEXT,
+    name TEXT NOT NULL,
+    value REAL,
+    units TEXT,
+    low_limit REAL,
+    high_limit REAL,
+    status TEXT,
+    voltage REAL,
+    temperature REAL,
+    frequency REAL
+);
+CREATE INDEX IF NOT EXISTS idx_units_serial ON units(serial_number);
+CREATE INDEX IF NOT EXISTS idx_units_lot ON units(lot, overall_result);
+CREATE INDEX IF NOT EXISTS idx_units_timestamp ON units(timestamp);
+CREATE INDEX IF NOT EXISTS idx_tests_unit ON tests(unit_id);
+CREATE INDEX IF NOT EXISTS idx_tests_name ON tests(test_name, status);
+CREATE INDEX IF NOT EXISTS idx_measurements_unit ON measurements(unit_id);
+CREATE INDEX IF NOT EXISTS idx_measurements_name ON measurements(name);
+"""
+
+# Result blocks in ProductionTester.test_results and the test they belong to
+PRODUCTION_BLOCKS = {
+    "power_on_reset": "power_on",
+    "digital_io": "digital_io",
+    "analog": "analog",
+    "communication": "communication",
+    "timers": "timers",
+    "memory": "memory",
+    "parametric": "parametric"
+}
+
+class ResultsDatabase:
+    """SQLite store for production and characterization results"""
+    
+    def __init__(self, path, commit_every=100):
+        """Open (and create if needed) the database at path
+        
+        Inserts are committed every commit_every units and on close().
+        """
+        self.path = path
+        self.commit_every = max(1, int(commit_every))
+        self.pending = 0
+        self.lock = threading.Lock()
+        
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+    
+    def close(self):
+        """Commit pending inserts and close the database"""
+        with self.lock:
+            if self.conn:
+                self.conn.commit()
+                self.conn.close()
+                self.conn = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def commit(self):
+        """Commit pending inserts now"""
+        with self.lock:
+            self.conn.commit()
+            self.pending = 0
+    
+    def insert_production_unit(self, test_results, lot=None):
+        """Insert one ProductionTester.test_results record"""
+        failed = set(test_results.get("failed_tests", []))
+        tests = [
+            (test_name, "FAIL" if test_name in failed else "PASS")
+            for test_name in test_results.get("tests_executed", [])
+        ]
+        
+        measurements = []
+        for block, test_name in PRODUCTION_BLOCKS.items():
+            data = test_results.get(block)
+            if isinstance(data, dict):
+                measurements.extend(self._flatten_block(test_name, data))
+        
+        latency = test_results.get("boot_latency")
+        if isinstance(latency, dict):
+            measurements.append({
+                "test_name": "connect",
+                "name": "boot_latency",
+                "value": latency.get("value"),
+                "units": latency.get("unit")
+            })
+        
+        unit = {
+            "serial_number": test_results.get("serial_number", "UNKNOWN"),
+            "lot": lot or test_results.get("lot"),
+            "site": test_results.get("site"),
+            "tool": "production",
+            "timestamp": test_results.get("start_time"),
+            "overall_result": test_results.get("overall_result"),
+            "bin": test_results.get("bin"),
+            "duration_seconds": test_results.get("duration_seconds")
+        }
+        return self._insert_unit(unit, tests, measurements)
+    
+    def insert_characterization(self, chip_id, results, timestamp, lot=None):
+        """Insert one AxiomaCoreCharacterizer.results record"""
+        tests = []
+        measurements = []
+        
+        for peripheral, data in results.get('functional_validation', {}).items():
+            if isinstance(data, dict) and 'status' in data:
+                tests.append((f"functional.{peripheral}", data['status']))
+        
+        for voltage, temps in results.get('frequency_characterization', {}).items():
+            for temp, freqs in temps.items():
+                for freq, data in freqs.items():
+                    conditions = {
+                        "test_name": "frequency",
+                        "voltage": float(voltage),
+                        "temperature": float(temp),
+                        "frequency": float(freq)
+                    }
+                    measurements.append(dict(conditions, name="stable",
+                                             value=1.0 if data['stable'] else 0.0))
+                    measurements.append(dict(conditions, name="current",
+                                             value=data['current_ma'], units="mA"))
+        
+        for freq, modes in results.get('power_characterization', {}).items():
+            for mode, values in modes.items():
+                measurements.append({
+                    "test_name": "power",
+                    "name": f"power_{mode}",
+                    "value": values['power_mw'],
+                    "units": "mW",
+                    "frequency": float(freq)
+                })
+                measurements.append({
+                    "test_name": "power",
+                    "name": f"current_{mode}",
+                    "value": values['current_ma'],
+                    "units": "mA",
+                    "frequency": float(freq)
+                })
+        
+        grade = results.get('speed_grade', {})
+        speed_grade = grade.get('grade')
+        unit = {
+            "serial_number": chip_id,
+            "lot": lot,
+            "tool": "characterization",
+            "timestamp": timestamp,
+            "overall_result": "FAIL" if not speed_grade or speed_grade == "FAIL" else "PASS",
+            "speed_grade": speed_grade
+        }
+        if 'max_frequency' in grade:
+            measurements.append({
+                "test_name": "speed_grade",
+                "name": "max_frequency",
+                "value": grade['max_frequency'],
+                "units": "MHz"
+            })
+        worst = grade.get('worst_case')
+        if worst:
+            measurements.append({
+                "test_name": "speed_grade",
+                "name": "worst_case_max_frequency",
+                "value": worst['max_frequency'],
+                "units": "MHz",
+                "voltage": worst['voltage'],
+                "temperature": worst['temperature']
+            })
+        if grade.get('temperature_coefficient_mhz_per_c') is not None:
+            measurements.append({
+                "test_name": "speed_grade",
+                "name": "temperature_coefficient",
+                "value": grade['temperature_coefficient_mhz_per_c'],
+                "units": "MHz/C"
+            })
+        
+        return self._insert_unit(unit, tests, measurements)
+    
+    def yield_by_lot(self, lot=None, tool=None):
+        """Return [(lot, tested, passed, yield_percent)]"""
+        where, params = self._filters(lot=lot, tool=tool)
+        rows = self.conn.execute(
+            "SELECT lot, COUNT(*), SUM(overall_result = 'PASS') FROM units"
+            f"{where} GROUP BY lot ORDER BY lot", params
+        ).fetchall()
+        return [(l, n, p, (p / n) * 100 if n else 0.0) for l, n, p in rows]
+    
+    def failure_pareto(self, lot=None, tool=None, top=10, detail=False):
+        """Return [(name, failures)] most frequent first
+        
+        With detail=True failures are counted per sub-test (e.g.
+        "memory.SRAM") from the measurements table instead of per block.
+        """
+        where, params = self._filters(lot=lot, tool=tool, prefix="u.")
+        if detail:
+            query = ("SELECT m.name, COUNT(*) FROM measurements m "
+                     "JOIN units u ON u.id = m.unit_id"
+                     f"{where}{' AND' if where else ' WHERE'} m.status = 'FAIL' "
+                     "GROUP BY m.name ORDER BY COUNT(*) DESC LIMIT ?")
+        else:
+            query = ("SELECT t.test_name, COUNT(*) FROM tests t "
+                     "JOIN units u ON u.id = t.unit_id"
+                     f"{where}{' AND' if where else ' WHERE'} t.status = 'FAIL' "
+                     "GROUP BY t.test_name ORDER BY COUNT(*) DESC LIMIT ?")
+        return self.conn.execute(query, params + [top]).fetchall()
+    
+    def characterization_summaries(self, lot=None):
+        """Yield one summary dict per characterized chip, streaming
+        
+        Keys: chip_id, lot, grade, fmax_mhz (nominal), worst_fmax_mhz,
+        tempco_mhz_per_c, current_16mhz_ma and power_16mhz_mw (active),
+        functional_failures: the fields of a characterization JSON report.
+        """
+        where, params = self._filters(lot=lot, tool="characterization", prefix="u.")
+        cursor = self.conn.execute(
+            "SELECT u.serial_number, u.lot, u.speed_grade, "
+            "MAX(CASE WHEN m.name = 'max_frequency' THEN m.value END), "
+            "MAX(CASE WHEN m.name = 'worst_case_max_frequency' THEN m.value END), "
+            "MAX(CASE WHEN m.name = 'temperature_coefficient' THEN m.value END), "
+            "MAX(CASE WHEN m.name = 'current_active' AND m.frequency = 16 THEN m.value END), "
+            "MAX(CASE WHEN m.name = 'power_active' AND m.frequency = 16 THEN m.value END), "
+            "(SELECT COUNT(*) FROM tests t WHERE t.unit_id = u.id AND t.status = 'FAIL') "
+            "FROM units u LEFT JOIN measurements m ON m.unit_id = u.id"
+            f"{where} GROUP BY u.id", params
+        )
+        for chip_id, unit_lot, grade, fmax, worst, tempco, current, power, failures in cursor:
+            yield {
+                "chip_id": chip_id,
+                "lot": unit_lot,
+                "grade": grade,
+                "fmax_mhz": fmax,
+                "worst_fmax_mhz": worst,
+                "tempco_mhz_per_c": tempco,
+                "current_16mhz_ma": current,
+                "power_16mhz_mw": power,
+                "functional_failures": failures
+            }
+    
+    def lookup_serial(self, serial_number):
+        """Return every recorded test of a serial number, newest first"""
+        units = self.conn.execute(
+            "SELECT id, tool, lot, site, timestamp, overall_result, bin, speed_grade "
+            "FROM units WHERE serial_number = ? ORDER BY timestamp DESC",
+            (serial_number,)
+        ).fetchall()
+        
+        history = []
+        for unit_id, tool, lot, site, timestamp, result, bin_number, grade in units:
+            failed = [name for (name,) in self.conn.execute(
+                "SELECT test_name FROM tests WHERE unit_id = ? AND status = 'FAIL'",
+                (unit_id,)
+            )]
+            history.append({
+                "tool": tool,
+                "lot": lot,
+                "site": site,
+                "timestamp": timestamp,
+                "overall_result": result,
+                "bin": bin_number,
+                "speed_grade": grade,
+                "failed_tests": failed
+            })
+        return history
+    
+    def _filters(self, lot=None, tool=None, prefix=""):
+        clauses = []
+        params = []
+        if lot:
+            clauses.append(f"{prefix}lot = ?")
+            params.append(lot)
+        if tool:
+            clauses.append(f"{prefix}tool = ?")
+            params.append(tool)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return where, params
+    
+    def _flatten_block(self, test_name, data):
+        """Turn a nested test result block into measurement rows"""
+        rows = []
+        for key, item in data.items():
+            if not isinstance(item, dict):
+                continue
+            
+            if "status" in item or "value" in item:
+                value = item.get("value", item.get("voltage"))
+                rows.append({
+                    "test_name": test_name,
+                    "name": f"{test_name}.{key}",
+                    "value": value if isinstance(value, (int, float)) else None,
+                    "units": item.get("unit"),
+                    "low_limit": item.get("min_limit"),
+                    "high_limit": item.get("max_limit", item.get("limit")),
+                    "status": item.get("status")
+                })
+            else:
+                # One more level, e.g. {"ports": {"PORTB": {...}}}
+                rows.extend(self._flatten_block(test_name, item))
+        return rows
+    
+    def _insert_unit(self, unit, tests, measurements):
+        columns = ("serial_number", "lot", "site", "tool", "timestamp",
+                   "overall_result", "bin", "speed_grade", "duration_seconds")
+        measurement_columns = ("test_name", "name", "value", "units", "low_limit",
+                               "high_limit", "status", "voltage", "temperature",
+                               "frequency")
+        
+        with self.lock:
+            cursor = self.conn.execute(
+                f"INSERT INTO units ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                [unit.get(c) for c in columns]
+            )
+            unit_id = cursor.lastrowid
+            
+            self.conn.executemany(
+                "INSERT INTO tests (unit_id, test_name, status) VALUES (?, ?, ?)",
+                [(unit_id, name, status) for name, status in tests]
+            )
+            self.conn.executemany(
+                f"INSERT INTO measurements (unit_id, {', '.join(measurement_columns)}) "
+                f"VALUES (?, {', '.join('?' * len(measurement_columns))})",
+                [[unit_id] + [m.get(c) for c in measurement_columns] for m in measurements]
+            )
+            
+            self.pending += 1
+            if self.pending >= self.commit_every:
+                self.conn.commit()
+                self.pending = 0
+        
+        return unit_id
+
+def import_jsonl(db, paths):
+    """Backfill the database from production results logs"""
+    count = 0
+    for path in paths:
+        with open(path, 'r') as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get("type") == "unit":
+                    db.insert_production_unit(record, record.get("lot"))
+                    count += 1
+    db.commit()
+    return count
+
+def main():
+    """Command line queries on a results database"""
+    parser = argparse.ArgumentParser(
+        description='AxiomaCore-328 Results Database'
+    )
+    parser.add_argument(
+        '--db',
+        default='production_logs/production_results.db',
+        help='SQLite database file'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    yield_parser = subparsers.add_parser('yield', help='Yield by lot')
+    yield_parser.add_argument('--lot', help='Only this lot')
+    yield_parser.add_argument('--tool', choices=['production', 'characterization'])
+    
+    pareto_parser = subparsers.add_parser('pareto', help='Failure pareto')
+    pareto_parser.add_argument('--lot', help='Only this lot')
+    pareto_parser.add_argument('--tool', choices=['production', 'characterization'])
+    pareto_parser.add_argument('--top', type=int, default=10, help='Entries to show')
+    pareto_parser.add_argument('--detail', action='store_true',
+                               help='Count per sub-test instead of per block')
+    
+    unit_parser = subparsers.add_parser('unit', help='History of one serial number')
+    unit_parser.add_argument('serial', help='Serial number / chip ID')
+    
+    import_parser = subparsers.add_parser('import', help='Import results .jsonl logs')
+    import_parser.add_argument('files', nargs='+', help='Results log files')
+    
+    args = parser.parse_args()
+    
+    with ResultsDatabase(args.db) as db:
+        if args.command == 'yield':
+            rows = db.yield_by_lot(args.lot, args.tool)
+            print(f"{'Lot':<20} {'Tested':>10} {'Passed':>10} {'Yield':>8}")
+            for lot, tested, passed, percent in rows:
+                print(f"{str(lot):<20} {tested:>10} {passed:>10} {percent:>7.2f}%")
+        
+        elif args.command == 'pareto':
+            rows = db.failure_pareto(args.lot, args.tool, args.top, args.detail)
+            total = sum(count for _, count in rows)
+            for name, count in rows:
+                share = (count / total) * 100 if total else 0.0
+                print(f"{name:<30} {count:>10} {share:>7.2f}%")
+        
+        elif args.command == 'unit':
+            history = db.lookup_serial(args.serial)
+            if not history:
+                print(f"No records for {args.serial}")
+                sys.exit(1)
+            for entry in history:
+                print(json.dumps(entry))
+        
+        elif args.command == 'import':
+            count = import_jsonl(db, args.files)
+            print(f"Imported {count} units")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 SCPI Transport
+=============================
+
+Line-based SCPI transport shared by the production and characterization
+tools. Besides one-command-at-a-time operation it can pipeline commands:
+a batch is written to the device in a single write and the responses are
+read back in order, so a batch pays one serial round trip instead of one
+per command. It also replaces fixed post-reset sleeps with readiness
+polling that measures how long the device actually took to come up.
+
+The transport can also negotiate a binary framed mode with firmware that
+supports it (PROTO:BINARY). Frames are length-prefixed and CRC-checked,
+numeric responses arrive as packed little-endian arrays, and multi-value
+commands return several readings in one frame:
+
+    ADC:READ:ALL?   six ADC codes        (uint16 x 6)
+    GPIO:IN:ALL?    ports B, C, D        (uint8 x 3)
+    MEAS:ALL?       current, voltage, frequency (float32 x 3)
+
+    frame = A5 | type | payload length (uint16) | payload | CRC-16/CCITT
+
+Command frames carry the usual SCPI text. send_command keeps returning
+text in either mode; query_values / query_batch return decoded numbers.
+If the device does not acknowledge PROTO:BINARY the transport stays in
+line mode, and a RESET always drops back to line mode (the firmware
+boots in it) until the next successful readiness poll renegotiates.
+
+Observers can be attached to a transport to see every write, read and
+input flush. Instrumentation is the built-in observer: a per-command
+latency histogram, timeout counters, byte counts and an optional binary
+trace of the whole session (see read_trace for the file format).
+
+Usage:
+    transport = SerialTransport(serial_conn, pipeline_depth=16)
+    idn = transport.send_command("*IDN?")
+    high, low = transport.send_batch(["GPIO:B:IN?", "GPIO:C:IN?"])
+    response, latency = transport.wait_until_ready(deadline=3.0)
+    
+    transport = SerialTransport(serial_conn, binary=True)   # negotiated when ready
+    codes = transport.query_values("ADC:READ:ALL?")
+    
+    with transport.instrument(trace_file="session.axtrace") as stats:
+        run_tests()
+    print(stats.format_report())
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import struct
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Binary trace file: magic, then records of <timestamp, event, length> + payload
+TRACE_MAGIC = b"AXTRACE1"
+TRACE_RECORD = struct.Struct("<dBH")
+TRACE_TX = 0
+TRACE_RX = 1
+TRACE_TIMEOUT = 2
+TRACE_RESET = 3
+
+# Binary framed mode
+FRAME_SYNC = 0xA5
+FRAME_HEADER = struct.Struct("<BBH")
+FRAME_CRC = struct.Struct("<H")
+FRAME_COMMAND = 0x10
+FRAME_TEXT = 0x01
+FRAME_U8 = 0x02
+FRAME_U16 = 0x03
+FRAME_F32 = 0x04
+FRAME_VALUE_FORMATS = {FRAME_U8: "B", FRAME_U16: "H", FRAME_F32: "f"}
+
+def _crc16_table():
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+_CRC16_TABLE = _crc16_table()
+
+def crc16(data, crc=0xFFFF):
+    """CRC-16/CCITT-FALSE"""
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC16_TABLE[(crc >> 8) ^ byte]
+    return crc
+
+def encode_frame(frame_type, payload):
+    """Frame bytes for one payload"""
+    header = FRAME_HEADER.pack(FRAME_SYNC, frame_type, len(payload))
+    return header + payload + FRAME_CRC.pack(crc16(header[1:] + payload))
+
+def decode_frame(header, body):
+    """(frame_type, payload) from a header and body+CRC, or None if corrupt"""
+    if len(header) != FRAME_HEADER.size or header[0] != FRAME_SYNC:
+        return None
+    _, frame_type, length = FRAME_HEADER.unpack(header)
+    if len(body) != length + FRAME_CRC.size:
+        return None
+    payload = body[:length]
+    if FRAME_CRC.unpack(body[length:])[0] != crc16(header[1:] + payload):
+        return None
+    return frame_type, payload
+
+def iter_frames(data):
+    """Yield (frame_type, payload) for every complete frame in data"""
+    offset = 0
+    while offset + FRAME_HEADER.size <= len(data):
+        _, frame_type, length = FRAME_HEADER.unpack_from(data, offset)
+        end = offset + FRAME_HEADER.size + length
+        yield frame_type, data[offset + FRAME_HEADER.size:end]
+        offset = end + FRAME_CRC.size
+
+def decode_values(frame_type, payload):
+    """Numbers carried by a response frame (text frames are parsed)"""
+    value_format = FRAME_VALUE_FORMATS.get(frame_type)
+    if value_format is None:
+        return parse_values(payload.decode(errors='replace'))
+    count = len(payload) // struct.calcsize(value_format)
+    return struct.unpack(f"<{count}{value_format}", payload)
+
+def format_values(frame_type, payload):
+    """Response frame as the text the line protocol would have sent"""
+    if frame_type == FRAME_U8:
+        return ','.join(f"0x{value:02X}" for value in decode_values(frame_type, payload))
+    if frame_type == FRAME_U16:
+        return ','.join(str(value) for value in decode_values(frame_type, payload))
+    if frame_type == FRAME_F32:
+        return ','.join(format(value, '.7g') for value in decode_values(frame_type, payload))
+    return payload.decode(errors='replace')
+
+def parse_values(text):
+    """Numbers in a comma-separated line response, None if not numeric"""
+    values = []
+    try:
+        for item in text.split(','):
+            item = item.strip()
+            if item.lower().startswith('0x') or item.lstrip('-').isdigit():
+                values.append(int(item, 0))
+            else:
+                values.append(float(item))
+    except ValueError:
+        return None
+    return tuple(values)
+
+def command_names(data):
+    """First token of every command in written bytes (either mode)"""
+    if data[:1] == bytes([FRAME_SYNC]):
+        lines = [payload.decode(errors='replace') for _, payload in iter_frames(data)]
+    else:
+        lines = data.decode(errors='replace').splitlines()
+    return [line.split(' ', 1)[0] for line in lines]
+
+# Upper bucket edges of the latency histogram in milliseconds
+LATENCY_BUCKETS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+class TransportObserver:
+    """Hook interface for transport events; override what you need"""
+    
+    def on_write(self, data, start, end):
+        """Bytes written to the device between start and end (perf_counter)"""
+    
+    def on_read(self, raw, start, end, timed_out):
+        """One response line or frame; timed_out if incomplete or corrupt"""
+    
+    def on_reset(self, timestamp):
+        """Input buffer flushed; outstanding responses were discarded"""
+
+class CommandStats:
+    """Latency histogram and totals for one command"""
+    
+    def __init__(self):
+        self.count = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    
+    def add(self, seconds, timed_out):
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if timed_out:
+            self.timeouts += 1
+        
+        milliseconds = seconds * 1000
+        for index, edge in enumerate(LATENCY_BUCKETS_MS):
+            if milliseconds <= edge:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+    
+    def percentile_ms(self, fraction):
+        """Upper edge of the histogram bucket holding the percentile"""
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else float('inf')
+        return None
+    
+    def summary(self):
+        return {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "mean_ms": (self.total_seconds / self.count) * 1000 if self.count else 0.0,
+            "max_ms": self.max_seconds * 1000,
+            "p50_ms": self.percentile_ms(0.50),
+            "p99_ms": self.percentile_ms(0.99),
+            "histogram": dict(zip([f"<={edge}" for edge in LATENCY_BUCKETS_MS] + ["inf"],
+                                  self.buckets))
+        }
+
+class Instrumentation(TransportObserver):
+    """Per-command timing, byte counters and optional binary session trace
+    
+    Responses are matched to commands in FIFO order, so a pipelined
+    command's latency runs from its batch write to its own response.
+    """
+    
+    def __init__(self, trace_file=None):
+        self.commands = {}
+        self.pending = deque()
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.timeouts = 0
+        self.io_seconds = 0.0
+        self.trace = None
+        self.trace_start = time.perf_counter()
+        
+        if trace_file:
+            self.trace = open(trace_file, 'wb')
+            self.trace.write(TRACE_MAGIC)
+    
+    def close(self):
+        """Close the trace file, if any"""
+        if self.trace:
+            self.trace.close()
+            self.trace = None
+    
+    def on_write(self, data, start, end):
+        self.bytes_out += len(data)
+        self.io_seconds += end - start
+        for command in command_names(data):
+            self.pending.append((command, start))
+        self.record(TRACE_TX, start, data)
+    
+    def on_read(self, raw, start, end, timed_out):
+        self.bytes_in += len(raw)
+        self.io_seconds += end - start
+        if timed_out:
+            self.timeouts += 1
+        
+        if self.pending:
+            command, sent = self.pending.popleft()
+            self.commands.setdefault(command, CommandStats()).add(end - sent, timed_out)
+        self.record(TRACE_TIMEOUT if timed_out else TRACE_RX, end, raw)
+    
+    def on_reset(self, timestamp):
+        self.pending.clear()
+        self.record(TRACE_RESET, timestamp, b"")
+    
+    def record(self, event, timestamp, payload):
+        if self.trace:
+            payload = payload[:0xFFFF]
+            self.trace.write(TRACE_RECORD.pack(timestamp - self.trace_start, event, len(payload)))
+            self.trace.write(payload)
+    
+    def summary(self):
+        """Machine-readable totals and per-command statistics"""
+        return {
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "timeouts": self.timeouts,
+            "io_seconds": self.io_seconds,
+            "commands": {name: stats.summary() for name, stats in sorted(self.commands.items())}
+        }
+    
+    def format_report(self, top=15):
+        """Commands sorted by total time spent, slowest first"""
+        lines = [
+            f"Bytes out: {self.bytes_out}  Bytes in: {self.bytes_in}  "
+            f"Timeouts: {self.timeouts}  I/O time: {self.io_seconds:.3f}s",
+            f"{'Command':<24} {'Count':>7} {'Mean ms':>9} {'p99 ms':>8} {'Total s':>9} {'T/O':>5}"
+        ]
+        ranked = sorted(self.commands.items(), key=lambda item: -item[1].total_seconds)
+        for name, stats in ranked[:top]:
+            summary = stats.summary()
+            lines.append(
+                f"{name:<24} {stats.count:>7} {summary['mean_ms']:>9.2f} "
+                f"{summary['p99_ms']:>8} {stats.total_seconds:>9.3f} {stats.timeouts:>5}"
+            )
+        return "\n".join(lines)
+
+def read_trace(path):
+    """Yield (seconds, event, payload) records from a binary trace file
+    
+    event is TRACE_TX, TRACE_RX, TRACE_TIMEOUT or TRACE_RESET.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"Not an AxiomaCore trace file: {path}")
+        
+        while True:
+            header = f.read(TRACE_RECORD.size)
+            if len(header) < TRACE_RECORD.size:
+                return
+            timestamp, event, length = TRACE_RECORD.unpack(header)
+            yield timestamp, event, f.read(length)
+
+class SerialTransport:
+    """Line-based SCPI transport over an open pyserial connection"""
+    
+    def __init__(self, serial_conn, pipeline_depth=1, binary=False):
+        """Wrap an open serial connection
+        
+        pipeline_depth is the maximum number of commands written before
+        their responses are read back; 1 disables pipelining.
+        
+        binary: negotiate the binary framed mode whenever the device
+        becomes ready (falls back to line mode if it is not supported).
+        """
+        self.serial_conn = serial_conn
+        self.pipeline_depth = max(1, int(pipeline_depth))
+        self.prefer_binary = binary
+        self.binary = False
+        self.observers = []
+    
+    def add_observer(self, observer):
+        """Attach a TransportObserver"""
+        self.observers.append(observer)
+    
+    def remove_observer(self, observer):
+        """Detach a TransportObserver"""
+        self.observers.remove(observer)
+    
+    @contextmanager
+    def instrument(self, trace_file=None):
+        """Collect Instrumentation for the duration of the with block"""
+        instrumentation = Instrumentation(trace_file)
+        self.add_observer(instrumentation)
+        try:
+            yield instrumentation
+        finally:
+            self.remove_observer(instrumentation)
+            instrumentation.close()
+    
+    def write(self, data):
+        """Write raw bytes, notifying observers"""
+        if not self.observers:
+            return self.serial_conn.write(data)
+        
+        start = time.perf_counter()
+        written = self.serial_conn.write(data)
+        end = time.perf_counter()
+        for observer in self.observers:
+            observer.on_write(data, start, end)
+        return written
+    
+    def readline(self):
+        """Read one raw response line, notifying observers"""
+        if not self.observers:
+            return self.serial_conn.readline()
+        
+        start = time.perf_counter()
+        raw = self.serial_conn.readline()
+        end = time.perf_counter()
+        for observer in self.observers:
+            observer.on_read(raw, start, end, not raw.endswith(b'\n'))
+        return raw
+    
+    def read_frame(self):
+        """Read one response frame; None on timeout or CRC error"""
+        start = time.perf_counter()
+        header = self.serial_conn.read(FRAME_HEADER.size)
+        body = b""
+        if len(header) == FRAME_HEADER.size and header[0] == FRAME_SYNC:
+            body = self.serial_conn.read(FRAME_HEADER.unpack(header)[2] + FRAME_CRC.size)
+        frame = decode_frame(header, body)
+        
+        if self.observers:
+            end = time.perf_counter()
+            for observer in self.observers:
+                observer.on_read(header + body, start, end, frame is None)
+        return frame
+    
+    def reset_input_buffer(self):
+        """Discard pending input, notifying observers"""
+        self.serial_conn.reset_input_buffer()
+        if self.observers:
+            timestamp = time.perf_counter()
+            for observer in self.observers:
+                observer.on_reset(timestamp)
+    
+    def encode_commands(self, commands):
+        """Wire bytes for commands in the current mode"""
+        if self.binary:
+            return b"".join(encode_frame(FRAME_COMMAND, command.encode()) for command in commands)
+        return ''.join(command + '\n' for command in commands).encode()
+    
+    def negotiate_binary(self):
+        """Switch to binary framed mode if the device supports it"""
+        if not self.binary:
+            self.binary = self.send_command("PROTO:BINARY") == "OK"
+        return self.binary
+    
+    def send_command(self, command):
+        """Send one command and return its response line"""
+        return self.send_batch([command])[0]
+    
+    def write_command(self, command):
+        """Send a command without waiting for a response (e.g. RESET)"""
+        self.write(self.encode_commands([command]))
+        if command.split(' ', 1)[0] == "RESET":
+            # The firmware always boots in line mode
+            self.binary = False
+    
+    def query_values(self, command):
+        """Send one command and return its response as a tuple of numbers
+        
+        None if the response is missing or not numeric.
+        """
+        return self.query_batch([command])[0]
+    
+    def wait_until_ready(self, probe="*IDN?", expect="AxiomaCore-328",
+                         deadline=5.0, poll_timeout=0.05, backoff=2.0,
+                         max_poll_timeout=1.0):
+        """Poll the device with probe until a response contains expect
+        
+        Each attempt waits poll_timeout for an answer, growing by backoff
+        up to max_poll_timeout, until deadline seconds have passed.
+        Returns (response, elapsed_seconds); response is None on timeout.
+        Binary mode is (re)negotiated once the device answers, if preferred.
+        """
+        original_timeout = self.serial_conn.timeout
+        start = time.perf_counter()
+        attempt_timeout = poll_timeout
+        
+        if self.prefer_binary and not self.binary:
+            # A device left in binary mode by an earlier session goes back
+            # to line mode; in line mode this is one ignored garbage line
+            self.write(encode_frame(FRAME_COMMAND, b"PROTO:LINE") + b"\n")
+        
+        try:
+            while True:
+                elapsed = time.perf_counter() - start
+                remaining = deadline - elapsed
+                if remaining <= 0:
+                    return None, elapsed
+                
+                self.serial_conn.timeout = min(attempt_timeout, remaining)
+                self.reset_input_buffer()
+                response = self.exchange([probe])[0]
+                if isinstance(response, tuple):
+                    response = format_values(*response)
+                
+                if response and expect in response:
+                    elapsed = time.perf_counter() - start
+                    # Drop late answers to earlier probes
+                    self.reset_input_buffer()
+                    break
+                
+                attempt_timeout = min(attempt_timeout * backoff, max_poll_timeout)
+        finally:
+            self.serial_conn.timeout = original_timeout
+        
+        if self.prefer_binary:
+            self.negotiate_binary()
+        return response, elapsed
+    
+    def send_batch(self, commands):
+        """Send several commands and return their responses in order
+        
+        Commands are written in chunks of pipeline_depth. If a response
+        times out the rest of that chunk is reported as empty responses
+        and the input buffer is flushed so later chunks stay aligned.
+        """
+        return [
+            format_values(*response) if isinstance(response, tuple) else response or ''
+            for response in self.exchange(commands)
+        ]
+    
+    def query_batch(self, commands):
+        """Like send_batch, but each response is a tuple of numbers (or None)"""
+        values = []
+        for response in self.exchange(commands):
+            if isinstance(response, tuple):
+                values.append(decode_values(*response))
+            else:
+                values.append(parse_values(response) if response else None)
+        return values
+    
+    def exchange(self, commands):
+        """Pipelined request/response in the current mode
+        
+        Returns one item per command: the response text in line mode,
+        (frame_type, payload) in binary mode, None if it was lost.
+        """
+        commands = list(commands)
+        responses = []
+        
+        for start in range(0, len(commands), self.pipeline_depth):
+            chunk = commands[start:start + self.pipeline_depth]
+            self.write(self.encode_commands(chunk))
+            
+            for index in range(len(chunk)):
+                if self.binary:
+                    response = self.read_frame()
+                    complete = response is not None
+                else:
+                    raw = self.readline()
+                    complete = raw.endswith(b'\n')
+                    response = raw.decode(errors='replace').strip()
+                
+                responses.append(response)
+                if not complete:
+                    # Timeout: the remaining responses cannot be matched
+                    responses.extend([None] * (len(chunk) - index - 1))
+                    self.reset_input_buffer()
+                    break
+        
+        return responses
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Production Test Benchmark
+========================================
+
+Runs the production test sequence N times against the simulated DUT (or
+any port / pyserial URL) and reports where the test time goes:
+
+- Per-test latency percentiles and per-command latency histograms
+  (the transport Instrumentation)
+- Units per hour
+- Share of time spent in serial I/O, readiness polling, sleeps and
+  Python overhead (everything else)
+
+Results are written as JSON so runs can be compared across versions:
+
+Usage:
+    python3 benchmark_production.py --units 200 --output bench.json
+    python3 benchmark_production.py --units 200 --latency 0.002 --compare bench.json
+    python3 benchmark_production.py --port /dev/ttyUSB0 --units 20
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from axioma_dut_sim import SimulatedDUT, SimulatedDUTServer
+from axioma_transport import Instrumentation
+from production_test import BUILTIN_TESTS, ProductionTester
+from production_logging import stop_pipeline
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize(samples):
+    """Latency summary (milliseconds) of a list of durations in seconds"""
+    values = sorted(samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": sum(values) / len(values) * 1000,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p90_ms": percentile(values, 0.90) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": values[-1] * 1000
+    }
+
+class BenchmarkStats:
+    """Time accumulators filled by the instrumentation wrappers"""
+    
+    def __init__(self):
+        self.sleep_seconds = 0.0
+        self.test_latency = {}
+        self.unit_latency = []
+
+class BenchmarkInstrumentation(Instrumentation):
+    """Transport instrumentation that books readiness polling I/O apart
+    
+    Per-command latencies come from Instrumentation; I/O done while
+    in_ready_poll is moved from io_seconds to ready_seconds.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.in_ready_poll = False
+        self.ready_seconds = 0.0
+    
+    def on_write(self, data, start, end):
+        super().on_write(data, start, end)
+        self.split_io(end - start)
+    
+    def on_read(self, raw, start, end, timed_out):
+        super().on_read(raw, start, end, timed_out)
+        self.split_io(end - start)
+    
+    def split_io(self, seconds):
+        if self.in_ready_poll:
+            self.io_seconds -= seconds
+            self.ready_seconds += seconds
+
+def instrument(tester, stats):
+    """Attach transport instrumentation and time readiness polling and tests
+    
+    Returns the BenchmarkInstrumentation (attached on every open_port).
+    """
+    instrumentation = BenchmarkInstrumentation()
+    tester.instrumentation = instrumentation
+    
+    original_ready = tester.wait_until_ready
+    
+    def wait_until_ready():
+        instrumentation.in_ready_poll = True
+        try:
+            return original_ready()
+        finally:
+            instrumentation.in_ready_poll = False
+    
+    tester.wait_until_ready = wait_until_ready
+    
+    def record_test(test_name, start):
+        stats.test_latency.setdefault(test_name, []).append(time.perf_counter() - start)
+    
+    for test_name, method_name in BUILTIN_TESTS.items():
+        method = getattr(tester, method_name)
+        
+        def timed(method=method, test_name=test_name):
+            start = time.perf_counter()
+            try:
+                return method()
+            finally:
+                record_test(test_name, start)
+        
+        setattr(tester, method_name, timed)
+    
+    original_block = tester.run_program_block
+    
+    def timed_block(block_name):
+        start = time.perf_counter()
+        try:
+            return original_block(block_name)
+        finally:
+            record_test(block_name, start)
+    
+    tester.run_program_block = timed_block
+    return instrumentation
+
+def instrument_sleep(stats):
+    """Count time.sleep calls made by the benchmark thread"""
+    original_sleep = time.sleep
+    bench_thread = threading.current_thread()
+    
+    def timed_sleep(seconds):
+        if threading.current_thread() is not bench_thread:
+            return original_sleep(seconds)
+        start = time.perf_counter()
+        original_sleep(seconds)
+        stats.sleep_seconds += time.perf_counter() - start
+    
+    time.sleep = timed_sleep
+    return original_sleep
+
+def git_revision():
+    """Short git revision of the working tree, if available"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run_benchmark(port, units, config_overrides=None, persistent=False):
+    """Run the production sequence units times and return the report dict"""
+    stats = BenchmarkStats()
+    work_dir = tempfile.mkdtemp(prefix="axioma_bench_")
+    
+    config = ProductionTester.default_config()
+    config["serial_port"] = port
+    config["log_verbosity"] = "production"
+    config["output"]["log_directory"] = work_dir
+    config.update(config_overrides or {})
+    
+    config_file = os.path.join(work_dir, "bench_config.json")
+    with open(config_file, 'w') as f:
+        json.dump(config, f, indent=2)
+    
+    tester = ProductionTester(config_file)
+    instrumentation = instrument(tester, stats)
+    original_sleep = instrument_sleep(stats)
+    
+    passed = 0
+    try:
+        if persistent:
+            tester.open_port()
+        
+        bench_start = time.perf_counter()
+        for index in range(units):
+            unit_start = time.perf_counter()
+            if tester.run_production_test(f"BENCH_{index:06d}"):
+                passed += 1
+            stats.unit_latency.append(time.perf_counter() - unit_start)
+        total_seconds = time.perf_counter() - bench_start
+    finally:
+        time.sleep = original_sleep
+        tester.disconnect_device()
+        tester.close()
+        stop_pipeline()
+    
+    io_seconds = instrumentation.io_seconds
+    ready_seconds = instrumentation.ready_seconds
+    accounted = io_seconds + ready_seconds + stats.sleep_seconds
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "port": port,
+        "persistent_connection": persistent,
+        "pipeline_depth": config.get("pipeline_depth", 1),
+        "binary_protocol": config.get("binary_protocol", False),
+        "units": units,
+        "passed": passed,
+        "total_seconds": total_seconds,
+        "units_per_hour": units / total_seconds * 3600 if total_seconds else 0.0,
+        "unit_latency": summarize(stats.unit_latency),
+        "time_share": {
+            "io": io_seconds / total_seconds,
+            "ready_poll": ready_seconds / total_seconds,
+            "sleep": stats.sleep_seconds / total_seconds,
+            "python": max(0.0, total_seconds - accounted) / total_seconds
+        },
+        "read_timeouts": instrumentation.timeouts,
+        "per_test": {name: summarize(v) for name, v in stats.test_latency.items()},
+        "per_command": instrumentation.summary()["commands"],
+        "results_directory": work_dir
+    }
+
+def print_report(report):
+    """Human-readable benchmark summary"""
+    print(f"Units: {report['units']} ({report['passed']} passed) "
+          f"in {report['total_seconds']:.2f}s -> {report['units_per_hour']:.0f} UPH")
+    
+    latency = report["unit_latency"]
+    print(f"Unit time: p50 {latency['p50_ms']:.1f} ms, p90 {latency['p90_ms']:.1f} ms, "
+          f"p99 {latency['p99_ms']:.1f} ms")
+    
+    share = report["time_share"]
+    print("Time share: " + ", ".join(f"{k} {v * 100:.1f}%" for k, v in share.items()))
+    print(f"Read timeouts: {report['read_timeouts']}")
+    
+    print("\nPer test (ms):     count     p50     p90     p99")
+    for name, s in report["per_test"].items():
+        print(f"  {name:<15} {s['count']:>7} {s['p50_ms']:>7.2f} {s['p90_ms']:>7.2f} {s['p99_ms']:>7.2f}")
+    
+    print("\nPer command (ms):  count    mean    p50≤    p99≤")
+    for name, s in report["per_command"].items():
+        print(f"  {name:<15} {s['count']:>7} {s['mean_ms']:>7.2f} {s['p50_ms']:>7g} {s['p99_ms']:>7g}")
+
+def print_comparison(report, baseline):
+    """Compare UPH and per-test p50 against a previous report"""
+    print(f"\nCompared with {baseline.get('revision') or 'baseline'} "
+          f"({baseline.get('timestamp', '?')}):")
+    
+    def delta(new, old):
+        return f"{((new - old) / old) * 100:+.1f}%" if old else "n/a"
+    
+    print(f"  units_per_hour: {baseline['units_per_hour']:.0f} -> "
+          f"{report['units_per_hour']:.0f} ({delta(report['units_per_hour'], baseline['units_per_hour'])})")
+    
+    for name, s in report["per_test"].items():
+        old = baseline.get("per_test", {}).get(name)
+        if old and old.get("count"):
+            print(f"  {name} p50: {old['p50_ms']:.2f} -> {s['p50_ms']:.2f} ms "
+                  f"({delta(s['p50_ms'], old['p50_ms'])})")
+
+def main():
+    """Main function for the production benchmark"""
+    parser = argparse.ArgumentParser(
+        description='AxiomaCore-328 Production Test Benchmark'
+    )
+    parser.add_argument('--units', type=int, default=100, help='Units to test')
+    parser.add_argument('--port', help='Device port or pyserial URL (default: simulated DUT)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Simulated DUT response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Simulated DUT latency jitter in seconds')
+    parser.add_argument('--pipeline-depth', type=int, default=16,
+                        help='Commands per pipelined write (1 disables pipelining)')
+    parser.add_argument('--binary', action='store_true',
+                        help='Use the binary framed protocol')
+    parser.add_argument('--persistent', action='store_true',
+                        help='Keep one connection open for all units')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--compare', help='Previous JSON report to compare against')
+    
+    args = parser.parse_args()
+    
+    overrides = {"pipeline_depth": args.pipeline_depth, "binary_protocol": args.binary}
+    
+    if args.port:
+        report = run_benchmark(args.port, args.units, overrides, args.persistent)
+    else:
+        dut = SimulatedDUT(latency=args.latency, jitter=args.jitter, seed=1)
+        with SimulatedDUTServer(dut) as server:
+            report = run_benchmark(server.port, args.units, overrides, args.persistent)
+        report["simulator"] = {"latency": args.latency, "jitter": args.jitter}
+    
+    print_report(report)
+    
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            print_comparison(report, json.load(f))
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Shared Instrument Locks
+======================================
+
+On a multi-site rig some commands drive instruments shared by every site
+(the supply behind SET:VOLTAGE, the chamber behind SET:TEMPERATURE) while
+everything else talks to one site's DUT only. InstrumentLockManager maps
+command prefixes to shared resources and splits each batch into runs of
+per-site and shared commands: only the shared runs are sent while the
+resource lock is held, so per-site tests on different sites overlap.
+
+Configuration ("shared_resources", resource -> command prefixes):
+
+    "shared_resources": {
+        "supply": ["SET:VOLTAGE"],
+        "chamber": ["SET:TEMPERATURE"]
+    }
+
+Locks are always taken in name order, so batches needing several shared
+resources cannot deadlock. Wait and hold times are kept per resource.
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_SHARED_RESOURCES = {
+    "supply": ["SET:VOLTAGE"],
+    "chamber": ["SET:TEMPERATURE"]
+}
+
+class InstrumentLockManager:
+    """One lock per shared instrument, taken only around shared steps"""
+    
+    def __init__(self, shared_resources=None):
+        if shared_resources is None:
+            shared_resources = DEFAULT_SHARED_RESOURCES
+        self.prefixes = [
+            (prefix, resource)
+            for resource, prefixes in shared_resources.items()
+            for prefix in prefixes
+        ]
+        self.locks = {resource: threading.Lock() for resource in shared_resources}
+        self.stats = {
+            resource: {"acquisitions": 0, "wait_seconds": 0.0, "hold_seconds": 0.0}
+            for resource in shared_resources
+        }
+        self.stats_lock = threading.Lock()
+    
+    def resources_for(self, command):
+        """Shared resources a command touches (empty for per-site commands)"""
+        return frozenset(
+            resource for prefix, resource in self.prefixes if command.startswith(prefix)
+        )
+    
+    def segments(self, commands):
+        """Split commands into consecutive (resources, commands) runs"""
+        segments = []
+        for command in commands:
+            resources = self.resources_for(command)
+            if segments and segments[-1][0] == resources:
+                segments[-1][1].append(command)
+            else:
+                segments.append((resources, [command]))
+        return segments
+    
+    @contextmanager
+    def hold(self, resources):
+        """Hold the locks of resources (in name order) for the with block"""
+        ordered = sorted(resources)
+        start = time.perf_counter()
+        acquired = []
+        try:
+            for resource in ordered:
+                self.locks[resource].acquire()
+                acquired.append(resource)
+            locked_at = time.perf_counter()
+            yield
+        finally:
+            released_at = time.perf_counter()
+            for resource in reversed(acquired):
+                self.locks[resource].release()
+            
+            if len(acquired) == len(ordered):
+                with self.stats_lock:
+                    for resource in ordered:
+                        stats = self.stats[resource]
+                        stats["acquisitions"] += 1
+                        stats["wait_seconds"] += locked_at - start
+                        stats["hold_seconds"] += released_at - locked_at
+    
+    def send_batch(self, send_batch, commands):
+        """Run commands through send_batch, locking only the shared runs"""
+        responses = []
+        for resources, segment in self.segments(commands):
+            if resources:
+                with self.hold(resources):
+                    responses.extend(send_batch(segment))
+            else:
+                responses.extend(send_batch(segment))
+        return responses
+    
+    def summary(self):
+        """Per-resource acquisitions and wait / hold seconds"""
+        with self.stats_lock:
+            return {resource: dict(stats) for resource, stats in self.stats.items()}
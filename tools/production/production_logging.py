@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Production Logging Pipeline
+==========================================
+
+Non-blocking logging for the production test line.
+
+Testers log through a QueueHandler, so a log call only formats the record
+and puts it on an in-memory queue. A single QueueListener thread does all
+file and terminal I/O, writing one log file per test site plus the
+console. The pipeline is started once per process, no matter how many
+ProductionTester instances (sites) are created.
+
+Verbosity ("log_verbosity" in the configuration):
+    production  console shows warnings and errors only, files get INFO
+    normal      console and files get INFO (default)
+    debug       adds per-port / per-channel item results
+
+File format ("output": {"log_format": ...}):
+    text        "2025-07-21 22:16:10,123 - INFO - [SITE0] message"
+    json        one JSON object per line with ts, level, site, msg and
+                any structured fields passed through extra=
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime
+
+VERBOSITY_LEVELS = {
+    # verbosity: (console level, file level)
+    "production": (logging.WARNING, logging.INFO),
+    "normal": (logging.INFO, logging.INFO),
+    "debug": (logging.DEBUG, logging.DEBUG)
+}
+
+# Record attributes that are not structured event fields
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "site", "site_tag"
+}
+
+_pipeline_lock = threading.Lock()
+_listener = None
+_log_queue = None
+
+class SiteFormatter(logging.Formatter):
+    """Text format with the site name in front of the message"""
+    
+    def __init__(self):
+        super().__init__('%(asctime)s - %(levelname)s - %(site_tag)s%(message)s')
+    
+    def format(self, record):
+        site = getattr(record, "site", None)
+        record.site_tag = f"[{site}] " if site else ""
+        return super().format(record)
+
+class StructuredFormatter(logging.Formatter):
+    """One JSON object per record, including structured extra fields"""
+    
+    def format(self, record):
+        event = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "site": getattr(record, "site", None),
+            "msg": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS:
+                event[key] = value
+        return json.dumps(event, default=str, ensure_ascii=False)
+
+class SiteFileRouter(logging.Handler):
+    """Writes each record to the log file of its site
+    
+    Only called from the listener thread, so file handlers are created
+    lazily without extra locking.
+    """
+    
+    def __init__(self, log_dir, timestamp, formatter, level):
+        super().__init__(level)
+        self.log_dir = log_dir
+        self.timestamp = timestamp
+        self.file_formatter = formatter
+        self.files = {}
+    
+    def emit(self, record):
+        site = getattr(record, "site", None)
+        handler = self.files.get(site)
+        if handler is None:
+            suffix = f"_{site}" if site else ""
+            handler = logging.FileHandler(os.path.join(
+                self.log_dir, f"production_test_{self.timestamp}{suffix}.log"
+            ))
+            handler.setFormatter(self.file_formatter)
+            self.files[site] = handler
+        handler.emit(record)
+    
+    def close(self):
+        for handler in self.files.values():
+            handler.close()
+        super().close()
+
+class SiteLoggerAdapter(logging.LoggerAdapter):
+    """Attach the test site to every record, keeping caller extra fields"""
+    
+    def process(self, msg, kwargs):
+        extra = dict(kwargs.get("extra") or {})
+        extra["site"] = self.extra["site"]
+        kwargs["extra"] = extra
+        return msg, kwargs
+
+def start_pipeline(config):
+    """Start the queue listener once per process and return the queue"""
+    global _listener, _log_queue
+    
+    with _pipeline_lock:
+        if _listener:
+            return _log_queue
+        
+        log_dir = config["output"]["log_directory"]
+        os.makedirs(log_dir, exist_ok=True)
+        
+        console_level, file_level = VERBOSITY_LEVELS.get(
+            config.get("log_verbosity", "normal"), VERBOSITY_LEVELS["normal"]
+        )
+        text_formatter = SiteFormatter()
+        
+        if config["output"].get("log_format", "text") == "json":
+            file_formatter = StructuredFormatter()
+        else:
+            file_formatter = text_formatter
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_router = SiteFileRouter(log_dir, timestamp, file_formatter, file_level)
+        
+        console = logging.StreamHandler()
+        console.setLevel(console_level)
+        console.setFormatter(text_formatter)
+        
+        _log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(
+            _log_queue, file_router, console, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(stop_pipeline)
+        
+        logger = logging.getLogger("axioma.production")
+        logger.setLevel(min(console_level, file_level))
+        logger.propagate = False
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+        
+        return _log_queue
+
+def stop_pipeline():
+    """Drain the queue and close all log files"""
+    global _listener
+    
+    with _pipeline_lock:
+        if _listener:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+def get_logger(config, site=None):
+    """Return a non-blocking logger for one tester (site may be None)"""
+    start_pipeline(config)
+    return SiteLoggerAdapter(logging.getLogger("axioma.production"), {"site": site})
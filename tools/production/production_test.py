@@ -12,9 +12,35 @@ Features:
 - Functional verification
 - Data logging for quality control
 - Integration with ATE systems
+- Multi-site parallel testing (one thread per site), with shared
+  instruments locked only around the steps that use them
+- Stop-on-first-fail and adaptive (failure-rate ordered) test sequencing
+- Declarative test blocks from a test program file (test_program.json)
+- Streaming per-lot SPC with drift alerts and dynamic PAT limits (spc.py)
 
 Usage:
     python3 production_test.py --config production_config.json
+    python3 production_test.py --stats --trace session.axtrace
+
+"serial_port" may be a device path or any pyserial URL, e.g. the
+socket:// URL of the simulated DUT (tools/common/axioma_dut_sim.py), or a
+replay:// URL playing back a session recorded with --trace
+(tools/common/axioma_replay.py).
+
+Multi-site mode is enabled by adding a "sites" list to the configuration,
+each entry overriding the per-site connection settings:
+
+    "sites": [
+        {"name": "SITE0", "serial_port": "/dev/ttyUSB0"},
+        {"name": "SITE1", "serial_port": "/dev/ttyUSB1"}
+    ]
+
+Commands driving instruments shared by all sites (see "shared_resources",
+tools/production/instrument_locks.py) are serialized across sites; all
+other test steps of different sites run concurrently. The "conditions"
+block (SET:VOLTAGE/TEMPERATURE/FREQUENCY from test_voltage,
+test_temperature and test_frequency) is optional: it only runs when
+"tests_enabled" has "conditions": true.
 
 © 2025 AxiomaCore Project
 Licensed under Apache 2.0
@@ -23,21 +49,201 @@ Licensed under Apache 2.0
 import argparse
 import json
 import time
-import serial
 import csv
 import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, timezone
 import logging
 
+try:
+    import numpy as np
+except ImportError:
+    # Bulk ADC analysis needs NumPy; single-sample checks still work
+    np = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from axioma_replay import serial_for_url
+from axioma_transport import FRAME_U16, Instrumentation, SerialTransport
+from instrument_locks import DEFAULT_SHARED_RESOURCES, InstrumentLockManager
+from results_store import ResultsStore
+from spc import SPCMonitor
+from test_program import compile_program, load_program
+from production_logging import get_logger
+
+# Soft bin assigned to the first failing test block (bin 1 is good parts)
+SOFT_BINS = {
+    "pass": 1,
+    "power_on": 2,
+    "digital_io": 3,
+    "analog": 4,
+    "communication": 5,
+    "timers": 6,
+    "memory": 7,
+    "parametric": 8,
+    "contact": 9,
+    "error": 10,
+    "pat": 11,
+    "conditions": 12
+}
+
+# Parametric measurement -> (low, high) spec limit keys in config["limits"]
+PARAMETRIC_LIMITS = {
+    "supply_current": (None, "max_current"),
+    "supply_voltage": ("min_voltage", "max_voltage"),
+    "frequency": ("min_frequency", None)
+}
+
+# Tests implemented as ProductionTester methods; the rest come from the test program
+BUILTIN_TESTS = {
+    "power_on": "test_power_on_reset",
+    "digital_io": "test_digital_io",
+    "analog": "test_analog_functions",
+    "parametric": "test_parametric"
+}
+
+ADC_BITS = 10
+
+def adc_noise_stats(samples):
+    """Mean, RMS noise and range of one channel's DC samples (in LSB)"""
+    samples = np.asarray(samples, dtype=np.float64)
+    return {
+        "mean": float(samples.mean()),
+        "noise_rms": float(samples.std()),
+        "min": int(samples.min()),
+        "max": int(samples.max()),
+        "samples": int(samples.size)
+    }
+
+def adc_linearity(codes, bits=ADC_BITS):
+    """Code-density DNL/INL (in LSB) and missing codes of a full-scale ramp
+    
+    The end codes also collect out-of-range input, so only the inner
+    codes are used. INL is end-point corrected.
+    """
+    histogram = np.bincount(np.asarray(codes, dtype=np.intp), minlength=2 ** bits)
+    inner = histogram[1:2 ** bits - 1].astype(np.float64)
+    
+    dnl = inner / inner.mean() - 1.0
+    inl = np.cumsum(dnl)
+    inl -= np.linspace(inl[0], inl[-1], inl.size)
+    missing = np.flatnonzero(inner == 0) + 1
+    
+    return {
+        "dnl_min": float(dnl.min()),
+        "dnl_max": float(dnl.max()),
+        "inl_min": float(inl.min()),
+        "inl_max": float(inl.max()),
+        "missing_codes": missing.tolist(),
+        "hits_per_code": float(inner.mean())
+    }
+
+class AdaptiveTestScheduler:
+    """Orders test blocks by historical failure rate, most likely first
+    
+    Rates come from the Tests_Executed / Failed_Tests columns of the
+    results CSV and are updated in memory after every unit. Blocks listed
+    in pinned keep their position at the front of the sequence.
+    """
+    
+    def __init__(self, csv_file=None, history=5000, pinned=("power_on", "conditions")):
+        self.pinned = tuple(pinned)
+        self.executed = {}
+        self.failed = {}
+        
+        if csv_file and os.path.exists(csv_file):
+            self.load_history(csv_file, history)
+    
+    def load_history(self, csv_file, history):
+        """Load executed/failed counts from the last rows of the CSV"""
+        with open(csv_file, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if 'Tests_Executed' not in header or 'Failed_Tests' not in header:
+                return
+            
+            executed_col = header.index('Tests_Executed')
+            failed_col = header.index('Failed_Tests')
+            rows = deque(reader, maxlen=history)
+        
+        for row in rows:
+            if len(row) <= max(executed_col, failed_col):
+                continue
+            self.record(
+                [t for t in row[executed_col].split(';') if t],
+                [t for t in row[failed_col].split(';') if t]
+            )
+    
+    def record(self, executed_tests, failed_tests):
+        """Add one unit's outcome to the running counts"""
+        for test_name in executed_tests:
+            self.executed[test_name] = self.executed.get(test_name, 0) + 1
+        for test_name in failed_tests:
+            self.failed[test_name] = self.failed.get(test_name, 0) + 1
+    
+    def failure_rate(self, test_name):
+        """Laplace-smoothed failure rate so unseen tests are not starved"""
+        return (self.failed.get(test_name, 0) + 1) / (self.executed.get(test_name, 0) + 2)
+    
+    def order(self, test_functions):
+        """Return test_functions with pinned tests first, then by failure rate"""
+        pinned = [t for t in test_functions if t[0] in self.pinned]
+        others = [t for t in test_functions if t[0] not in self.pinned]
+        # sorted() is stable, so ties keep the default order
+        others = sorted(others, key=lambda t: -self.failure_rate(t[0]))
+        return pinned + others
+
 class ProductionTester:
     """Production test controller for AxiomaCore-328"""
     
-    def __init__(self, config_file):
-        """Initialize with configuration file"""
+    def __init__(self, config_file, site=None, overrides=None, results_store=None,
+                 spc_monitor=None, instrument_locks=None):
+        """Initialize with configuration file and optional site overrides
+        
+        results_store and spc_monitor may be shared between testers
+        (multi-site); when omitted the tester creates and owns its own.
+        instrument_locks (an InstrumentLockManager shared by all sites)
+        serializes the commands that drive shared instruments.
+        """
         self.config = self.load_config(config_file)
+        self.site_name = None
+        
+        if overrides:
+            self.config = dict(self.config, **overrides)
+        
+        if site:
+            self.site_name = site.get("name", "SITE0")
+            self.config = dict(self.config)
+            self.config.update({k: v for k, v in site.items() if k != "name"})
+        
         self.setup_logging()
         
+        # Adaptive ordering learns from the results CSV of previous units
+        self.scheduler = None
+        if self.config.get("adaptive_ordering", False):
+            self.scheduler = AdaptiveTestScheduler(
+                os.path.join(self.config["output"]["log_directory"],
+                             self.config["output"]["csv_file"]),
+                history=self.config.get("adaptive_history", 5000)
+            )
+        
+        self.owns_results_store = results_store is None
+        self.results_store = results_store or ResultsStore.from_config(self.config)
+        
+        # Streaming SPC / PAT on the parametric measurements of the lot
+        self.owns_spc = spc_monitor is None
+        self.spc = spc_monitor
+        if self.spc is None and self.config.get("spc", {}).get("enabled", True):
+            self.spc = SPCMonitor.from_config(self.config)
+        
+        self.instrument_locks = instrument_locks
         self.serial_conn = None
+        self.transport = None
+        self.instrumentation = None
+        self.program = None
+        self.program_lot = None
         self.test_results = {}
         self.overall_result = "UNKNOWN"
         
@@ -45,8 +251,78 @@ class ProductionTester:
         self.tests_run = 0
         self.tests_passed = 0
         self.tests_failed = 0
-        
-    def load_config(self, config_file):
+    
+    @staticmethod
+    def default_config():
+        """Default test configuration"""
+        return {
+            "serial_port": "/dev/ttyUSB0",
+            "baudrate": 115200,
+            "timeout": 10,
+            "pipeline_depth": 16,
+            "binary_protocol": False,
+            "ready_deadline": 3.0,
+            "ready_poll_timeout": 0.05,
+            "presence_poll_interval": 0.2,
+            "removal_misses": 3,
+            "log_verbosity": "normal",
+            "stop_on_first_fail": False,
+            "adaptive_ordering": False,
+            "adaptive_history": 5000,
+            "test_voltage": 1.8,
+            "test_frequency": 16,
+            "test_temperature": 25,
+            "limits": {
+                "min_frequency": 16.0,
+                "max_current": 4.0,
+                "min_voltage": 1.6,
+                "max_voltage": 2.0
+            },
+            "tests_enabled": {
+                "power_on": True,
+                "conditions": False,
+                "digital_io": True,
+                "analog": True,
+                "communication": True,
+                "timers": True,
+                "memory": True,
+                "parametric": True
+            },
+            "analog": {
+                "bulk_samples": 0,
+                "ramp_samples": 16384,
+                "max_noise_rms": 2.0,
+                "max_dnl": 0.9,
+                "max_inl": 2.0,
+                "max_missing_codes": 0
+            },
+            "spc": {
+                "enabled": True,
+                "baseline_units": 30,
+                "pat": False,
+                "pat_sigma": 6.0,
+                "pat_min_units": 30,
+                "persist": True,
+                "save_every": 50
+            },
+            "test_program": "test_program.json",
+            "shared_resources": DEFAULT_SHARED_RESOURCES,
+            "lot_id": "DEFAULT",
+            "output": {
+                "log_directory": "production_logs",
+                "csv_file": "production_results.csv",
+                "detailed_logs": True,
+                "fsync_every": 50,
+                "fsync_interval": 5.0,
+                "rotate_bytes": 67108864,
+                "rotate_per_lot": True,
+                "results_db": "production_results.db",
+                "log_format": "text"
+            }
+        }
+    
+    @staticmethod
+    def load_config(config_file):
         """Load test configuration"""
         try:
             with open(config_file, 'r') as f:
@@ -54,34 +330,7 @@ class ProductionTester:
             return config
         except FileNotFoundError:
             # Create default configuration
-            default_config = {
-                "serial_port": "/dev/ttyUSB0",
-                "baudrate": 115200,
-                "timeout": 10,
-                "test_voltage": 1.8,
-                "test_frequency": 16,
-                "test_temperature": 25,
-                "limits": {
-                    "min_frequency": 16.0,
-                    "max_current": 4.0,
-                    "min_voltage": 1.6,
-                    "max_voltage": 2.0
-                },
-                "tests_enabled": {
-                    "power_on": True,
-                    "digital_io": True,
-                    "analog": True,
-                    "communication": True,
-                    "timers": True,
-                    "memory": True,
-                    "parametric": True
-                },
-                "output": {
-                    "log_directory": "production_logs",
-                    "csv_file": "production_results.csv",
-                    "detailed_logs": True
-                }
-            }
+            default_config = ProductionTester.default_config()
             
             with open(config_file, 'w') as f:
                 json.dump(default_config, f, indent=2)
@@ -89,45 +338,89 @@ class ProductionTester:
             print(f"Created default config: {config_file}")
             return default_config
     
+    def compiled_program(self):
+        """Test program compiled for the current lot
+        
+        Limits and patterns are resolved once and reused for every unit
+        until the lot changes.
+        """
+        lot = self.config.get("lot_id", "DEFAULT")
+        if self.program is None or lot != self.program_lot:
+            path = self.config.get("test_program", "test_program.json")
+            if not os.path.isabs(path) and not os.path.exists(path):
+                path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+            
+            self.program = compile_program(load_program(path), self.config, BUILTIN_TESTS)
+            self.program_lot = lot
+            self.logger.info(f"Test program compiled for lot {lot}: {path}")
+        
+        return self.program
+    
     def setup_logging(self):
-        """Setup logging system"""
-        log_dir = self.config["output"]["log_directory"]
-        os.makedirs(log_dir, exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = os.path.join(log_dir, f"production_test_{timestamp}.log")
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
+        """Attach this tester to the non-blocking logging pipeline"""
+        self.logger = get_logger(self.config, self.site_name)
+        self.logger.info("Production test system initialized")
+    
+    def log_items(self, block, items):
+        """Per-port / per-channel results, emitted only at debug verbosity"""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        for name, item in items.items():
+            self.logger.debug(f"  {block}.{name}: {item['status']}", extra={
+                "event": "item_result", "test": block, "item": name,
+                "status": item["status"]
+            })
+    
+    def open_port(self):
+        """Open the serial port without probing for a device"""
+        self.serial_conn = serial_for_url(
+            self.config["serial_port"],
+            self.config["baudrate"],
+            timeout=self.config["timeout"]
+        )
+        self.transport = SerialTransport(
+            self.serial_conn,
+            self.config.get("pipeline_depth", 1),
+            binary=self.config.get("binary_protocol", False)
         )
+        if self.instrumentation:
+            self.transport.add_observer(self.instrumentation)
+    
+    def enable_instrumentation(self, trace_file=None):
+        """Time every command on this tester's connections
         
-        self.logger = logging.getLogger(__name__)
-        self.logger.info("Production test system initialized")
+        Statistics accumulate across reconnects. With trace_file, the raw
+        session is also written as a binary trace (one file per site).
+        """
+        if trace_file and self.site_name:
+            root, ext = os.path.splitext(trace_file)
+            trace_file = f"{root}_{self.site_name}{ext}"
+        
+        self.instrumentation = Instrumentation(trace_file)
+        if self.transport:
+            self.transport.add_observer(self.instrumentation)
+        return self.instrumentation
     
     def connect_device(self):
         """Connect to device under test"""
         try:
-            self.serial_conn = serial.Serial(
-                self.config["serial_port"],
-                self.config["baudrate"],
-                timeout=self.config["timeout"]
-            )
-            time.sleep(2)  # Allow reset
+            self.open_port()
+            
+            # Poll until the device answers instead of a fixed reset delay
+            response, latency = self.wait_until_ready()
+            self.test_results["boot_latency"] = {
+                "value": round(latency * 1000, 3),
+                "unit": "ms"
+            }
             
-            # Verify communication
-            response = self.send_command("*IDN?")
-            if "AxiomaCore-328" in response:
-                self.logger.info(f"Connected to device: {response}")
+            if response:
+                self.logger.info(f"Connected to device: {response} ({latency * 1000:.1f} ms)")
                 return True
             else:
-                self.logger.error(f"Device not recognized: {response}")
+                self.logger.error(f"Device not recognized after {latency:.2f}s")
                 return False
-                
+        
         except Exception as e:
             self.logger.error(f"Connection failed: {e}")
             return False
@@ -137,42 +430,99 @@ class ProductionTester:
         if self.serial_conn and self.serial_conn.is_open:
             self.serial_conn.close()
             self.logger.info("Device disconnected")
+        self.transport = None
     
     def send_command(self, command):
         """Send command to device"""
-        if not self.serial_conn:
+        if not self.transport:
+            raise Exception("No device connection")
+        
+        if self.instrument_locks:
+            return self.send_batch([command])[0]
+        return self.transport.send_command(command)
+    
+    def send_batch(self, commands):
+        """Send several commands, pipelined, and return responses in order
+        
+        With shared instrument locks, the commands driving a shared
+        instrument are sent while its lock is held and the rest unlocked.
+        """
+        if not self.transport:
+            raise Exception("No device connection")
+        
+        if self.instrument_locks:
+            return self.instrument_locks.send_batch(self.transport.send_batch, commands)
+        return self.transport.send_batch(commands)
+    
+    def wait_until_ready(self):
+        """Poll *IDN? until the device answers or the ready deadline passes"""
+        if not self.transport:
             raise Exception("No device connection")
         
-        self.serial_conn.write((command + '\n').encode())
-        response = self.serial_conn.readline().decode().strip()
-        return response
+        return self.transport.wait_until_ready(
+            deadline=self.config.get("ready_deadline", 3.0),
+            poll_timeout=self.config.get("ready_poll_timeout", 0.05)
+        )
+    
+    def wait_for_insertion(self):
+        """Block until a DUT answers the presence probe on the open port"""
+        poll_interval = self.config.get("presence_poll_interval", 0.2)
+        
+        while True:
+            response, _ = self.transport.wait_until_ready(
+                deadline=poll_interval,
+                poll_timeout=self.config.get("ready_poll_timeout", 0.05)
+            )
+            if response:
+                self.logger.info(f"DUT inserted: {response}")
+                return response
+    
+    def wait_for_removal(self):
+        """Block until the DUT misses several consecutive presence probes"""
+        poll_interval = self.config.get("presence_poll_interval", 0.2)
+        required_misses = self.config.get("removal_misses", 3)
+        misses = 0
+        
+        while misses < required_misses:
+            response, elapsed = self.transport.wait_until_ready(
+                deadline=poll_interval,
+                poll_timeout=self.config.get("ready_poll_timeout", 0.05)
+            )
+            if response:
+                misses = 0
+                time.sleep(max(0.0, poll_interval - elapsed))
+            else:
+                misses += 1
+        
+        # The next DUT starts in line mode
+        self.transport.binary = False
+        self.logger.info("DUT removed")
     
     def test_power_on_reset(self):
         """Test power-on reset functionality"""
         self.logger.info("Testing power-on reset...")
         
         try:
-            # Send reset command
-            self.send_command("RESET")
-            time.sleep(1)
+            # Send reset command and poll until the device is back
+            self.transport.write_command("RESET")
+            response, latency = self.wait_until_ready()
+            reset_latency = {"value": round(latency * 1000, 3), "unit": "ms"}
             
-            # Check if device responds after reset
-            response = self.send_command("*IDN?")
-            
-            if "AxiomaCore-328" in response:
+            if response:
                 self.test_results["power_on_reset"] = {
                     "status": "PASS",
-                    "response_time": "< 1s",
+                    "reset_latency": reset_latency,
                     "details": "Reset successful"
                 }
                 return True
             else:
                 self.test_results["power_on_reset"] = {
                     "status": "FAIL",
-                    "details": f"No response after reset: {response}"
+                    "reset_latency": reset_latency,
+                    "details": "No response after reset"
                 }
                 return False
-                
+        
         except Exception as e:
             self.test_results["power_on_reset"] = {
                 "status": "FAIL",
@@ -190,38 +540,56 @@ class ProductionTester:
         # Test GPIO ports
         ports = ['B', 'C', 'D']
         
+        # Queue the whole sequence for all ports as one pipelined batch
+        commands = []
         for port in ports:
-            try:
-                # Test output functionality
-                self.send_command(f"GPIO:{port}:DIR OUTPUT")
-                self.send_command(f"GPIO:{port}:OUT 0xFF")
-                result_high = self.send_command(f"GPIO:{port}:IN?")
-                
-                self.send_command(f"GPIO:{port}:OUT 0x00")
-                result_low = self.send_command(f"GPIO:{port}:IN?")
-                
-                # Basic functionality check
-                if "0xFF" in result_high and "0x00" in result_low:
-                    io_results[f"PORT{port}"] = {
-                        "status": "PASS",
-                        "high_value": result_high,
-                        "low_value": result_low
-                    }
-                else:
-                    io_results[f"PORT{port}"] = {
-                        "status": "FAIL",
-                        "high_value": result_high,
-                        "low_value": result_low
-                    }
-                    all_passed = False
-                    
-            except Exception as e:
+            commands.extend([
+                f"GPIO:{port}:DIR OUTPUT",
+                f"GPIO:{port}:OUT 0xFF",
+                f"GPIO:{port}:IN?",
+                f"GPIO:{port}:OUT 0x00",
+                f"GPIO:{port}:IN?"
+            ])
+        
+        try:
+            if self.transport.binary:
+                responses = self.read_ports_binary(ports)
+            else:
+                responses = self.send_batch(commands)
+        except Exception as e:
+            responses = None
+            batch_error = str(e)
+        
+        for index, port in enumerate(ports):
+            if responses is None:
                 io_results[f"PORT{port}"] = {
                     "status": "FAIL",
-                    "details": str(e)
+                    "details": batch_error
+                }
+                all_passed = False
+                continue
+            
+            port_responses = responses[index * 5:(index + 1) * 5]
+            result_high = port_responses[2]
+            result_low = port_responses[4]
+            
+            # Basic functionality check
+            if "0xFF" in result_high and "0x00" in result_low:
+                io_results[f"PORT{port}"] = {
+                    "status": "PASS",
+                    "high_value": result_high,
+                    "low_value": result_low
+                }
+            else:
+                io_results[f"PORT{port}"] = {
+                    "status": "FAIL",
+                    "high_value": result_high,
+                    "low_value": result_low
                 }
                 all_passed = False
         
+        self.log_items("digital_io", io_results)
+        
         self.test_results["digital_io"] = {
             "overall": "PASS" if all_passed else "FAIL",
             "ports": io_results
@@ -229,18 +597,59 @@ class ProductionTester:
         
         return all_passed
     
+    def read_ports_binary(self, ports):
+        """Digital I/O sequence with all ports driven at once (binary mode)
+        
+        Each read-back is a single GPIO:IN:ALL? frame. Returns responses
+        in the same per-port layout as the line-mode batch.
+        """
+        values = self.transport.query_batch(
+            [f"GPIO:{port}:DIR OUTPUT" for port in ports] +
+            [f"GPIO:{port}:OUT 0xFF" for port in ports] + ["GPIO:IN:ALL?"] +
+            [f"GPIO:{port}:OUT 0x00" for port in ports] + ["GPIO:IN:ALL?"]
+        )
+        high = values[2 * len(ports)]
+        low = values[-1]
+        if high is None or low is None:
+            raise Exception("No response to GPIO:IN:ALL?")
+        
+        responses = []
+        for index in range(len(ports)):
+            responses.extend(["OK", "OK", f"0x{high[index]:02X}", "OK", f"0x{low[index]:02X}"])
+        return responses
+    
     def test_analog_functions(self):
         """Test analog functions (ADC)"""
+        analog = dict(self.default_config()["analog"], **self.config.get("analog", {}))
+        if analog["bulk_samples"] and np is not None:
+            return self.test_analog_bulk(analog)
+        
         self.logger.info("Testing analog functions...")
         
         adc_results = {}
         all_passed = True
         
+        # Read all ADC channels (A0-A5) and the internal reference in one batch
+        channels = range(6)
+        try:
+            if self.transport.binary:
+                # All six channels arrive in one frame
+                codes, vref = self.transport.query_batch(["ADC:READ:ALL?", "ADC:VREF?"])
+                responses = list(codes) + [vref[0]]
+            else:
+                responses = self.send_batch(
+                    [f"ADC:READ {channel}" for channel in channels] + ["ADC:VREF?"]
+                )
+        except Exception as e:
+            responses = None
+            batch_error = str(e)
+        
         # Test ADC channels
-        for channel in range(6):  # A0-A5
+        for channel in channels:
             try:
-                reading = self.send_command(f"ADC:READ {channel}")
-                value = int(reading)
+                if responses is None:
+                    raise Exception(batch_error)
+                value = int(responses[channel])
                 
                 # Check if reading is in valid range (0-1023)
                 if 0 <= value <= 1023:
@@ -255,7 +664,7 @@ class ProductionTester:
                         "details": "Out of range"
                     }
                     all_passed = False
-                    
+            
             except Exception as e:
                 adc_results[f"ADC{channel}"] = {
                     "status": "FAIL",
@@ -265,8 +674,9 @@ class ProductionTester:
         
         # Test internal voltage reference
         try:
-            vref_reading = self.send_command("ADC:VREF?")
-            vref_value = float(vref_reading)
+            if responses is None:
+                raise Exception(batch_error)
+            vref_value = float(responses[len(channels)])
             
             if 1.0 < vref_value < 1.2:  # Expect ~1.1V internal reference
                 adc_results["VREF"] = {
@@ -280,7 +690,7 @@ class ProductionTester:
                     "details": "VREF out of spec"
                 }
                 all_passed = False
-                
+        
         except Exception as e:
             adc_results["VREF"] = {
                 "status": "FAIL",
@@ -288,6 +698,8 @@ class ProductionTester:
             }
             all_passed = False
         
+        self.log_items("analog", adc_results)
+        
         self.test_results["analog"] = {
             "overall": "PASS" if all_passed else "FAIL",
             "channels": adc_results
@@ -295,163 +707,151 @@ class ProductionTester:
         
         return all_passed
     
-    def test_communication(self):
-        """Test communication peripherals"""
-        self.logger.info("Testing communication...")
+    def read_adc_bulk(self, commands):
+        """Send ADC:BULK commands and return one sample array per command
+        
+        Binary frames are used as-is; line responses are parsed in one go.
+        Missing or non-numeric responses give None.
+        """
+        arrays = []
+        for response in self.transport.exchange(commands):
+            if isinstance(response, tuple):
+                frame_type, payload = response
+                arrays.append(np.frombuffer(payload, dtype='<u2') if frame_type == FRAME_U16 else None)
+                continue
+            try:
+                arrays.append(np.array(response.split(','), dtype=np.int32) if response else None)
+            except ValueError:
+                arrays.append(None)
+        return arrays
+    
+    def test_analog_bulk(self, analog):
+        """ADC screening from bulk acquisitions
+        
+        Thousands of samples per channel arrive in one response each; noise
+        and code-density linearity (from the internal ramp) are computed
+        with NumPy.
+        """
+        self.logger.info("Testing analog functions (bulk acquisition)...")
         
-        comm_results = {}
+        adc_results = {}
         all_passed = True
+        channels = range(6)
         
-        # Test UART
-        try:
-            uart_test = self.send_command("TEST:UART")
-            comm_results["UART"] = {
-                "status": "PASS" if uart_test == "PASS" else "FAIL",
-                "details": uart_test
-            }
-            if uart_test != "PASS":
-                all_passed = False
-        except Exception as e:
-            comm_results["UART"] = {"status": "FAIL", "details": str(e)}
-            all_passed = False
+        commands = [f"ADC:BULK {channel} {analog['bulk_samples']}" for channel in channels]
+        if analog["ramp_samples"]:
+            commands.append(f"ADC:BULK RAMP {analog['ramp_samples']}")
         
-        # Test SPI
         try:
-            spi_test = self.send_command("TEST:SPI")
-            comm_results["SPI"] = {
-                "status": "PASS" if spi_test == "PASS" else "FAIL",
-                "details": spi_test
-            }
-            if spi_test != "PASS":
-                all_passed = False
+            arrays = self.read_adc_bulk(commands)
+            vref_response = self.send_command("ADC:VREF?")
         except Exception as e:
-            comm_results["SPI"] = {"status": "FAIL", "details": str(e)}
-            all_passed = False
+            arrays = [None] * len(commands)
+            vref_response = str(e)
         
-        # Test I2C
-        try:
-            i2c_test = self.send_command("TEST:I2C")
-            comm_results["I2C"] = {
-                "status": "PASS" if i2c_test == "PASS" else "FAIL",
-                "details": i2c_test
-            }
-            if i2c_test != "PASS":
+        for channel in channels:
+            samples = arrays[channel]
+            if samples is None or not samples.size:
+                adc_results[f"ADC{channel}"] = {
+                    "status": "FAIL",
+                    "details": "No bulk samples"
+                }
+                all_passed = False
+                continue
+            
+            stats = adc_noise_stats(samples)
+            in_range = 0 <= stats["min"] and stats["max"] <= 2 ** ADC_BITS - 1
+            quiet = stats["noise_rms"] <= analog["max_noise_rms"]
+            adc_results[f"ADC{channel}"] = dict(
+                stats,
+                status="PASS" if in_range and quiet else "FAIL",
+                value=round(stats["mean"], 3),
+                unit="LSB"
+            )
+            if not quiet:
+                adc_results[f"ADC{channel}"]["details"] = "Noise above limit"
+                all_passed = False
+            elif not in_range:
+                adc_results[f"ADC{channel}"]["details"] = "Out of range"
                 all_passed = False
-        except Exception as e:
-            comm_results["I2C"] = {"status": "FAIL", "details": str(e)}
-            all_passed = False
-        
-        self.test_results["communication"] = {
-            "overall": "PASS" if all_passed else "FAIL",
-            "protocols": comm_results
-        }
-        
-        return all_passed
-    
-    def test_timers_pwm(self):
-        """Test timer and PWM functionality"""
-        self.logger.info("Testing timers and PWM...")
-        
-        timer_results = {}
-        all_passed = True
         
-        # Test Timer0
-        try:
-            timer0_test = self.send_command("TEST:TIMER0")
-            timer_results["Timer0"] = {
-                "status": "PASS" if timer0_test == "PASS" else "FAIL",
-                "details": timer0_test
-            }
-            if timer0_test != "PASS":
+        if analog["ramp_samples"]:
+            ramp = arrays[len(channels)]
+            if ramp is None or not ramp.size:
+                adc_results["LINEARITY"] = {
+                    "status": "FAIL",
+                    "details": "No ramp samples"
+                }
                 all_passed = False
-        except Exception as e:
-            timer_results["Timer0"] = {"status": "FAIL", "details": str(e)}
-            all_passed = False
+            else:
+                linearity = adc_linearity(ramp)
+                passed = (
+                    max(-linearity["dnl_min"], linearity["dnl_max"]) <= analog["max_dnl"] and
+                    max(-linearity["inl_min"], linearity["inl_max"]) <= analog["max_inl"] and
+                    len(linearity["missing_codes"]) <= analog["max_missing_codes"]
+                )
+                # Keep the record small when a part has many missing codes
+                linearity["missing_codes"] = linearity["missing_codes"][:32]
+                adc_results["LINEARITY"] = dict(linearity, status="PASS" if passed else "FAIL")
+                all_passed = all_passed and passed
         
-        # Test Timer1
         try:
-            timer1_test = self.send_command("TEST:TIMER1")
-            timer_results["Timer1"] = {
-                "status": "PASS" if timer1_test == "PASS" else "FAIL",
-                "details": timer1_test
+            vref_value = float(vref_response)
+            vref_ok = 1.0 < vref_value < 1.2  # Expect ~1.1V internal reference
+            adc_results["VREF"] = {
+                "status": "PASS" if vref_ok else "FAIL",
+                "voltage": vref_value
             }
-            if timer1_test != "PASS":
+            if not vref_ok:
+                adc_results["VREF"]["details"] = "VREF out of spec"
                 all_passed = False
-        except Exception as e:
-            timer_results["Timer1"] = {"status": "FAIL", "details": str(e)}
+        except ValueError:
+            adc_results["VREF"] = {
+                "status": "FAIL",
+                "details": vref_response or "No response"
+            }
             all_passed = False
         
-        # Test PWM channels
-        pwm_channels = [3, 5, 6, 9, 10, 11]
-        for channel in pwm_channels:
-            try:
-                pwm_test = self.send_command(f"TEST:PWM {channel}")
-                timer_results[f"PWM{channel}"] = {
-                    "status": "PASS" if pwm_test == "PASS" else "FAIL",
-                    "details": pwm_test
-                }
-                if pwm_test != "PASS":
-                    all_passed = False
-            except Exception as e:
-                timer_results[f"PWM{channel}"] = {"status": "FAIL", "details": str(e)}
-                all_passed = False
+        self.log_items("analog", adc_results)
         
-        self.test_results["timers"] = {
+        self.test_results["analog"] = {
             "overall": "PASS" if all_passed else "FAIL",
-            "components": timer_results
+            "channels": adc_results
         }
         
         return all_passed
     
-    def test_memory(self):
-        """Test memory functionality"""
-        self.logger.info("Testing memory...")
-        
-        memory_results = {}
-        all_passed = True
+    def test_enabled(self, test_name):
+        """True when test_name runs: tests_enabled, else on unless optional"""
+        block = self.program.blocks.get(test_name) if self.program else None
+        return self.config["tests_enabled"].get(test_name, not (block and block.optional))
+    
+    def run_program_block(self, block_name):
+        """Run one declarative block of the test program"""
+        block = self.program.blocks[block_name]
+        self.logger.info(f"Testing {block_name}...")
         
-        # Test SRAM
-        try:
-            sram_test = self.send_command("TEST:SRAM")
-            memory_results["SRAM"] = {
-                "status": "PASS" if sram_test == "PASS" else "FAIL",
-                "details": sram_test
+        # A disabled dependency does not block; one that failed or did not run does
+        executed = self.test_results["tests_executed"]
+        failed = self.test_results["failed_tests"]
+        blocked = [
+            d for d in block.depends_on
+            if d in failed or (d not in executed and self.test_enabled(d))
+        ]
+        if blocked:
+            self.test_results[block_name] = {
+                "overall": "FAIL",
+                "details": f"Blocked by {', '.join(blocked)}"
             }
-            if sram_test != "PASS":
-                all_passed = False
-        except Exception as e:
-            memory_results["SRAM"] = {"status": "FAIL", "details": str(e)}
-            all_passed = False
+            return False
         
-        # Test EEPROM
-        try:
-            eeprom_test = self.send_command("TEST:EEPROM")
-            memory_results["EEPROM"] = {
-                "status": "PASS" if eeprom_test == "PASS" else "FAIL",
-                "details": eeprom_test
-            }
-            if eeprom_test != "PASS":
-                all_passed = False
-        except Exception as e:
-            memory_results["EEPROM"] = {"status": "FAIL", "details": str(e)}
-            all_passed = False
+        all_passed, item_results = block.run(self.send_batch)
         
-        # Test Flash (read-only in production)
-        try:
-            flash_test = self.send_command("TEST:FLASH")
-            memory_results["FLASH"] = {
-                "status": "PASS" if flash_test == "PASS" else "FAIL",
-                "details": flash_test
-            }
-            if flash_test != "PASS":
-                all_passed = False
-        except Exception as e:
-            memory_results["FLASH"] = {"status": "FAIL", "details": str(e)}
-            all_passed = False
+        self.log_items(block_name, item_results)
         
-        self.test_results["memory"] = {
+        self.test_results[block_name] = {
             "overall": "PASS" if all_passed else "FAIL",
-            "types": memory_results
+            block.results_key: item_results
         }
         
         return all_passed
@@ -532,13 +932,58 @@ class ProductionTester:
             param_results["frequency"] = {"status": "FAIL", "details": str(e)}
             all_passed = False
         
+        spec_passed = all_passed
+        if self.spc and self.apply_spc(param_results):
+            all_passed = False
+        
         self.test_results["parametric"] = {
             "overall": "PASS" if all_passed else "FAIL",
             "measurements": param_results
         }
+        if spec_passed and not all_passed:
+            self.test_results["parametric"]["pat_outlier"] = True
         
         return all_passed
     
+    def apply_spc(self, param_results):
+        """Feed measurements to the lot SPC; returns True on a PAT outlier
+        
+        Outliers are marked FAIL in param_results. Western Electric rule
+        violations are logged as drift alerts.
+        """
+        lot = self.config.get("lot_id", "DEFAULT")
+        limits = self.config["limits"]
+        any_outlier = False
+        
+        for name, item in param_results.items():
+            if not isinstance(item.get("value"), (int, float)) or name not in PARAMETRIC_LIMITS:
+                continue
+            
+            low_key, high_key = PARAMETRIC_LIMITS[name]
+            outlier, pat_limits, alerts = self.spc.observe(
+                lot, name, item["value"],
+                low=limits.get(low_key) if low_key else None,
+                high=limits.get(high_key) if high_key else None
+            )
+            
+            if outlier:
+                any_outlier = True
+                item.update({
+                    "status": "FAIL",
+                    "details": "PAT outlier",
+                    "pat_limits": list(pat_limits)
+                })
+            
+            for rule in alerts:
+                self.logger.warning(
+                    f"SPC alert: {name} {rule} in lot {lot} (value {item['value']})",
+                    extra={"event": "spc_alert", "parameter": name, "rule": rule,
+                           "lot": lot, "value": item["value"]}
+                )
+        
+        self.spc.end_unit()
+        return any_outlier
+    
     def run_production_test(self, serial_number=None):
         """Run complete production test sequence"""
         test_start_time = datetime.now(timezone.utc)
@@ -552,83 +997,114 @@ class ProductionTester:
         # Initialize test results
         self.test_results = {
             "serial_number": serial_number or "UNKNOWN",
+            "site": self.site_name,
             "start_time": test_start_time.isoformat(),
             "config": self.config,
-            "tests": {}
+            "tests": {},
+            "tests_executed": [],
+            "failed_tests": []
         }
         
-        # Connect to device
-        if not self.connect_device():
+        # Connect to device unless a persistent connection is already open
+        owns_connection = self.transport is None
+        if owns_connection and not self.connect_device():
+            self.disconnect_device()
             self.overall_result = "FAIL"
             self.logger.error("Failed to connect to device")
+            
+            # Recorded like any other unit so yield and paretos count opens
+            self.test_results["tests_executed"].append("contact")
+            self.test_results["failed_tests"].append("contact")
+            self.finalize_results(test_start_time, SOFT_BINS["contact"])
+            self.save_results()
             return False
         
         try:
-            # Run enabled tests
+            # Run enabled tests: built-in methods plus program blocks
+            program = self.compiled_program()
             test_functions = [
-                ("power_on", self.test_power_on_reset),
-                ("digital_io", self.test_digital_io),
-                ("analog", self.test_analog_functions),
-                ("communication", self.test_communication),
-                ("timers", self.test_timers_pwm),
-                ("memory", self.test_memory),
-                ("parametric", self.test_parametric)
+                (name, getattr(self, BUILTIN_TESTS[name]) if name in BUILTIN_TESTS
+                 else partial(self.run_program_block, name))
+                for name in program.sequence
             ]
             
+            if self.scheduler:
+                test_functions = program.respect_dependencies(
+                    self.scheduler.order(test_functions)
+                )
+            
+            stop_on_first_fail = self.config.get("stop_on_first_fail", False)
             overall_pass = True
             
             for test_name, test_function in test_functions:
-                if self.config["tests_enabled"].get(test_name, True):
-                    self.tests_run += 1
-                    
-                    try:
-                        result = test_function()
-                        if result:
-                            self.tests_passed += 1
-                            self.logger.info(f"✓ {test_name}: PASS")
-                        else:
-                            self.tests_failed += 1
-                            overall_pass = False
-                            self.logger.error(f"✗ {test_name}: FAIL")
-                    except Exception as e:
+                if not self.test_enabled(test_name):
+                    self.logger.info(f"○ {test_name}: SKIPPED")
+                    continue
+                
+                if stop_on_first_fail and not overall_pass:
+                    self.logger.info(f"○ {test_name}: SKIPPED (stop on first fail)")
+                    continue
+                
+                self.tests_run += 1
+                self.test_results["tests_executed"].append(test_name)
+                
+                try:
+                    result = test_function()
+                    if result:
+                        self.tests_passed += 1
+                        self.logger.info(f"✓ {test_name}: PASS", extra={
+                            "event": "test_result", "test": test_name, "status": "PASS"
+                        })
+                    else:
                         self.tests_failed += 1
                         overall_pass = False
-                        self.logger.error(f"✗ {test_name}: ERROR - {e}")
-                        
-                        self.test_results[test_name] = {
-                            "status": "ERROR",
-                            "details": str(e)
-                        }
-                else:
-                    self.logger.info(f"○ {test_name}: SKIPPED")
+                        self.test_results["failed_tests"].append(test_name)
+                        self.logger.error(f"✗ {test_name}: FAIL", extra={
+                            "event": "test_result", "test": test_name, "status": "FAIL"
+                        })
+                except Exception as e:
+                    self.tests_failed += 1
+                    overall_pass = False
+                    self.test_results["failed_tests"].append(test_name)
+                    self.logger.error(f"✗ {test_name}: ERROR - {e}", extra={
+                        "event": "test_result", "test": test_name, "status": "ERROR"
+                    })
+                    
+                    self.test_results[test_name] = {
+                        "status": "ERROR",
+                        "details": str(e)
+                    }
+            
+            if self.scheduler:
+                self.scheduler.record(
+                    self.test_results["tests_executed"],
+                    self.test_results["failed_tests"]
+                )
             
             # Determine overall result
             self.overall_result = "PASS" if overall_pass else "FAIL"
-            
+        
         except Exception as e:
             self.overall_result = "ERROR"
             self.logger.error(f"Production test error: {e}")
-            
+        
         finally:
-            self.disconnect_device()
+            if owns_connection:
+                self.disconnect_device()
         
-        # Finalize test results
-        test_end_time = datetime.now(timezone.utc)
-        test_duration = (test_end_time - test_start_time).total_seconds()
-        
-        self.test_results.update({
-            "end_time": test_end_time.isoformat(),
-            "duration_seconds": test_duration,
-            "overall_result": self.overall_result,
-            "tests_run": self.tests_run,
-            "tests_passed": self.tests_passed,
-            "tests_failed": self.tests_failed
-        })
+        test_duration = self.finalize_results(test_start_time, self.assign_bin())
         
         # Log results
         self.logger.info("=" * 60)
-        self.logger.info("PRODUCTION TEST COMPLETE")
+        self.logger.info("PRODUCTION TEST COMPLETE", extra={
+            "event": "unit_complete",
+            "serial_number": self.test_results["serial_number"],
+            "result": self.overall_result,
+            "bin": self.test_results["bin"],
+            "duration_seconds": test_duration
+        })
         self.logger.info(f"Overall Result: {self.overall_result}")
+        self.logger.info(f"Bin: {self.test_results['bin']}")
         self.logger.info(f"Tests Run: {self.tests_run}")
         self.logger.info(f"Tests Passed: {self.tests_passed}")
         self.logger.info(f"Tests Failed: {self.tests_failed}")
@@ -640,48 +1116,229 @@ class ProductionTester:
         
         return self.overall_result == "PASS"
     
+    def finalize_results(self, test_start_time, bin_number):
+        """Fill in end time, result counters and bin; returns the duration"""
+        test_end_time = datetime.now(timezone.utc)
+        test_duration = (test_end_time - test_start_time).total_seconds()
+        
+        self.test_results.update({
+            "end_time": test_end_time.isoformat(),
+            "duration_seconds": test_duration,
+            "overall_result": self.overall_result,
+            "tests_run": self.tests_run,
+            "tests_passed": self.tests_passed,
+            "tests_failed": self.tests_failed,
+            "bin": bin_number
+        })
+        return test_duration
+    
+    def assign_bin(self):
+        """Assign soft bin from the first failing test block"""
+        if self.overall_result == "PASS":
+            return SOFT_BINS["pass"]
+        
+        failed_tests = self.test_results.get("failed_tests", [])
+        if failed_tests:
+            if (failed_tests[0] == "parametric" and
+                    self.test_results.get("parametric", {}).get("pat_outlier")):
+                return SOFT_BINS["pat"]
+            block = self.program.blocks.get(failed_tests[0]) if self.program else None
+            if block and block.soft_bin:
+                return block.soft_bin
+            return SOFT_BINS.get(failed_tests[0], SOFT_BINS["error"])
+        
+        return SOFT_BINS["error"]
+    
+    def log_spc_summary(self, logger=None):
+        """Log the lot statistics of every parametric measurement
+        
+        logger defaults to this tester's (site-tagged) logger.
+        """
+        logger = logger or self.logger
+        for name, summary in self.spc.summary().items():
+            cpk = f"{summary['cpk']:.2f}" if summary["cpk"] is not None else "n/a"
+            logger.info(
+                f"SPC {name}: n={summary['count']} mean={summary['mean']:.4g} "
+                f"std={summary['std']:.3g} Cpk={cpk} PAT outliers={summary['pat_outliers']}",
+                extra={"event": "spc_summary", "parameter": name, **summary}
+            )
+    
     def save_results(self):
-        """Save test results to files"""
-        output_dir = self.config["output"]["log_directory"]
+        """Append test results to the results store"""
+        log_file = self.results_store.append(
+            self.test_results,
+            self.config,
+            lot=self.config.get("lot_id", "DEFAULT")
+        )
+        
+        if log_file:
+            self.logger.info(f"Detailed results appended to: {log_file}")
+    
+    def close(self):
+        """Flush buffered results and release the results store"""
+        if self.spc and self.owns_spc:
+            self.log_spc_summary()
+            self.spc.close()
+        if self.owns_results_store:
+            self.results_store.close()
+        else:
+            self.results_store.flush()
+        if self.instrumentation:
+            self.instrumentation.close()
+
+class MultiSiteTester:
+    """Runs the production test sequence concurrently on every site"""
+    
+    def __init__(self, config_file, overrides=None):
+        """Create one ProductionTester per configured site"""
+        self.config = ProductionTester.load_config(config_file)
         
-        # Save detailed JSON results
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        json_file = os.path.join(output_dir, f"test_results_{timestamp}.json")
+        if overrides:
+            self.config = dict(self.config, **overrides)
         
-        with open(json_file, 'w') as f:
-            json.dump(self.test_results, f, indent=2)
+        # One store for all sites: a single log and CSV per lot
+        self.results_store = ResultsStore.from_config(self.config)
         
-        self.logger.info(f"Detailed results saved: {json_file}")
+        # One SPC state per lot, fed by every site
+        self.spc = None
+        if self.config.get("spc", {}).get("enabled", True):
+            self.spc = SPCMonitor.from_config(self.config)
         
-        # Append to CSV summary
-        csv_file = os.path.join(output_dir, self.config["output"]["csv_file"])
+        # Supply, chamber, ... are shared: lock them only while in use
+        self.instrument_locks = InstrumentLockManager(self.config.get("shared_resources"))
         
-        file_exists = os.path.exists(csv_file)
+        sites = self.config.get("sites") or [{"name": "SITE0"}]
+        self.testers = []
+        for index, site in enumerate(sites):
+            site = dict(site)
+            site.setdefault("name", f"SITE{index}")
+            self.testers.append(ProductionTester(
+                config_file, site=site, overrides=overrides,
+                results_store=self.results_store,
+                spc_monitor=self.spc,
+                instrument_locks=self.instrument_locks
+            ))
         
-        with open(csv_file, 'a', newline='') as f:
-            writer = csv.writer(f)
+        self.logger = get_logger(self.config)
+        
+        # Per-site statistics accumulated across touchdowns
+        self.site_stats = {
+            tester.site_name: {"tested": 0, "passed": 0, "bins": {}}
+            for tester in self.testers
+        }
+    
+    def run_production_test(self, serial_numbers=None):
+        """Run one touchdown: test every site in parallel"""
+        serial_numbers = serial_numbers or {}
+        site_results = {}
+        
+        with ThreadPoolExecutor(max_workers=len(self.testers)) as executor:
+            futures = {
+                tester.site_name: executor.submit(
+                    tester.run_production_test,
+                    serial_numbers.get(tester.site_name)
+                )
+                for tester in self.testers
+            }
+        
+        for tester in self.testers:
+            try:
+                passed = futures[tester.site_name].result()
+                bin_number = tester.test_results.get("bin", SOFT_BINS["error"])
+            except Exception as e:
+                self.logger.error(f"[{tester.site_name}] Site error: {e}")
+                passed = False
+                bin_number = SOFT_BINS["error"]
             
-            # Write header if new file
-            if not file_exists:
-                writer.writerow([
-                    'Timestamp', 'Serial_Number', 'Overall_Result',
-                    'Tests_Run', 'Tests_Passed', 'Tests_Failed',
-                    'Duration_Seconds', 'Details_File'
-                ])
+            stats = self.site_stats[tester.site_name]
+            stats["tested"] += 1
+            stats["passed"] += 1 if passed else 0
+            stats["bins"][bin_number] = stats["bins"].get(bin_number, 0) + 1
             
-            # Write test summary
-            writer.writerow([
-                self.test_results["start_time"],
-                self.test_results["serial_number"],
-                self.test_results["overall_result"],
-                self.test_results["tests_run"],
-                self.test_results["tests_passed"],
-                self.test_results["tests_failed"],
-                self.test_results["duration_seconds"],
-                json_file
-            ])
+            site_results[tester.site_name] = {
+                "serial_number": tester.test_results.get("serial_number"),
+                "result": "PASS" if passed else "FAIL",
+                "bin": bin_number,
+                "duration_seconds": tester.test_results.get("duration_seconds")
+            }
+        
+        return site_results
+    
+    def for_each_site(self, method):
+        """Call a ProductionTester method on every site in parallel"""
+        with ThreadPoolExecutor(max_workers=len(self.testers)) as executor:
+            futures = [executor.submit(getattr(tester, method)) for tester in self.testers]
+        return [future.result() for future in futures]
+    
+    def open_ports(self):
+        """Open every site's port once for a continuous session"""
+        for tester in self.testers:
+            tester.open_port()
+    
+    def disconnect(self):
+        """Close every site's port"""
+        for tester in self.testers:
+            tester.disconnect_device()
+    
+    def wait_for_insertion(self):
+        """Block until a DUT answers the presence probe on every site"""
+        return self.for_each_site("wait_for_insertion")
+    
+    def wait_for_removal(self):
+        """Block until the DUT is removed from every site"""
+        self.for_each_site("wait_for_removal")
+    
+    def enable_instrumentation(self, trace_file=None):
+        """Enable command timing (and optional tracing) on every site"""
+        for tester in self.testers:
+            tester.enable_instrumentation(trace_file)
+    
+    def close(self):
+        """Flush and close the shared results store"""
+        self.results_store.close()
+        if self.spc:
+            # The lot summary covers every site: log it without a site tag
+            self.testers[0].log_spc_summary(self.logger)
+            self.spc.close()
+        for tester in self.testers:
+            if tester.instrumentation:
+                tester.instrumentation.close()
+    
+    def yield_summary(self):
+        """Per-site and combined yield across all touchdowns"""
+        total_tested = sum(s["tested"] for s in self.site_stats.values())
+        total_passed = sum(s["passed"] for s in self.site_stats.values())
+        
+        combined_bins = {}
+        for stats in self.site_stats.values():
+            for bin_number, count in stats["bins"].items():
+                combined_bins[bin_number] = combined_bins.get(bin_number, 0) + count
+        
+        return {
+            "sites": {
+                name: dict(stats, yield_percent=(stats["passed"] / stats["tested"]) * 100
+                           if stats["tested"] else 0.0)
+                for name, stats in self.site_stats.items()
+            },
+            "tested": total_tested,
+            "passed": total_passed,
+            "yield_percent": (total_passed / total_tested) * 100 if total_tested else 0.0,
+            "bins": combined_bins
+        }
+    
+    def print_summary(self):
+        """Print per-site and combined yield"""
+        summary = self.yield_summary()
+        for name, stats in summary["sites"].items():
+            print(f"  {name}: {stats['passed']}/{stats['tested']} "
+                  f"({stats['yield_percent']:.1f}%) bins={stats['bins']}")
+        print(f"  Combined: {summary['passed']}/{summary['tested']} "
+              f"({summary['yield_percent']:.1f}%) bins={summary['bins']}")
         
-        self.logger.info(f"Summary appended to: {csv_file}")
+        for resource, stats in self.instrument_locks.summary().items():
+            if stats["acquisitions"]:
+                print(f"  Shared {resource}: {stats['acquisitions']} uses, "
+                      f"waited {stats['wait_seconds']:.3f}s, held {stats['hold_seconds']:.3f}s")
 
 def main():
     """Main function for production testing"""
@@ -697,48 +1354,206 @@ def main():
         '--serial',
         help='Device serial number'
     )
+    parser.add_argument(
+        '--lot',
+        help='Lot identifier (results log rotates per lot)'
+    )
     parser.add_argument(
         '--continuous',
         action='store_true',
         help='Run in continuous mode'
     )
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help='Stop testing a unit at its first failing block'
+    )
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Run the blocks most likely to fail first (from CSV history)'
+    )
+    parser.add_argument(
+        '--handler-fifo',
+        help='Named pipe where the handler writes a line at start of test '
+             '(continuous mode; default is DUT presence polling)'
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Print per-command latency statistics at the end'
+    )
+    parser.add_argument(
+        '--trace',
+        help='Write a binary trace of the serial session to this file'
+    )
     
     args = parser.parse_args()
     
+    # Command line switches take precedence over the configuration file
+    overrides = {}
+    if args.fail_fast:
+        overrides["stop_on_first_fail"] = True
+    if args.adaptive:
+        overrides["adaptive_ordering"] = True
+    if args.lot:
+        overrides["lot_id"] = args.lot
+    
+    config = ProductionTester.load_config(args.config)
+    if config.get("sites"):
+        run_multisite(args, overrides)
+        return
+    
     # Create production tester
-    tester = ProductionTester(args.config)
+    tester = ProductionTester(args.config, overrides=overrides)
+    if args.stats or args.trace:
+        tester.enable_instrumentation(args.trace)
+    
+    if args.continuous:
+        run_continuous(tester, args)
+    
+    else:
+        # Single test mode
+        result = tester.run_production_test(args.serial)
+        tester.close()
+        print_instrumentation([tester], args)
+        
+        if result:
+            print("\n✅ PRODUCTION TEST PASSED")
+            exit(0)
+        else:
+            print("\n❌ PRODUCTION TEST FAILED")
+            exit(1)
+
+def wait_for_handler_start(handler_fifo):
+    """Block until the handler (or a local stand-in) signals start of test"""
+    with open(handler_fifo, 'r') as fifo:
+        return fifo.readline().strip()
+
+def run_continuous(tester, args):
+    """Continuous mode over one persistent connection
+    
+    The port stays open for the whole session. Each cycle waits for a DUT
+    to answer the presence probe (or for a handler start-of-test signal),
+    tests it and waits for it to be removed before the next cycle.
+    """
+    print("Continuous testing mode - Press Ctrl+C to stop")
+    test_count = 0
+    pass_count = 0
+    
+    tester.open_port()
+    
+    try:
+        while True:
+            if args.handler_fifo:
+                print("Waiting for handler start-of-test...")
+                wait_for_handler_start(args.handler_fifo)
+            else:
+                print("Waiting for device...")
+                tester.wait_for_insertion()
+            
+            test_count += 1
+            serial_number = f"AUTO_{test_count:06d}"
+            
+            print(f"\n--- Test #{test_count} ---")
+            result = tester.run_production_test(serial_number)
+            
+            if result:
+                pass_count += 1
+                print(f"✓ PASS - Running yield: {pass_count}/{test_count} ({(pass_count/test_count)*100:.1f}%)")
+            else:
+                print(f"✗ FAIL - Running yield: {pass_count}/{test_count} ({(pass_count/test_count)*100:.1f}%)")
+            
+            if not args.handler_fifo:
+                tester.wait_for_removal()
+    
+    except KeyboardInterrupt:
+        if test_count:
+            print(f"\nTesting stopped. Final yield: {pass_count}/{test_count} ({(pass_count/test_count)*100:.1f}%)")
+        else:
+            print("\nTesting stopped.")
+    
+    finally:
+        tester.disconnect_device()
+        tester.close()
+        print_instrumentation([tester], args)
+
+def print_instrumentation(testers, args):
+    """Print command statistics for instrumented testers"""
+    if not args.stats:
+        return
+    
+    for tester in testers:
+        if tester.instrumentation:
+            title = f"Command statistics ({tester.site_name})" if tester.site_name else "Command statistics"
+            print(f"\n{title}")
+            print(tester.instrumentation.format_report())
+
+def run_multisite(args, overrides=None):
+    """Multi-site entry point: one touchdown tests every site in parallel"""
+    tester = MultiSiteTester(args.config, overrides)
+    site_names = [t.site_name for t in tester.testers]
+    if args.stats or args.trace:
+        tester.enable_instrumentation(args.trace)
+    print(f"Multi-site mode: {len(site_names)} sites ({', '.join(site_names)})")
     
     if args.continuous:
-        # Continuous testing mode
         print("Continuous testing mode - Press Ctrl+C to stop")
-        test_count = 0
-        pass_count = 0
+        touchdown = 0
+        
+        # Ports stay open for the session; each touchdown is gated like
+        # run_continuous: handler start signal or presence on every site
+        tester.open_ports()
         
         try:
             while True:
-                test_count += 1
-                serial_number = f"AUTO_{test_count:06d}"
+                if args.handler_fifo:
+                    print("Waiting for handler start-of-test...")
+                    wait_for_handler_start(args.handler_fifo)
+                else:
+                    print("Waiting for devices...")
+                    tester.wait_for_insertion()
                 
-                print(f"\n--- Test #{test_count} ---")
-                result = tester.run_production_test(serial_number)
+                touchdown += 1
+                serial_numbers = {
+                    name: f"AUTO_{touchdown:06d}_{name}" for name in site_names
+                }
                 
-                if result:
-                    pass_count += 1
-                    print(f"✓ PASS - Running yield: {pass_count}/{test_count} ({(pass_count/test_count)*100:.1f}%)")
-                else:
-                    print(f"✗ FAIL - Running yield: {pass_count}/{test_count} ({(pass_count/test_count)*100:.1f}%)")
+                print(f"\n--- Touchdown #{touchdown} ---")
+                site_results = tester.run_production_test(serial_numbers)
                 
-                print("Insert next device and press Enter...")
-                input()
+                for name, result in site_results.items():
+                    status = "✓" if result["result"] == "PASS" else "✗"
+                    print(f"{status} {name}: {result['result']} (bin {result['bin']})")
+                tester.print_summary()
                 
+                if not args.handler_fifo:
+                    tester.wait_for_removal()
+        
         except KeyboardInterrupt:
-            print(f"\nTesting stopped. Final yield: {pass_count}/{test_count} ({(pass_count/test_count)*100:.1f}%)")
+            print("\nTesting stopped. Final yield:")
+            tester.print_summary()
+        
+        finally:
+            tester.disconnect()
+            tester.close()
+            print_instrumentation(tester.testers, args)
     
     else:
-        # Single test mode
-        result = tester.run_production_test(args.serial)
+        serial_numbers = {}
+        if args.serial:
+            serial_numbers = {name: f"{args.serial}_{name}" for name in site_names}
         
-        if result:
+        site_results = tester.run_production_test(serial_numbers)
+        tester.close()
+        print_instrumentation(tester.testers, args)
+        
+        for name, result in site_results.items():
+            status = "✓" if result["result"] == "PASS" else "✗"
+            print(f"{status} {name}: {result['result']} (bin {result['bin']})")
+        tester.print_summary()
+        
+        if all(r["result"] == "PASS" for r in site_results.values()):
             print("\n✅ PRODUCTION TEST PASSED")
             exit(0)
         else:
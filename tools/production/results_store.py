@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Production Results Store
+=======================================
+
+Append-only results sink for the production test line.
+
+Every unit is one line in a JSON Lines log instead of a separate JSON file,
+and the CSV summary is kept open rather than reopened per unit. Writes are
+buffered and fsync'ed in batches (every fsync_every records or
+fsync_interval seconds, whichever comes first), so at most one batch is
+at risk on a power loss.
+
+The test configuration is written once per lot as a "config" record and
+units reference it by hash. Log files rotate when the lot changes or when
+they grow past rotate_bytes; each new file starts with the config records
+it needs, so every file can be read on its own.
+
+An existing CSV summary written with an older header is migrated on open
+when its columns are a prefix of the current ones (old rows are padded
+with empty fields); a CSV with any other header is renamed aside and a new
+one started, so rows never mismatch their header.
+
+When "results_db" is set in the output configuration every unit is also
+inserted into the shared SQLite results database (axioma_results_db).
+
+Log file layout:
+    {"type": "config", "lot": "L123", "config_hash": "9f2c...", "config": {...}}
+    {"type": "unit", "lot": "L123", "config_hash": "9f2c...", "serial_number": ...}
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from axioma_results_db import ResultsDatabase
+
+CSV_HEADER = [
+    'Timestamp', 'Serial_Number', 'Overall_Result',
+    'Tests_Run', 'Tests_Passed', 'Tests_Failed',
+    'Duration_Seconds', 'Details_File', 'Site', 'Bin',
+    'Tests_Executed', 'Failed_Tests'
+]
+
+def config_hash(config):
+    """Stable short hash of a configuration dict"""
+    encoded = json.dumps(config, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+class ResultsStore:
+    """Buffered, rotating JSON Lines log plus CSV summary"""
+    
+    def __init__(self, output_dir, csv_file="production_results.csv",
+                 fsync_every=50, fsync_interval=5.0,
+                 rotate_bytes=64 * 1024 * 1024, rotate_per_lot=True,
+                 detailed_logs=True, results_db=None):
+        self.output_dir = output_dir
+        self.csv_path = os.path.join(output_dir, csv_file)
+        self.fsync_every = max(1, int(fsync_every))
+        self.fsync_interval = fsync_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_per_lot = rotate_per_lot
+        self.detailed_logs = detailed_logs
+        self.results_db = results_db
+        
+        self.lock = threading.Lock()
+        self.log_file = None
+        self.log_path = None
+        self.log_lot = None
+        self.log_configs = {}
+        self.csv_handle = None
+        self.csv_writer = None
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        
+        os.makedirs(output_dir, exist_ok=True)
+    
+    @classmethod
+    def from_config(cls, config):
+        """Create a store from the "output" section of a tester config"""
+        output = config["output"]
+        
+        results_db = None
+        if output.get("results_db"):
+            os.makedirs(output["log_directory"], exist_ok=True)
+            results_db = ResultsDatabase(
+                os.path.join(output["log_directory"], output["results_db"]),
+                commit_every=output.get("fsync_every", 50)
+            )
+        
+        return cls(
+            output["log_directory"],
+            csv_file=output.get("csv_file", "production_results.csv"),
+            fsync_every=output.get("fsync_every", 50),
+            fsync_interval=output.get("fsync_interval", 5.0),
+            rotate_bytes=output.get("rotate_bytes", 64 * 1024 * 1024),
+            rotate_per_lot=output.get("rotate_per_lot", True),
+            detailed_logs=output.get("detailed_logs", True),
+            results_db=results_db
+        )
+    
+    def append(self, test_results, config, lot="DEFAULT"):
+        """Append one unit record and its CSV summary row
+        
+        Returns the path of the log file holding the detailed record.
+        """
+        digest = config_hash(config)
+        record = {k: v for k, v in test_results.items() if k != "config"}
+        record.update({"type": "unit", "lot": lot, "config_hash": digest})
+        
+        with self.lock:
+            log_path = ""
+            if self.detailed_logs:
+                self._prepare_log(lot)
+                if digest not in self.log_configs:
+                    self._write_line({
+                        "type": "config",
+                        "lot": lot,
+                        "config_hash": digest,
+                        "config": config
+                    })
+                    self.log_configs[digest] = True
+                self._write_line(record)
+                log_path = self.log_path
+            
+            self._write_csv_row(test_results, log_path)
+            
+            if self.results_db:
+                self.results_db.insert_production_unit(test_results, lot)
+            
+            self.pending += 1
+            if (self.pending >= self.fsync_every or
+                    time.monotonic() - self.last_sync >= self.fsync_interval):
+                self._sync()
+        
+        return log_path
+    
+    def flush(self):
+        """Write out and fsync everything buffered so far"""
+        with self.lock:
+            self._sync()
+    
+    def close(self):
+        """Flush and close the log and CSV files"""
+        with self.lock:
+            self._sync()
+            if self.log_file:
+                self.log_file.close()
+                self.log_file = None
+            if self.csv_handle:
+                self.csv_handle.close()
+                self.csv_handle = None
+            if self.results_db:
+                self.results_db.close()
+                self.results_db = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def _prepare_log(self, lot):
+        """Open a new log file on first use, lot change or size limit"""
+        if self.log_file:
+            lot_changed = self.rotate_per_lot and lot != self.log_lot
+            too_big = self.rotate_bytes and self.log_file.tell() >= self.rotate_bytes
+            if not (lot_changed or too_big):
+                return
+            self._sync()
+            self.log_file.close()
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        safe_lot = "".join(c if c.isalnum() or c in "-_" else "_" for c in lot)
+        self.log_path = os.path.join(
+            self.output_dir, f"test_results_{safe_lot}_{timestamp}.jsonl"
+        )
+        self.log_file = open(self.log_path, 'a', buffering=1024 * 1024)
+        self.log_lot = lot
+        self.log_configs = {}
+    
+    def _write_line(self, record):
+        self.log_file.write(json.dumps(record, separators=(',', ':')) + '\n')
+    
+    def _open_csv(self):
+        """Open the CSV summary for appending, fixing an outdated header first"""
+        header = None
+        if os.path.exists(self.csv_path):
+            with open(self.csv_path, 'r', newline='') as f:
+                header = next(csv.reader(f), None)
+        
+        if header is not None and header != CSV_HEADER:
+            if header == CSV_HEADER[:len(header)]:
+                self._migrate_csv(len(header))
+            else:
+                root, ext = os.path.splitext(self.csv_path)
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                os.replace(self.csv_path, f"{root}_{timestamp}{ext}")
+                header = None
+        
+        self.csv_handle = open(self.csv_path, 'a', newline='')
+        self.csv_writer = csv.writer(self.csv_handle)
+        
+        # Write header if new file
+        if header is None:
+            self.csv_writer.writerow(CSV_HEADER)
+    
+    def _migrate_csv(self, columns):
+        """Rewrite the CSV with the current header, padding the old rows"""
+        temporary = self.csv_path + ".tmp"
+        padding = [''] * (len(CSV_HEADER) - columns)
+        
+        with open(self.csv_path, 'r', newline='') as source, \
+                open(temporary, 'w', newline='') as target:
+            reader = csv.reader(source)
+            writer = csv.writer(target)
+            next(reader, None)
+            writer.writerow(CSV_HEADER)
+            for row in reader:
+                writer.writerow(row + padding)
+            target.flush()
+            os.fsync(target.fileno())
+        
+        os.replace(temporary, self.csv_path)
+    
+    def _write_csv_row(self, test_results, details_file):
+        if not self.csv_handle:
+            self._open_csv()
+        
+        self.csv_writer.writerow([
+            test_results["start_time"],
+            test_results["serial_number"],
+            test_results["overall_result"],
+            test_results["tests_run"],
+            test_results["tests_passed"],
+            test_results["tests_failed"],
+            test_results["duration_seconds"],
+            details_file,
+            test_results.get("site") or "",
+            test_results["bin"],
+            ';'.join(test_results.get("tests_executed", [])),
+            ';'.join(test_results.get("failed_tests", []))
+        ])
+    
+    def _sync(self):
+        for handle in (self.log_file, self.csv_handle):
+            if handle:
+                handle.flush()
+                os.fsync(handle.fileno())
+        if self.results_db:
+            self.results_db.commit()
+        self.pending = 0
+        self.last_sync = time.monotonic()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Streaming SPC
+============================
+
+Per-lot statistical process control for parametric measurements, updated
+one unit at a time in constant memory per parameter:
+
+- Running mean / standard deviation (Welford), min/max and Cpk
+- Western Electric rules against control limits frozen after the first
+  baseline_units units of the lot (drift alerts the moment a rule trips)
+- Dynamic part average testing (PAT): units outside the lot mean
+  +/- pat_sigma standard deviations (once pat_min_units units are in)
+  are flagged as outliers even when they are inside the spec limits.
+  PAT outliers are kept out of the statistics they are judged by.
+
+Mean and standard deviation are used instead of the robust median/IQR
+limits of offline PAT so that the limits can be kept in O(1) memory.
+
+The state of every lot can be saved to a small JSON file and reloaded,
+so a restarted tester continues the lot without reading old results. It
+is saved every save_every units as well, so a crash mid-lot loses at most
+that many units of statistics.
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import json
+import math
+import os
+import threading
+from collections import deque
+
+# Western Electric rules: (name, window, points needed, sigma threshold)
+WESTERN_ELECTRIC_RULES = (
+    ("WE1", 1, 1, 3.0),   # One point beyond 3 sigma
+    ("WE2", 3, 2, 2.0),   # Two of three beyond 2 sigma, same side
+    ("WE3", 5, 4, 1.0),   # Four of five beyond 1 sigma, same side
+    ("WE4", 8, 8, 0.0)    # Eight in a row on the same side of the center
+)
+RULE_HISTORY = max(window for _, window, _, _ in WESTERN_ELECTRIC_RULES)
+
+class RunningStats:
+    """Welford mean / variance with min and max"""
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+    
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+class ParameterMonitor:
+    """SPC state of one parameter within one lot"""
+    
+    def __init__(self, name, low=None, high=None, baseline_units=30,
+                 pat_sigma=6.0, pat_min_units=30):
+        self.name = name
+        self.low = low
+        self.high = high
+        self.baseline_units = baseline_units
+        self.pat_sigma = pat_sigma
+        self.pat_min_units = pat_min_units
+        
+        self.stats = RunningStats()
+        self.center = None
+        self.sigma = None
+        self.recent = deque(maxlen=RULE_HISTORY)
+        self.active_rules = set()
+        self.pat_outliers = 0
+    
+    def pat_limits(self):
+        """Current dynamic PAT limits, or None while the lot is too young"""
+        if self.stats.count < self.pat_min_units or not self.stats.std:
+            return None
+        spread = self.pat_sigma * self.stats.std
+        low = self.stats.mean - spread
+        high = self.stats.mean + spread
+        if self.low is not None:
+            low = max(low, self.low)
+        if self.high is not None:
+            high = min(high, self.high)
+        return low, high
+    
+    def add(self, value, pat=False):
+        """Feed one in-spec measurement
+        
+        Returns (pat_outlier, new_alerts). new_alerts lists the Western
+        Electric rules that started failing with this point.
+        """
+        limits = self.pat_limits() if pat else None
+        outlier = limits is not None and not limits[0] <= value <= limits[1]
+        if outlier:
+            self.pat_outliers += 1
+        else:
+            self.stats.add(value)
+        
+        if self.center is None and self.stats.count >= self.baseline_units:
+            # Freeze the control limits from the lot baseline
+            self.center = self.stats.mean
+            self.sigma = self.stats.std
+        
+        self.recent.append(value)
+        violated = self.check_rules()
+        new_alerts = sorted(violated - self.active_rules)
+        self.active_rules = violated
+        return outlier, new_alerts
+    
+    def check_rules(self):
+        """Western Electric rules violated by the most recent points"""
+        if self.center is None or not self.sigma:
+            return set()
+        
+        scores = [(value - self.center) / self.sigma for value in self.recent]
+        violated = set()
+        for name, window, needed, threshold in WESTERN_ELECTRIC_RULES:
+            if len(scores) < window:
+                continue
+            points = scores[-window:]
+            for side in (1, -1):
+                if (side * points[-1] > threshold and
+                        sum(1 for z in points if side * z > threshold) >= needed):
+                    violated.add(name)
+        return violated
+    
+    def cpk(self):
+        """Process capability against the spec limits (None if undefined)"""
+        std = self.stats.std
+        if not std or (self.low is None and self.high is None):
+            return None
+        margins = []
+        if self.high is not None:
+            margins.append(self.high - self.stats.mean)
+        if self.low is not None:
+            margins.append(self.stats.mean - self.low)
+        return min(margins) / (3 * std)
+    
+    def summary(self):
+        limits = self.pat_limits()
+        return {
+            "count": self.stats.count,
+            "mean": self.stats.mean,
+            "std": self.stats.std,
+            "min": self.stats.min,
+            "max": self.stats.max,
+            "cpk": self.cpk(),
+            "center": self.center,
+            "sigma": self.sigma,
+            "pat_limits": list(limits) if limits else None,
+            "pat_outliers": self.pat_outliers,
+            "active_rules": sorted(self.active_rules)
+        }
+    
+    def to_dict(self):
+        state = dict(vars(self))
+        state["stats"] = dict(vars(self.stats))
+        state["recent"] = list(self.recent)
+        state["active_rules"] = sorted(self.active_rules)
+        return state
+    
+    @classmethod
+    def from_dict(cls, state):
+        monitor = cls(state["name"])
+        for key, value in state.items():
+            setattr(monitor, key, value)
+        monitor.stats = RunningStats()
+        vars(monitor.stats).update(state["stats"])
+        monitor.recent = deque(state["recent"], maxlen=RULE_HISTORY)
+        monitor.active_rules = set(state["active_rules"])
+        return monitor
+
+class SPCMonitor:
+    """Thread-safe SPC for all parameters of the current lot
+    
+    With state_dir set, the lot state is saved as spc_<lot>.json on
+    save(), close(), lot changes and every save_every units (counted by
+    end_unit()), and reloaded when the lot comes back.
+    """
+    
+    def __init__(self, state_dir=None, baseline_units=30, pat=False,
+                 pat_sigma=6.0, pat_min_units=30, save_every=50):
+        self.state_dir = state_dir
+        self.save_every = max(1, int(save_every))
+        self.baseline_units = baseline_units
+        self.pat = pat
+        self.pat_sigma = pat_sigma
+        self.pat_min_units = pat_min_units
+        
+        self.lock = threading.Lock()
+        self.lot = None
+        self.parameters = {}
+        self.unsaved_units = 0
+    
+    @classmethod
+    def from_config(cls, config):
+        """Create a monitor from the "spc" section of a tester config"""
+        spc = config.get("spc", {})
+        return cls(
+            state_dir=config["output"]["log_directory"] if spc.get("persist", True) else None,
+            baseline_units=spc.get("baseline_units", 30),
+            pat=spc.get("pat", False),
+            pat_sigma=spc.get("pat_sigma", 6.0),
+            pat_min_units=spc.get("pat_min_units", 30),
+            save_every=spc.get("save_every", config["output"].get("fsync_every", 50))
+        )
+    
+    def observe(self, lot, name, value, low=None, high=None):
+        """Feed one measurement; returns (pat_outlier, pat_limits, new_alerts)
+        
+        Out-of-spec values are rejects and do not enter the statistics.
+        """
+        with self.lock:
+            if lot != self.lot:
+                self._switch_lot(lot)
+            
+            monitor = self.parameters.get(name)
+            if monitor is None:
+                monitor = ParameterMonitor(
+                    name, low, high,
+                    baseline_units=self.baseline_units,
+                    pat_sigma=self.pat_sigma,
+                    pat_min_units=self.pat_min_units
+                )
+                self.parameters[name] = monitor
+            
+            in_spec = (low is None or value >= low) and (high is None or value <= high)
+            if not in_spec:
+                return False, monitor.pat_limits(), []
+            
+            limits = monitor.pat_limits() if self.pat else None
+            outlier, alerts = monitor.add(value, pat=self.pat)
+            return outlier, limits, alerts
+    
+    def end_unit(self):
+        """Mark one unit's measurements done; saves every save_every units"""
+        with self.lock:
+            self.unsaved_units += 1
+            if self.unsaved_units >= self.save_every:
+                self._save()
+    
+    def summary(self):
+        """Per-parameter statistics of the current lot"""
+        with self.lock:
+            return {name: monitor.summary() for name, monitor in self.parameters.items()}
+    
+    def save(self):
+        """Write the current lot state (if persistence is enabled)"""
+        with self.lock:
+            self._save()
+    
+    def close(self):
+        self.save()
+    
+    def _state_path(self, lot):
+        safe_lot = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(lot))
+        return os.path.join(self.state_dir, f"spc_{safe_lot}.json")
+    
+    def _switch_lot(self, lot):
+        self._save()
+        self.lot = lot
+        self.parameters = {}
+        
+        if self.state_dir and os.path.exists(self._state_path(lot)):
+            with open(self._state_path(lot), 'r') as f:
+                state = json.load(f)
+            self.parameters = {
+                name: ParameterMonitor.from_dict(data)
+                for name, data in state.get("parameters", {}).items()
+            }
+    
+    def _save(self):
+        self.unsaved_units = 0
+        if not self.state_dir or self.lot is None or not self.parameters:
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = self._state_path(self.lot)
+        with open(path + ".tmp", 'w') as f:
+            json.dump({
+                "lot": self.lot,
+                "parameters": {name: m.to_dict() for name, m in self.parameters.items()}
+            }, f)
+        os.replace(path + ".tmp", path)
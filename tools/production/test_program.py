@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+AxiomaCore-328 Test Program Engine
+==================================
+
+Declarative test blocks for the production tester. A block lists DUT
+commands and what their responses must look like, so new tests are added
+to the program file (test_program.json) instead of to ProductionTester.
+
+Program format (JSON, or YAML when PyYAML is installed):
+
+    {
+      "sequence": ["power_on", "digital_io", "communication", "parametric"],
+      "blocks": {
+        "communication": {
+          "results": "protocols",         # key holding the item results
+          "soft_bin": 5,                  # bin when this block fails first
+          "depends_on": ["power_on"],     # blocks that must have passed
+          "optional": false,              # true: runs only if tests_enabled lists it
+          "parallel": true,               # pipeline independent items
+          "items": [
+            {"name": "UART", "command": "TEST:UART", "expect": "PASS"},
+            {"name": "IDD", "command": "MEAS:CURRENT?",
+             "max": "limits.max_current", "unit": "mA"},
+            {"name": "PWM{ch}", "command": "TEST:PWM {ch}", "expect": "PASS",
+             "foreach": {"ch": [3, 5, 6]}, "depends_on": ["UART"]},
+            {"name": "VDD", "command": "SET:VOLTAGE {test_voltage}", "expect": "OK"}
+          ]
+        }
+      }
+    }
+
+Names in "sequence" without a block are ProductionTester built-in tests.
+Names and commands are formatted with the foreach variables and the
+tester configuration. "expect" is a regular expression the whole response
+must match; "min" and "max" are numeric limits, given as numbers or as
+dotted paths into the tester configuration. Items whose dependencies have passed are sent
+together as one pipelined batch (a stage); an item whose dependency
+failed is not sent and fails as blocked.
+
+compile_program() expands foreach, resolves limits and compiles the
+regular expressions once; the tester recompiles only when the lot changes.
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import itertools
+import json
+import re
+
+try:
+    import yaml
+except ImportError:
+    # JSON programs work without PyYAML
+    yaml = None
+
+class TestProgramError(Exception):
+    """Invalid test program"""
+
+def load_program(path):
+    """Read a test program file (.json, or .yaml/.yml with PyYAML)"""
+    with open(path, 'r') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise TestProgramError(f"PyYAML is required to read {path}")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def resolve_limit(value, config):
+    """A numeric limit, or a dotted configuration path such as limits.max_current"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    
+    resolved = config
+    for key in str(value).split('.'):
+        if not isinstance(resolved, dict) or key not in resolved:
+            raise TestProgramError(f"Limit {value!r} not found in configuration")
+        resolved = resolved[key]
+    return float(resolved)
+
+class CompiledItem:
+    """One command with its precompiled pass criteria"""
+    
+    def __init__(self, name, command, pattern=None, low=None, high=None,
+                 unit=None, depends_on=()):
+        self.name = name
+        self.command = command
+        self.pattern = pattern
+        self.low = low
+        self.high = high
+        self.unit = unit
+        self.depends_on = tuple(depends_on)
+    
+    def evaluate(self, response):
+        """Result record for one response"""
+        if self.pattern is not None and not self.pattern.fullmatch(response):
+            return {"status": "FAIL", "details": response}
+        
+        if self.low is None and self.high is None:
+            return {"status": "PASS", "details": response}
+        
+        try:
+            value = float(response)
+        except ValueError:
+            return {"status": "FAIL", "details": response}
+        
+        passed = ((self.low is None or value >= self.low) and
+                  (self.high is None or value <= self.high))
+        result = {"status": "PASS" if passed else "FAIL", "value": value}
+        if self.low is not None:
+            result["min_limit"] = self.low
+        if self.high is not None:
+            result["max_limit"] = self.high
+        if self.unit:
+            result["unit"] = self.unit
+        return result
+
+class CompiledBlock:
+    """A test block split into stages of independent items"""
+    
+    def __init__(self, name, items, results_key="items", depends_on=(),
+                 soft_bin=None, parallel=True, optional=False):
+        self.name = name
+        self.items = items
+        self.results_key = results_key
+        self.depends_on = tuple(depends_on)
+        self.soft_bin = soft_bin
+        self.optional = optional  # Off unless enabled in tests_enabled
+        self.stages = self.plan_stages(items, parallel)
+    
+    @staticmethod
+    def plan_stages(items, parallel):
+        """Group items so that each stage only depends on earlier stages"""
+        if not parallel:
+            return [[item] for item in items]
+        
+        levels = {}
+        stages = []
+        for item in items:
+            level = max((levels[dependency] + 1 for dependency in item.depends_on), default=0)
+            levels[item.name] = level
+            if level == len(stages):
+                stages.append([])
+            stages[level].append(item)
+        return stages
+    
+    def run(self, send_batch):
+        """Run every stage through send_batch; returns (passed, item results)"""
+        results = {}
+        passed_items = set()
+        all_passed = True
+        
+        for stage in self.stages:
+            runnable = []
+            for item in stage:
+                blocked = [d for d in item.depends_on if d not in passed_items]
+                if blocked:
+                    results[item.name] = {
+                        "status": "FAIL",
+                        "details": f"Blocked by {', '.join(blocked)}"
+                    }
+                    all_passed = False
+                else:
+                    runnable.append(item)
+            
+            if not runnable:
+                continue
+            
+            try:
+                responses = send_batch([item.command for item in runnable])
+            except Exception as e:
+                responses = None
+                batch_error = str(e)
+            
+            for index, item in enumerate(runnable):
+                if responses is None:
+                    result = {"status": "FAIL", "details": batch_error}
+                else:
+                    result = item.evaluate(responses[index])
+                results[item.name] = result
+                
+                if result["status"] == "PASS":
+                    passed_items.add(item.name)
+                else:
+                    all_passed = False
+        
+        return all_passed, results
+
+class CompiledProgram:
+    """Test sequence plus compiled blocks, ready to run unit after unit"""
+    
+    def __init__(self, sequence, blocks):
+        self.sequence = sequence
+        self.blocks = blocks
+    
+    def respect_dependencies(self, test_functions):
+        """Stable reorder of (name, function) pairs so blocks follow their dependencies"""
+        names = {name for name, _ in test_functions}
+        ordered = []
+        done = set()
+        waiting = list(test_functions)
+        
+        while waiting:
+            for index, (name, function) in enumerate(waiting):
+                block = self.blocks.get(name)
+                pending = [d for d in block.depends_on if d in names and d not in done] if block else []
+                if not pending:
+                    ordered.append((name, function))
+                    done.add(name)
+                    del waiting[index]
+                    break
+            else:
+                raise TestProgramError(f"Circular block dependencies: {[n for n, _ in waiting]}")
+        
+        return ordered
+
+def expand_items(spec, config):
+    """Item specs with foreach expanded into one spec per combination
+    
+    Names and commands may use foreach variables and configuration
+    values, e.g. "SET:VOLTAGE {test_voltage}".
+    """
+    foreach = spec.get("foreach") or {}
+    keys = list(foreach)
+    expanded = []
+    for values in itertools.product(*(foreach[key] for key in keys)):
+        bindings = dict(config, **dict(zip(keys, values)))
+        item = {k: v for k, v in spec.items() if k != "foreach"}
+        try:
+            item["name"] = spec["name"].format(**bindings)
+            item["command"] = spec["command"].format(**bindings)
+            item["depends_on"] = [d.format(**bindings) for d in spec.get("depends_on", [])]
+        except KeyError as e:
+            raise TestProgramError(f"{spec.get('name')}: unknown placeholder {e}")
+        expanded.append(item)
+    return expanded
+
+def compile_block(name, spec, config):
+    """Compile one block specification"""
+    items = []
+    seen = set()
+    
+    for item_spec in spec.get("items", []):
+        if "command" not in item_spec or "name" not in item_spec:
+            raise TestProgramError(f"{name}: every item needs a name and a command")
+        
+        for item in expand_items(item_spec, config):
+            if "expect" not in item and "min" not in item and "max" not in item:
+                raise TestProgramError(f"{name}.{item['name']}: no expect pattern or limits")
+            
+            for dependency in item.get("depends_on", []):
+                if dependency not in seen:
+                    raise TestProgramError(
+                        f"{name}.{item['name']}: depends on unknown or later item {dependency}"
+                    )
+            
+            try:
+                pattern = re.compile(item["expect"]) if "expect" in item else None
+            except re.error as e:
+                raise TestProgramError(f"{name}.{item['name']}: bad expect pattern: {e}")
+            
+            items.append(CompiledItem(
+                item["name"],
+                item["command"],
+                pattern=pattern,
+                low=resolve_limit(item.get("min"), config),
+                high=resolve_limit(item.get("max"), config),
+                unit=item.get("unit"),
+                depends_on=item.get("depends_on", [])
+            ))
+            seen.add(item["name"])
+    
+    return CompiledBlock(
+        name,
+        items,
+        results_key=spec.get("results", "items"),
+        depends_on=spec.get("depends_on", []),
+        soft_bin=spec.get("soft_bin"),
+        parallel=spec.get("parallel", True),
+        optional=spec.get("optional", False)
+    )
+
+def compile_program(program, config, builtin_tests=()):
+    """Validate and compile a loaded program against a tester configuration"""
+    blocks = {
+        name: compile_block(name, spec, config)
+        for name, spec in (program.get("blocks") or {}).items()
+    }
+    
+    sequence = program.get("sequence") or list(builtin_tests) + list(blocks)
+    known = set(builtin_tests) | set(blocks)
+    for name in sequence:
+        if name not in known:
+            raise TestProgramError(f"Unknown test in sequence: {name}")
+    for block in blocks.values():
+        for dependency in block.depends_on:
+            if dependency not in known:
+                raise TestProgramError(f"{block.name}: depends on unknown test {dependency}")
+    
+    return CompiledProgram(sequence, blocks)
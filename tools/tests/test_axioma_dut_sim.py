@@ -0,0 +1,22 @@
+"""
+Tests for the simulated AxiomaCore-328 DUT
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from axioma_dut_sim import PWM_CHANNELS, SimulatedDUT
+
+def test_bare_pwm_test_covers_all_channels():
+    dut = SimulatedDUT(seed=1)
+    assert dut.handle("TEST:PWM") == "PASS"
+
+def test_pwm_test_checks_channel_number():
+    dut = SimulatedDUT(seed=1)
+    assert dut.handle(f"TEST:PWM {PWM_CHANNELS[0]}") == "PASS"
+    assert dut.handle("TEST:PWM 4") == "ERROR:INVALID_CHANNEL"
+    assert dut.handle("TEST:PWM x") == "ERROR:INVALID_VALUE"
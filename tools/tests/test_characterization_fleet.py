@@ -0,0 +1,65 @@
+"""
+Tests for the fleet characterization summary
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'characterization'))
+from characterization_data import speed_grade
+from characterization_fleet import FleetSummary, find_reports, summarize_files
+from axioma_results_db import ResultsDatabase
+
+def chip_results(index, rng):
+    """Results dict of one characterized chip, as written to its JSON report"""
+    fmax = round(rng.gauss(24.0, 3.0) * 2) / 2
+    current = round(rng.gauss(2.9, 0.1), 3) + index * 1e-4  # Distinct values, no ties
+    return {
+        "chip_id": f"A328-{index:04d}",
+        "lot_id": f"L{index % 3}",
+        "power_characterization": {
+            "16": {
+                "active": {"current_ma": current, "voltage_v": 1.8, "power_mw": current * 1.8},
+                "sleep": {"current_ma": 0.05, "voltage_v": 1.8, "power_mw": 0.09}
+            }
+        },
+        "functional_validation": {
+            "GPIO": {"status": "PASS", "details": "PASS"},
+            "PWM": {"status": "FAIL" if index % 7 == 0 else "PASS", "details": ""}
+        },
+        "speed_grade": {
+            "grade": speed_grade(fmax),
+            "max_frequency": fmax + index * 1e-4,
+            "worst_case": {"max_frequency": fmax - 4.0, "voltage": 1.62, "temperature": 85},
+            "temperature_coefficient_mhz_per_c": -0.05
+        }
+    }
+
+def test_reports_and_database_give_the_same_summary(tmp_path):
+    rng = random.Random(7)
+    chips = [chip_results(index, rng) for index in range(60)]
+    
+    with ResultsDatabase(str(tmp_path / "results.db")) as db:
+        for results in chips:
+            path = tmp_path / f"axioma328_characterization_{results['chip_id']}_20250101_000000.json"
+            path.write_text(json.dumps(results))
+            db.insert_characterization(results['chip_id'], results, "2025-01-01T00:00:00",
+                                       lot=results['lot_id'])
+    
+    from_reports = FleetSummary(outliers=5)
+    summarize_files(find_reports([str(tmp_path)]), from_reports, jobs=1)
+    from_database = FleetSummary(outliers=5)
+    with ResultsDatabase(str(tmp_path / "results.db")) as db:
+        for summary in db.characterization_summaries():
+            from_database.add(summary)
+    
+    reports, database = from_reports.to_dict(), from_database.to_dict()
+    assert reports['chips'] == database['chips'] == 60
+    assert reports['fleet']['metrics']['current_16mhz_ma']['count'] == 60
+    assert database['outliers']['highest_current']
+    assert reports == database
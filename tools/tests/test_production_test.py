@@ -0,0 +1,78 @@
+"""
+Tests for the production tester
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import csv
+import json
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'production'))
+from axioma_dut_sim import SimulatedDUT, SimulatedDUTServer
+from axioma_results_db import ResultsDatabase
+from production_logging import stop_pipeline
+from production_test import SOFT_BINS, MultiSiteTester, ProductionTester
+
+def closed_port():
+    """socket:// URL of a local port nothing listens on"""
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return f"socket://localhost:{s.getsockname()[1]}"
+
+def write_config(tmp_path, ports):
+    """Config with one site per port, writing its outputs under tmp_path"""
+    config = ProductionTester.default_config()
+    config["ready_deadline"] = 0.5
+    config["output"]["log_directory"] = str(tmp_path)
+    config["sites"] = [
+        {"name": f"S{index}", "serial_port": port} for index, port in enumerate(ports)
+    ]
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(config))
+    return str(config_file)
+
+def test_contact_fail_is_saved_with_contact_bin(tmp_path):
+    with SimulatedDUTServer(SimulatedDUT(seed=1)) as server:
+        tester = MultiSiteTester(write_config(tmp_path, [server.port, closed_port()]))
+        try:
+            results = tester.run_production_test({"S0": "A328-0001", "S1": "A328-0002"})
+        finally:
+            tester.close()
+            stop_pipeline()
+    
+    assert results["S1"]["bin"] == SOFT_BINS["contact"]
+    
+    with open(tmp_path / "production_results.csv", 'r', newline='') as f:
+        rows = {row["Serial_Number"]: row for row in csv.DictReader(f)}
+    assert rows["A328-0002"]["Bin"] == str(SOFT_BINS["contact"])
+    assert rows["A328-0002"]["Overall_Result"] == "FAIL"
+    assert rows["A328-0001"]["Bin"] == str(SOFT_BINS["pass"])
+    
+    with ResultsDatabase(str(tmp_path / "production_results.db")) as db:
+        assert db.lookup_serial("A328-0002")[0]["bin"] == SOFT_BINS["contact"]
+        assert ("contact", 1) in db.failure_pareto()
+
+def test_multisite_touchdowns_reuse_open_ports(tmp_path):
+    with SimulatedDUTServer(SimulatedDUT(seed=1)) as first, \
+         SimulatedDUTServer(SimulatedDUT(seed=2, chip_id="A328-SIM-0002")) as second:
+        tester = MultiSiteTester(write_config(tmp_path, [first.port, second.port]))
+        try:
+            tester.open_ports()
+            connections = [site.serial_conn for site in tester.testers]
+            for touchdown in range(2):
+                assert all(tester.wait_for_insertion())
+                results = tester.run_production_test()
+                assert [r["result"] for r in results.values()] == ["PASS", "PASS"]
+                assert [site.serial_conn for site in tester.testers] == connections
+                assert all(conn.is_open for conn in connections)
+        finally:
+            tester.disconnect()
+            tester.close()
+            stop_pipeline()
+    
+    assert tester.yield_summary()["tested"] == 4
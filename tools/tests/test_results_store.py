@@ -0,0 +1,58 @@
+"""
+Tests for the production results store
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'production'))
+from results_store import CSV_HEADER, ResultsStore
+
+UNIT = {
+    "start_time": "2025-01-01T00:00:00",
+    "serial_number": "A328-0001",
+    "overall_result": "FAIL",
+    "tests_run": 2,
+    "tests_passed": 1,
+    "tests_failed": 1,
+    "duration_seconds": 1.5,
+    "bin": 5,
+    "tests_executed": ["power_on", "communication"],
+    "failed_tests": ["communication"]
+}
+
+def read_csv(path):
+    with open(path, 'r', newline='') as f:
+        return list(csv.reader(f))
+
+def test_old_header_is_migrated(tmp_path):
+    old = CSV_HEADER[:8]
+    with open(tmp_path / "production_results.csv", 'w', newline='') as f:
+        csv.writer(f).writerows([old, ["t0", "A328-0000", "PASS", 1, 1, 0, 1.0, "log"]])
+    
+    with ResultsStore(str(tmp_path), detailed_logs=False) as store:
+        store.append(UNIT, {})
+    
+    rows = read_csv(tmp_path / "production_results.csv")
+    assert rows[0] == CSV_HEADER
+    assert all(len(row) == len(CSV_HEADER) for row in rows)
+    assert rows[1][:8] == ["t0", "A328-0000", "PASS", "1", "1", "0", "1.0", "log"]
+    assert rows[2][CSV_HEADER.index('Failed_Tests')] == "communication"
+
+def test_unknown_header_is_rotated(tmp_path):
+    with open(tmp_path / "production_results.csv", 'w', newline='') as f:
+        csv.writer(f).writerows([["Serial", "Result"], ["A328-0000", "PASS"]])
+    
+    with ResultsStore(str(tmp_path), detailed_logs=False) as store:
+        store.append(UNIT, {})
+    
+    rows = read_csv(tmp_path / "production_results.csv")
+    assert rows[0] == CSV_HEADER and len(rows) == 2
+    rotated = [name for name in os.listdir(tmp_path) if name != "production_results.csv"]
+    assert len(rotated) == 1
+    assert read_csv(tmp_path / rotated[0])[0] == ["Serial", "Result"]
@@ -0,0 +1,60 @@
+"""
+Tests for settle detection and the temperature soak
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'characterization'))
+from axioma_dut_sim import SimulatedDUT, SimulatedDUTServer
+from settling import SettleDetector
+from silicon_characterization import AxiomaCoreCharacterizer
+
+def test_min_time_holds_a_steady_reading():
+    detector = SettleDetector(window=3, interval=0.01, max_time=1.0, min_time=0.1)
+    settle = detector.wait(lambda: 1.0)
+    assert settle["settled"]
+    assert settle["settle_s"] >= 0.1
+
+def characterizer_on(server):
+    characterizer = AxiomaCoreCharacterizer(server.port, timeout=1)
+    characterizer.soak_interval = 0.1
+    characterizer.min_soak_time = 0.3
+    assert characterizer.connect()
+    return characterizer
+
+def test_soak_follows_die_temperature():
+    with SimulatedDUTServer(SimulatedDUT(seed=1, thermal_tau=0.3)) as server:
+        characterizer = characterizer_on(server)
+        try:
+            characterizer.set_conditions(1.8, 85)
+            settle = characterizer.settle_conditions(1.8, 85, 10.0, True)
+            die = float(characterizer.send_command("MEAS:TEMPERATURE?"))
+        finally:
+            characterizer.disconnect()
+    
+    assert settle["settled"] and settle["signal"] == "temperature"
+    assert abs(settle["value"] - 85) < 1.0
+    assert abs(die - 85) < 1.0
+    assert characterizer.results["condition_settling"][0]["signal"] == "temperature"
+
+def test_soak_without_readback_keeps_the_minimum_time():
+    dut = SimulatedDUT(seed=1)
+    dut.handle_measure = lambda name: (
+        "ERROR:UNKNOWN_COMMAND" if name == "MEAS:TEMPERATURE?"
+        else SimulatedDUT.handle_measure(dut, name)
+    )
+    with SimulatedDUTServer(dut) as server:
+        characterizer = characterizer_on(server)
+        try:
+            characterizer.set_conditions(1.8, -40)
+            settle = characterizer.settle_conditions(1.8, -40, 10.0, True)
+        finally:
+            characterizer.disconnect()
+    
+    assert settle["settled"] and settle["signal"] == "current"
+    assert settle["settle_s"] >= characterizer.min_soak_time
@@ -0,0 +1,23 @@
+"""
+Tests for the streaming SPC monitor
+
+© 2025 AxiomaCore Project
+Licensed under Apache 2.0
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'production'))
+from spc import SPCMonitor
+
+def test_state_is_saved_every_save_every_units(tmp_path):
+    monitor = SPCMonitor(state_dir=str(tmp_path), save_every=3)
+    for value in (1.0, 1.1, 0.9, 1.05):
+        monitor.observe("L1", "supply_current", value, high=4.0)
+        monitor.end_unit()
+    
+    # Crash without close(): the first three units survive
+    restarted = SPCMonitor(state_dir=str(tmp_path), save_every=3)
+    restarted.observe("L1", "supply_current", 1.0, high=4.0)
+    assert restarted.summary()["supply_current"]["count"] == 4